@@ -3,6 +3,13 @@ This module contains the classes
 
 - *refactor*, a module that assists in refactoring Modelica classes,
 - *Tester* that runs the unit tests of the `Buildings` library,
+- *funnel*, a module that compares results with reference results within a funnel,
+- *ComparisonResults* that stores the results of the comparison with reference results,
+- *RuntimeHistory* that stores the computing time of the unit tests,
+- *DependencyGraph* that finds the Modelica classes that depend on changed files,
+- *VerdictCache* that stores the fingerprints of the unit tests that passed,
+- *DiscoveryCache* that stores the unit tests that were found in the `.mos` scripts,
+- *mos_script*, a module that parses the commands of the `.mos` scripts,
 - *Validator* that validates the html code of the info section of the `.mo` files, and
 - *Annex60* that synchronizes Modelica libraries with the `Annex60` library.
 - *ErrorDictionary* that contains information about possible error strings.
@@ -0,0 +1,278 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# import from future to make Python2 behave like Python3
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from io import open
+# end of from future import
+
+from array import array
+import json
+import math
+
+
+class ComparisonResults(object):
+    """ Class that stores the results of the comparison of simulation results
+    with reference results.
+
+    :param entries: A list of dictionaries with the translation and simulation
+                    information of the models, such as read from the simulator log
+                    of the regression tests. Each dictionary must have the key ``model``.
+
+    The results are indexed by the model name and by the variable name.
+    For each model, the verdicts, the times of the maximum error, the variable groups
+    and the directories with the files of the funnel comparison are stored in columns.
+
+    The method :meth:`get_entry` returns the results of a model in the format of the
+    comparison log file, such as ``comparison-dymola.log``, which is used by the HTML report,
+    and the method :meth:`to_list` returns the results of all models.
+
+    Usage: Type
+
+       >>> from buildingspy.development.comparison_results import ComparisonResults
+       >>> com = ComparisonResults()
+       >>> com.add_model('MyLib.MyModel', 'MyModel.mat')
+       >>> com.add_variable('MyLib.MyModel', 'x', None, True, 0, None, 0)
+       >>> com.add_variable('MyLib.MyModel', 'y', None, False, 0.5, 'y exceeds tolerance.', 0)
+       >>> com.get_variable('MyLib.MyModel', 'y')['t_err_max']
+       0.5
+       >>> com.get_comparison('MyLib.MyModel')['success_rate']
+       0.5
+
+    """
+
+    def __init__(self, entries=None):
+        # Entries of the models, without the comparison results
+        self._entries = []
+        # Model name to the position in self._entries
+        self._index = dict()
+        # Model name to the columns of its comparison results
+        self._comparisons = dict()
+        if entries is not None:
+            for ent in entries:
+                self._add_entry(ent)
+
+    def _add_entry(self, entry):
+        """ Add the entry of a model, and its comparison results if they are in ``entry``.
+        """
+        model_name = entry['model']
+        if model_name in self._index:
+            return
+        self._index[model_name] = len(self._entries)
+        self._entries.append(dict([(k, v) for (k, v) in entry.items() if k != 'comparison']))
+        if 'comparison' in entry:
+            self.set_comparison(model_name, entry['comparison'])
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, model_name):
+        return model_name in self._index
+
+    def __iter__(self):
+        """ Iterate over the names of the models, in the order in which they were added.
+        """
+        return (ent['model'] for ent in self._entries)
+
+    def add_model(self, model_name, file_name):
+        """ Add a model whose results are compared, unless the model has already been added.
+
+        :param model_name: The name of the model.
+        :param file_name: The name of the result file, used for reporting.
+        """
+        if model_name not in self._index:
+            self._add_entry({'model': model_name})
+        if model_name not in self._comparisons:
+            self._comparisons[model_name] = {
+                'file_name': file_name,
+                'variables': [],
+                'funnel_dirs': [],
+                'test_passed': array('b'),
+                't_err_max': array('d'),
+                'warnings': [],
+                # index of the group of variables belonging to the same subplot, or -1
+                'var_groups': array('i'),
+                # variable name to the position of its first comparison
+                'index': dict()}
+
+    def add_variable(self, model_name, var_name, funnel_dir, test_passed, t_err_max, warning,
+                     var_group):
+        """ Add the comparison results of a variable.
+
+        :param model_name: The name of the model, which must have been added with
+                           :meth:`add_model`.
+        :param var_name: The name of the variable.
+        :param funnel_dir: The directory with the files of the funnel comparison, or ``None``.
+        :param test_passed: ``True`` if the variable is equal to the reference results.
+        :param t_err_max: The time of the maximum error, or ``None``.
+        :param warning: The warning, or ``None``.
+        :param var_group: The index of the plot of the variable, or ``None``.
+
+        A variable can be added more than once if it is in more than one plot.
+        """
+        com = self._comparisons[model_name]
+        if var_name not in com['index']:
+            com['index'][var_name] = len(com['variables'])
+        com['variables'].append(var_name)
+        com['funnel_dirs'].append(funnel_dir)
+        com['test_passed'].append(int(test_passed))
+        com['t_err_max'].append(float('nan') if t_err_max is None else t_err_max)
+        com['warnings'].append(warning)
+        com['var_groups'].append(-1 if var_group is None else var_group)
+
+    def get_variable(self, model_name, var_name):
+        """ Return the comparison results of the first comparison of a variable.
+
+        :param model_name: The name of the model.
+        :param var_name: The name of the variable.
+        :return: A dictionary with the keys ``funnel_dir``, ``test_passed``, ``t_err_max``,
+                 ``warning`` and ``var_group``, or ``None`` if the variable has not been added.
+        """
+        com = self._comparisons.get(model_name)
+        if com is None or var_name not in com['index']:
+            return None
+        i = com['index'][var_name]
+        return {'funnel_dir': com['funnel_dirs'][i],
+                'test_passed': com['test_passed'][i],
+                't_err_max': self._get_time(com['t_err_max'][i]),
+                'warning': com['warnings'][i],
+                'var_group': self._get_group(com['var_groups'][i])}
+
+    @staticmethod
+    def _get_time(value):
+        return None if math.isnan(value) else value
+
+    @staticmethod
+    def _get_group(value):
+        return None if value < 0 else value
+
+    def get_comparison(self, model_name):
+        """ Return the comparison results of a model.
+
+        :param model_name: The name of the model.
+        :return: A dictionary with the keys ``file_name``, ``variables``, ``funnel_dirs``,
+                 ``test_passed``, ``t_err_max``, ``warnings``, ``var_groups`` and
+                 ``success_rate``, or ``None`` if the model has no comparison results.
+        """
+        com = self._comparisons.get(model_name)
+        if com is None:
+            return None
+        nVar = len(com['variables'])
+        return {'file_name': com['file_name'],
+                'variables': list(com['variables']),
+                'funnel_dirs': list(com['funnel_dirs']),
+                'test_passed': com['test_passed'].tolist(),
+                't_err_max': [self._get_time(v) for v in com['t_err_max']],
+                'warnings': list(com['warnings']),
+                'var_groups': [self._get_group(v) for v in com['var_groups']],
+                'success_rate': sum(com['test_passed']) / nVar if nVar > 0 else 0}
+
+    def set_comparison(self, model_name, comparison):
+        """ Set the comparison results of a model.
+
+        :param model_name: The name of the model.
+        :param comparison: A dictionary with the comparison results,
+                           as returned by :meth:`get_comparison`.
+
+        The model is added if needed, and previous comparison results of the model
+        are replaced.
+        """
+        self._comparisons.pop(model_name, None)
+        self.add_model(model_name, comparison['file_name'])
+        for (i, var_name) in enumerate(comparison['variables']):
+            self.add_variable(model_name, var_name,
+                              comparison['funnel_dirs'][i],
+                              comparison['test_passed'][i],
+                              comparison['t_err_max'][i],
+                              comparison['warnings'][i],
+                              comparison['var_groups'][i])
+
+    def update(self, other):
+        """ Set the comparison results of the models of ``other``.
+
+        :param other: An instance of :class:`ComparisonResults`.
+        """
+        for model_name in other._comparisons:
+            self._comparisons.pop(model_name, None)
+            if model_name not in self._index:
+                self._add_entry({'model': model_name})
+            self._comparisons[model_name] = other._comparisons[model_name]
+
+    def get_entry(self, model_name):
+        """ Return a dictionary with the entry of a model, as written to the comparison log file.
+
+        :param model_name: The name of the model.
+
+        The dictionary contains the entry of the model, and, if the results of
+        the model have been compared, the key ``comparison`` with the dictionary
+        returned by :meth:`get_comparison`.
+        """
+        ele = dict(self._entries[self._index[model_name]])
+        if model_name in self._comparisons:
+            ele['comparison'] = self.get_comparison(model_name)
+        return ele
+
+    def to_list(self):
+        """ Return a list with the dictionary of :meth:`get_entry` for each model.
+        """
+        return [self.get_entry(ent['model']) for ent in self._entries]
+
+
+def write_log_entry(fileName, entry):
+    """ Append the entry of a model to a comparison log file.
+
+    :param fileName: The name of the comparison log file.
+    :param entry: The dictionary returned by :meth:`ComparisonResults.get_entry`.
+
+    The comparison log file has the JSON Lines format, with one entry per line.
+    As the file is closed after each entry, the entries that have been written
+    can be read with :func:`read_log` while the regression tests are still running.
+    """
+    with open(fileName, mode="a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, sort_keys=True) + '\n')
+
+
+def read_log(fileName):
+    """ Return an iterator over the entries of a comparison log file.
+
+    :param fileName: The name of the comparison log file.
+
+    The entries are read one at a time, hence the file is not loaded
+    into memory. If the last line is incomplete, because the regression tests
+    still write the file or have been interrupted, then this line is skipped.
+    A file that contains one JSON list with all entries, as written by
+    BuildingsPy 2.1.0 and earlier, can also be read.
+
+    Usage: Type
+
+       >>> import os
+       >>> import tempfile
+       >>> import shutil
+       >>> from buildingspy.development.comparison_results import read_log, write_log_entry
+       >>> tmpDir = tempfile.mkdtemp()
+       >>> fileName = os.path.join(tmpDir, "comparison-dymola.log")
+       >>> write_log_entry(fileName, {'model': 'MyLib.MyModel'})
+       >>> write_log_entry(fileName, {'model': 'MyLib.MyOtherModel'})
+       >>> [ent['model'] for ent in read_log(fileName)]
+       ['MyLib.MyModel', 'MyLib.MyOtherModel']
+       >>> shutil.rmtree(tmpDir)
+
+    """
+    with open(fileName, mode="r", encoding="utf-8-sig") as f:
+        lin = f.readline()
+        if lin.lstrip().startswith('['):
+            for ent in json.loads(lin + f.read()):
+                yield ent
+            return
+        while lin:
+            if not lin.endswith('\n'):
+                return
+            if lin.strip():
+                yield json.loads(lin)
+            lin = f.readline()
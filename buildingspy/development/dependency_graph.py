@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# import from future to make Python2 behave like Python3
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from io import open
+# end of from future import
+
+import os
+import re
+
+# Strings, line comments and block comments of Modelica code
+_COMMENT_OR_STRING = re.compile(r'"(?:\\.|[^"\\])*"|//[^\n]*|/\*.*?\*/', re.DOTALL)
+# Links to files of a library, such as modelica://Buildings/Resources/weatherdata/a.mos
+_URI = re.compile(r'modelica://([A-Za-z_]\w*)/([^"\s]*)')
+# Class definitions such as 'model A' or 'partial block B', ends of classes,
+# and declarations of constants such as 'constant Real k[2] = {1, 2}'
+_CLASS = re.compile(
+    r'\b(?:class|model|block|connector|record|package|function|type)\s+([A-Za-z_]\w*)\s*(=?)'
+    r'|\bend\s+([A-Za-z_]\w*)\s*;'
+    r'|\bconstant\s+[A-Za-z_][\w.]*(?:\s*\[[^\]]*\])?\s+([A-Za-z_]\w*)')
+_IMPORT = re.compile(
+    r'\bimport\s+(?:([A-Za-z_]\w*)\s*=\s*)?([A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*)'
+    r'(?:(\.\*)|\.\{([^}]*)\})?\s*;')
+_WITHIN = re.compile(r'^\s*within\b[^;]*;')
+# Names such as A or A.B.C, but not parts of numbers or of other names
+_NAME = re.compile(r'(?<![\w.])[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*')
+
+_KEYWORDS = set([
+    'algorithm', 'and', 'annotation', 'block', 'break', 'class', 'connect', 'connector',
+    'constant', 'constrainedby', 'der', 'discrete', 'each', 'else', 'elseif', 'elsewhen',
+    'encapsulated', 'end', 'enumeration', 'equation', 'expandable', 'extends', 'external',
+    'false', 'final', 'flow', 'for', 'function', 'if', 'import', 'impure', 'in', 'initial',
+    'inner', 'input', 'loop', 'model', 'not', 'operator', 'or', 'outer', 'output', 'package',
+    'parameter', 'partial', 'protected', 'public', 'pure', 'record', 'redeclare',
+    'replaceable', 'return', 'stream', 'then', 'true', 'type', 'when', 'while', 'within'])
+
+
+class DependencyGraph(object):
+    """ Class that finds the classes of a Modelica library that depend on changed files.
+
+    :param library_home: The directory of the library, which contains its top-level
+                         ``package.mo`` file.
+
+    The ``.mo`` files of the library are scanned for the names of classes and constants
+    of the library that are used in ``extends`` clauses, component declarations,
+    ``import`` clauses, redeclarations, function calls, modifications or equations.
+    The names are looked up in the enclosing packages as in Modelica.
+    The dependencies are recorded for each file, and include the classes that are
+    nested in a file.
+    Links such as ``modelica://Buildings/Resources/Data/a.txt`` are recorded as dependencies
+    on the linked file or on the files in the linked directory.
+
+    The names are found without fully parsing the Modelica code. Hence, a name may
+    be recorded as a dependency even if it refers to a component rather than a class.
+    This can add classes to the dependent classes, but does not omit any.
+
+    Usage: Type
+
+       >>> import os
+       >>> from buildingspy.development.dependency_graph import DependencyGraph
+       >>> libHome = os.path.join("buildingspy", "tests", "MyModelicaLibrary")
+       >>> dep = DependencyGraph(libHome)
+       >>> for c in sorted(dep.get_dependent_classes(["MyModel.mo"])):
+       ...     print(c)
+       MyModelicaLibrary.Examples.MyStep
+       MyModelicaLibrary.MyModel
+       MyModelicaLibrary.MyStep
+
+    """
+
+    def __init__(self, library_home):
+        self._libHome = os.path.abspath(library_home)
+        self._libName = os.path.basename(self._libHome)
+        # Class name to file name, relative to the library home, with '/' as separator
+        self._classes = dict()
+        # Names of classes and constants, which can be looked up in enclosing
+        # packages, to file name
+        self._names = dict()
+        # File name to the name of the class it defines
+        self._file_classes = dict()
+        # File name to the set of files whose classes it uses
+        self._dependencies = dict()
+        # File name to the set of files and directories it links to
+        self._resources = dict()
+        self._scan()
+
+    def _get_class_name(self, fileName):
+        """ Return the name of the class that is defined in ``fileName``.
+        """
+        parts = fileName[:-len('.mo')].split('/')
+        if parts[-1] == 'package':
+            parts = parts[:-1]
+        return '.'.join([self._libName] + parts)
+
+    def _scan(self):
+        """ Read all ``.mo`` files, and record their classes and dependencies.
+        """
+        code = dict()
+        for root, dirs, files in os.walk(self._libHome):
+            # Skip directories that do not contain Modelica packages, such as Resources
+            dirs[:] = [d for d in dirs if os.path.isfile(os.path.join(root, d, 'package.mo'))]
+            for fil in files:
+                if fil.endswith('.mo'):
+                    fulNam = os.path.join(root, fil)
+                    relNam = os.path.relpath(fulNam, self._libHome).replace(os.sep, '/')
+                    with open(fulNam, mode="r", encoding="utf-8-sig") as f:
+                        code[relNam] = self._add_classes(relNam, f.read())
+        for (relNam, (text, imports)) in code.items():
+            self._dependencies[relNam] = self._get_dependencies(relNam, text, imports)
+
+    def _add_classes(self, fileName, text):
+        """ Add the classes defined in the file, and return its code without comments
+        and strings, and its import clauses.
+        """
+        self._resources[fileName] = set(
+            [path.rstrip('/') for (lib, path) in _URI.findall(text) if lib == self._libName])
+        text = _COMMENT_OR_STRING.sub(' ', text)
+        text = _WITHIN.sub(' ', text)
+
+        claNam = self._get_class_name(fileName)
+        self._file_classes[fileName] = claNam
+        self._classes[claNam] = fileName
+        self._names[claNam] = fileName
+        # Add nested classes and constants, the first class definition is the class of the file
+        stack = []
+        for m in _CLASS.finditer(text):
+            if m.group(1) is not None:
+                if len(stack) == 0:
+                    stack.append(claNam)
+                    continue
+                nesNam = stack[-1] + '.' + m.group(1)
+                self._classes[nesNam] = fileName
+                self._names[nesNam] = fileName
+                # Short class definitions such as 'package Medium = A' have no 'end' clause
+                if m.group(2) != '=':
+                    stack.append(nesNam)
+            elif m.group(4) is not None:
+                if len(stack) > 0:
+                    self._names[stack[-1] + '.' + m.group(4)] = fileName
+            elif len(stack) > 0 and stack[-1].rsplit('.', 1)[-1] == m.group(3):
+                stack.pop()
+
+        imports = dict()
+        wildcards = []
+        for (alias, name, wildcard, names) in _IMPORT.findall(text):
+            if alias:
+                imports[alias] = name
+            elif names:
+                for n in names.split(','):
+                    imports[n.strip()] = name + '.' + n.strip()
+            elif wildcard:
+                wildcards.append(name)
+            else:
+                imports[name.rsplit('.', 1)[-1]] = name
+        # The imported names are only dependencies if they are used.
+        text = _IMPORT.sub(' ', text)
+        return (text, (imports, wildcards))
+
+    def _resolve(self, name, scopes, imports):
+        """ Return the file that defines the class ``name``, or ``None``
+        if ``name`` is not a class of the library.
+        """
+        (aliases, wildcards) = imports
+        parts = name.split('.')
+        if parts[0] in aliases:
+            candidates = [aliases[parts[0]]]
+        else:
+            candidates = [s + '.' + parts[0] for s in scopes] + \
+                [w + '.' + parts[0] for w in wildcards] + [parts[0]]
+        for first in candidates:
+            if first in self._names:
+                # Use the longest prefix that is a class or constant, as the remaining
+                # parts may be components.
+                full = [first] + parts[1:]
+                for i in range(len(full), 0, -1):
+                    nam = '.'.join(full[:i])
+                    if nam in self._names:
+                        return self._names[nam]
+        return None
+
+    def _get_dependencies(self, fileName, text, imports):
+        """ Return the set of files whose classes are used in ``fileName``.
+        """
+        claNam = self._file_classes[fileName]
+        parts = claNam.split('.')
+        # Enclosing scopes, innermost first
+        scopes = ['.'.join(parts[:i]) for i in range(len(parts), 0, -1)]
+        ret = set()
+        resolved = dict()
+        for name in set(_NAME.findall(text)):
+            if name.split('.', 1)[0] in _KEYWORDS:
+                continue
+            if name not in resolved:
+                resolved[name] = self._resolve(name, scopes, imports)
+            fil = resolved[name]
+            if fil is not None and fil != fileName:
+                ret.add(fil)
+        return ret
+
+    def get_class_file(self, class_name):
+        """ Return the file that defines the class ``class_name``.
+
+        :param class_name: The name of the class, such as
+                           ``Buildings.Fluid.Movers.SpeedControlled_y``.
+        :return: The name of the file relative to the directory of the library,
+                 with ``/`` as the separator, or ``None`` if the class is not found.
+        """
+        return self._classes.get(class_name)
+
+    def _get_dependency_files(self, fileName):
+        """ Return the ``.mo`` files on which ``fileName`` depends, including ``fileName``.
+        """
+        seen = set([fileName])
+        todo = [fileName]
+        while len(todo) > 0:
+            for dep in self._dependencies[todo.pop()]:
+                if dep not in seen:
+                    seen.add(dep)
+                    todo.append(dep)
+        return seen
+
+    def get_dependencies(self, class_name):
+        """ Return the classes that are used by ``class_name``, directly or indirectly.
+
+        :param class_name: The name of the class.
+        :return: A set with the names of the classes that are defined in the files
+                 on which the file of ``class_name`` depends.
+        """
+        fil = self.get_class_file(class_name)
+        if fil is None:
+            raise ValueError("Class '{}' is not in library '{}'.".format(class_name, self._libName))
+        seen = self._get_dependency_files(fil)
+        seen.discard(fil)
+        return set([self._file_classes[f] for f in seen])
+
+    def get_dependency_files(self, class_name):
+        """ Return the files that are used by ``class_name``, directly or indirectly.
+
+        :param class_name: The name of the class.
+        :return: A set with the ``.mo`` file of ``class_name``, the ``.mo`` files
+                 on which it depends, and the resource files and directories
+                 that these files link to. The names are relative to the directory
+                 of the library, with ``/`` as the separator.
+        """
+        fil = self.get_class_file(class_name)
+        if fil is None:
+            raise ValueError("Class '{}' is not in library '{}'.".format(class_name, self._libName))
+        ret = self._get_dependency_files(fil)
+        for f in list(ret):
+            ret.update(self._resources[f])
+        return ret
+
+    def get_dependent_files(self, changed_files):
+        """ Return the ``.mo`` files that depend on the changed files.
+
+        :param changed_files: A list with the changed files, relative to the directory
+                              of the library.
+        :return: A set with the ``.mo`` files, relative to the directory of the library
+                 and with ``/`` as the separator, that are changed or that use,
+                 directly or indirectly, a class or a resource file that is changed.
+        """
+        changed = set([os.path.normpath(f).replace(os.sep, '/') for f in changed_files])
+        # Reverse dependencies
+        dependents = dict([(f, set()) for f in self._dependencies])
+        for (fil, deps) in self._dependencies.items():
+            for dep in deps:
+                dependents[dep].add(fil)
+
+        todo = [f for f in changed if f in self._dependencies]
+        # Files that link to a changed resource, or to a directory that contains it
+        for (fil, resources) in self._resources.items():
+            for res in resources:
+                if any([c == res or c.startswith(res + '/') for c in changed]):
+                    todo.append(fil)
+                    break
+        seen = set(todo)
+        while len(todo) > 0:
+            for dep in dependents[todo.pop()]:
+                if dep not in seen:
+                    seen.add(dep)
+                    todo.append(dep)
+        return seen
+
+    def get_dependent_classes(self, changed_files):
+        """ Return the classes that depend on the changed files.
+
+        :param changed_files: A list with the changed files, relative to the directory
+                              of the library.
+        :return: A set with the names of the classes that are defined in the files
+                 returned by :meth:`get_dependent_files`, excluding nested classes.
+        """
+        return set([self._file_classes[f] for f in self.get_dependent_files(changed_files)])
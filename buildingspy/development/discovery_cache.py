@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# import from future to make Python2 behave like Python3
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from io import open
+# end of from future import
+
+import copy
+import json
+import os
+
+
+class DiscoveryCache(object):
+    """ Class that stores the regression tests that were found in the ``.mos`` scripts.
+
+    :param directory: The directory in which the cache is stored.
+
+    For each ``.mos`` script, the cache stores the data of the regression test and
+    the messages that were reported when parsing the script, together with the
+    path, the modification time and the size of the files that were read,
+    such as the ``.mos`` script and the ``.mo`` file of the model.
+    An entry is only used if none of these files changed, hence after a change,
+    only the changed scripts are parsed again.
+
+    The entries are read from the directory when the instance is constructed,
+    and written to the directory by :meth:`save`.
+
+    The cache is used by :func:`buildingspy.development.regressiontest.Tester.setDiscoveryCache`.
+
+    Usage: Type
+
+       >>> import os
+       >>> import tempfile
+       >>> import shutil
+       >>> from buildingspy.development.discovery_cache import DiscoveryCache
+       >>> cacheDir = tempfile.mkdtemp()
+       >>> mosFil = os.path.join(cacheDir, "MyModel.mos")
+       >>> with open(mosFil, mode="w", encoding="utf-8") as f:
+       ...     _ = f.write('simulateModel("MyLib.MyModel");')
+       >>> cache = DiscoveryCache(cacheDir)
+       >>> cache.set(mosFil, [mosFil], {'model_name': 'MyLib.MyModel'})
+       >>> cache.save()
+       >>> DiscoveryCache(cacheDir).get(mosFil)
+       {'model_name': 'MyLib.MyModel'}
+       >>> shutil.rmtree(cacheDir)
+
+    """
+
+    # Version of the format of the cached file
+    _VERSION = 2
+
+    def __init__(self, directory):
+        self._directory = os.path.abspath(directory)
+        if not os.path.isdir(self._directory):
+            os.makedirs(self._directory)
+        self._fileName = os.path.join(self._directory, 'discovery.json')
+        self._entries = dict()
+        self._changed = False
+        try:
+            with open(self._fileName, mode="r", encoding="utf-8") as f:
+                con = json.load(f)
+            if con['version'] == self._VERSION:
+                self._entries = con['entries']
+        except (IOError, OSError, ValueError, KeyError):
+            # The cache does not exist yet, or it has been written by another version.
+            pass
+
+    @staticmethod
+    def get_stamp(fileName):
+        """ Return a list with the modification time and the size of a file,
+        or ``None`` if the file does not exist.
+
+        :param fileName: The name of the file.
+        """
+        try:
+            sta = os.stat(fileName)
+        except OSError:
+            return None
+        # Use repr to store the modification time with its full precision.
+        return [repr(sta.st_mtime), sta.st_size]
+
+    def get(self, key):
+        """ Return the value stored for ``key``, or ``None`` if there is no value
+        or if one of its files changed.
+
+        :param key: The key, such as the name of the ``.mos`` script.
+        """
+        ent = self._entries.get(key)
+        if ent is None:
+            return None
+        for (fil, sta) in ent['files'].items():
+            if self.get_stamp(fil) != sta:
+                return None
+        # Return a copy, as the caller may change the value.
+        return copy.deepcopy(ent['value'])
+
+    def set(self, key, files, value):
+        """ Store a value.
+
+        :param key: The key, such as the name of the ``.mos`` script.
+        :param files: A list with the names of the files that the value was computed from.
+        :param value: The value, which must be serializable to json.
+        """
+        self._entries[key] = {
+            'files': dict([(fil, self.get_stamp(fil)) for fil in files]),
+            'value': copy.deepcopy(value)}
+        self._changed = True
+
+    def save(self):
+        """ Write the cache to its directory.
+
+        Entries whose first file no longer exists are removed.
+        """
+        import tempfile
+
+        for key in list(self._entries.keys()):
+            files = list(self._entries[key]['files'].keys())
+            if len(files) > 0 and not os.path.exists(files[0]):
+                del self._entries[key]
+                self._changed = True
+        if not self._changed:
+            return
+        # Write to a temporary file first, so that concurrent readers
+        # never see a partially written file.
+        (fd, tmpFil) = tempfile.mkstemp(dir=self._directory, prefix='tmp-')
+        try:
+            with open(fd, mode="w", encoding="utf-8") as f:
+                f.write(json.dumps({'version': self._VERSION, 'entries': self._entries}))
+            if os.path.exists(self._fileName):
+                os.remove(self._fileName)
+            os.rename(tmpFil, self._fileName)
+        except OSError:
+            # Another process wrote the cache in the meantime.
+            pass
+        finally:
+            if os.path.exists(tmpFil):
+                os.remove(tmpFil)
+        self._changed = False
+
+    def clear(self):
+        """ Delete all entries.
+        """
+        self._entries = dict()
+        self._changed = False
+        if os.path.exists(self._fileName):
+            os.remove(self._fileName)
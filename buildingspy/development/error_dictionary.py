@@ -19,6 +19,8 @@ from builtins import *
 from io import open
 # end of from future import
 
+import re
+
 
 class ErrorDictionary(object):
     """ Class that contains data fields needed for the
@@ -38,6 +40,15 @@ class ErrorDictionary(object):
         """
         return self._error_dict
 
+    def get_scanner(self):
+        """ Return a :class:`LogScanner` that finds the tool messages of this dictionary.
+
+        The scanner is built when this method is called for the first time.
+        """
+        if getattr(self, '_scanner', None) is None:
+            self._scanner = LogScanner(self._error_dict)
+        return self._scanner
+
     def increment_counter(self, key):
         """ Increment the error counter by one for the error type defined by *key*.
 
@@ -58,3 +69,90 @@ class ErrorDictionary(object):
         for key in keys:
             ret.append(self._error_dict[key]['tool_message'])
         return ret
+
+
+class LogScanner(object):
+    """ Class that finds the tool messages of an error dictionary in log files.
+
+    :param error_dict: The dictionary returned by :meth:`ErrorDictionary.get_dictionary`.
+
+    All tool messages are combined into one regular expression, hence each line of
+    a log file is read once, independent of the number of tool messages.
+    Only for the lines that contain a tool message, the tool messages are tested separately.
+
+    Usage: Type
+
+       >>> from buildingspy.development.error_dictionary_dymola import ErrorDictionary
+       >>> sca = ErrorDictionary().get_scanner()
+       >>> cou = sca.count(["Number of numerical Jacobians: 2",
+       ...                  "Redundant connection 1", "Redundant connection 2"])
+       >>> cou['numerical Jacobians'], cou['redundant connection'], cou['unused connector']
+       (2, 2, 0)
+
+    """
+
+    def __init__(self, error_dict):
+        # Keys of the dictionary, and functions that return the match of a line or None
+        self._keys = list(error_dict.keys())
+        self._is_regex = [bool(v.get('is_regex', False)) for v in error_dict.values()]
+        patterns = []
+        self._matchers = []
+        for (k, v) in error_dict.items():
+            if v.get('is_regex', False):
+                pattern = v['tool_message']
+                self._matchers.append(re.compile(pattern).search)
+            else:
+                pattern = re.escape(v['tool_message'])
+                self._matchers.append(self._find(v['tool_message']))
+            patterns.append('(?:{})'.format(pattern))
+        self._any = re.compile('|'.join(patterns)).search if len(patterns) > 0 else None
+
+    @staticmethod
+    def _find(message):
+        return lambda line: line if message in line else None
+
+    def scan(self, lines):
+        """ Return an iterator over the lines that contain at least one tool message.
+
+        :param lines: An iterable with the lines, such as a list or a file object.
+        :return: An iterator over tuples with the line and a list with the indices of the
+                 keys whose tool message is in the line, in the order of the dictionary.
+        """
+        if self._any is None:
+            return
+        for line in lines:
+            if self._any(line) is not None:
+                yield (line, [i for (i, mat) in enumerate(self._matchers)
+                              if mat(line) is not None])
+
+    def keys(self):
+        """ Return the keys of the dictionary, in the order of the indices of :meth:`scan`.
+        """
+        return list(self._keys)
+
+    def count(self, lines):
+        """ Return a dictionary with the number of lines that contain each tool message.
+
+        :param lines: An iterable with the lines, such as a list or a file object.
+        :return: A dictionary with the keys of the error dictionary. For tool messages that
+                 are regular expressions, the value is the sum of the integers of their first group,
+                 and otherwise, the value is the number of lines that contain the tool message.
+        """
+        counts = [0] * len(self._keys)
+        for (line, indices) in self.scan(lines):
+            for i in indices:
+                if self._is_regex[i]:
+                    counts[i] += int(self._matchers[i](line).group(1))
+                else:
+                    counts[i] += 1
+        return dict(zip(self._keys, counts))
+
+    def count_file(self, fileName):
+        """ Return the dictionary of :meth:`count` for the lines of the file ``fileName``.
+
+        :param fileName: The name of the log file.
+
+        The file is read line by line, hence large files are not loaded into memory.
+        """
+        with open(fileName, mode="rt", encoding="utf-8-sig") as fil:
+            return self.count(fil)
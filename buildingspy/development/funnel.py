@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# import from future to make Python2 behave like Python3
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from io import open
+# end of from future import
+
+import numpy as np
+
+# Maximum number of elements of the temporary arrays, which limits the memory
+# that is used for long time series and for many variables
+_MAX_SIZE = 2**20
+
+
+def _get_tolerance(values, atol, rtol):
+    """ Return the half width of the funnel, which is the maximum of the absolute
+    tolerance and of the relative tolerance multiplied by the range of ``values``.
+    """
+    tol = 0.0 if atol is None else atol
+    if rtol is not None:
+        tol = max(tol, rtol * (np.max(values) - np.min(values)))
+    return tol
+
+
+def _is_close(a, b):
+    """ Return ``True`` if the first or last values of the reference and of the test
+    data are equal, using the same tolerance as the funnel library.
+    """
+    return abs(a - b) <= 1E-10 * max(1.0, abs(a), abs(b))
+
+
+def get_errors(xReference, yReference, xTest, yTest, tol):
+    """ Return the distance of the test data to a funnel around the reference data.
+
+    :param xReference: The x values of the reference data, such as the time.
+    :param yReference: The y values of the reference data, either as a list with
+                       one value for each value of ``xReference``, or as a two-dimensional
+                       array with one row for each variable.
+    :param xTest: The x values of the test data.
+    :param yTest: The y values of the test data, with the same number of rows as
+                  ``yReference``.
+    :param tol: A dictionary with the absolute tolerances ``ax`` and ``ay``
+                and the tolerances ``rx`` and ``ry`` relative to the range of the
+                reference data. Tolerances that are ``None`` are not used.
+    :return: A numpy array with the same shape as ``yTest``, which is zero where the
+             test data are inside the funnel.
+
+    This function computes the same errors as ``pyfunnel.compareAndReport``, but it
+    does not write any files, and it compares all variables in one call.
+    The funnel is the area that a rectangle, whose half width and half height are the
+    tolerances along x and along y, covers if its center is moved along the
+    reference data.
+    The error is the distance along y of the test data to the funnel at ``xTest``.
+    The tolerance relative to the range is computed separately for each variable.
+
+    A ``ValueError`` is raised if the first or last value of ``xReference``
+    and ``xTest`` differ.
+
+    Usage: Type
+
+       >>> from buildingspy.development.funnel import get_errors
+       >>> err = get_errors([0, 1, 2], [[0, 1, 1], [0, 1, 1]], [0, 0.5, 2],
+       ...                  [[0, 0.9, 1], [0, 0.5, 1]],
+       ...                  {'ax': 0.1, 'ay': 0.1, 'rx': None, 'ry': None})
+       >>> print(err.round(3))
+       [[0.  0.2 0. ]
+        [0.  0.  0. ]]
+
+    """
+    xRef = np.asarray(xReference, dtype=float)
+    xTes = np.asarray(xTest, dtype=float)
+    yRef = np.asarray(yReference, dtype=float)
+    yTes = np.asarray(yTest, dtype=float)
+    shape = yTes.shape
+    yRef = np.atleast_2d(yRef)
+    yTes = np.atleast_2d(yTes)
+    if yRef.shape[1] != len(xRef) or yTes.shape[1] != len(xTes):
+        raise ValueError("The x and y values must have the same length.")
+    if yRef.shape[0] != yTes.shape[0]:
+        raise ValueError("The reference and test data must have the same number of variables.")
+    if len(xRef) < 2:
+        raise ValueError("The reference data must have at least two values.")
+    if not _is_close(np.min(xRef), np.min(xTes)):
+        raise ValueError("Reference and test data minimum x values are different.")
+    if not _is_close(np.max(xRef), np.max(xTes)):
+        raise ValueError("Reference and test data maximum x values are different.")
+
+    tolX = _get_tolerance(xRef, tol.get('ax'), tol.get('rx'))
+    tolY = np.array([_get_tolerance(y, tol.get('ay'), tol.get('ry')) for y in yRef])
+
+    # Segments between the reference points, with one row for each segment
+    x1 = xRef[:-1, np.newaxis]
+    x2 = xRef[1:, np.newaxis]
+    y1 = yRef[:, :-1, np.newaxis]
+    y2 = yRef[:, 1:, np.newaxis]
+    dx = x2 - x1
+    slope = (y2 - y1) / np.where(dx > 0, dx, 1.0)
+    slope[:, dx[:, 0] <= 0, :] = 0
+    yMax = np.maximum(y1, y2)
+    yMin = np.minimum(y1, y2)
+
+    # Evaluate the bounds for blocks of test points to limit the size of the arrays.
+    upper = np.empty_like(yTes)
+    lower = np.empty_like(yTes)
+    nBlo = max(1, _MAX_SIZE // (yRef.shape[0] * len(x1)))
+    for i in range(0, len(xTes), nBlo):
+        x = xTes[np.newaxis, i:i + nBlo]
+        # The upper bound of the area that a segment covers is the line through the
+        # segment, shifted by the x tolerance towards its higher point, and limited
+        # by the higher point. The lower bound is computed likewise.
+        lin = y1 + slope * (x - x1)
+        shi = np.abs(slope) * tolX
+        inside = (x >= x1 - tolX) & (x <= x2 + tolX)
+        upper[:, i:i + nBlo] = np.where(
+            inside, np.minimum(yMax, lin + shi), -np.inf).max(axis=1)
+        lower[:, i:i + nBlo] = np.where(
+            inside, np.maximum(yMin, lin - shi), np.inf).min(axis=1)
+    upper += tolY[:, np.newaxis]
+    lower -= tolY[:, np.newaxis]
+
+    err = np.maximum(0, np.maximum(yTes - upper, lower - yTes))
+    return err.reshape(shape)
@@ -0,0 +1,345 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# import from future to make Python2 behave like Python3
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from io import open
+# end of from future import
+
+import bisect
+import re
+
+# Tokens of a Modelica script. Whitespace and comments are skipped, and any other
+# character is an error.
+_TOKEN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<string>"(?:[^"\\]|\\.)*")
+  | (?P<number>(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?)
+  | (?P<name>(?:[A-Za-z_]\w*|'(?:[^'\\]|\\.)+')(?:\.(?:[A-Za-z_]\w*|'(?:[^'\\]|\\.)+'))*)
+  | (?P<operator>:=|==|<>|<=|>=|\.[-+*/^]|[-+*/^<>=(){}\[\],;:.!])
+  | (?P<error>.)
+""", re.VERBOSE | re.DOTALL)
+
+_OPEN = {'(': ')', '[': ']', '{': '}'}
+_CLOSE = {')': '(', ']': '[', '}': '{'}
+
+# Escape sequences of Modelica strings
+_ESCAPE = re.compile(r'\\(.)', re.DOTALL)
+_ESCAPED = {'n': '\n', 't': '\t', 'r': '\r'}
+
+
+class Expression(str):
+    """ Source text of an expression of a Modelica script that is neither
+    a string nor an array, such as ``3600*24`` or ``true``.
+
+    The text contains no whitespace, except a single space between two names or numbers,
+    and no comments.
+    """
+    pass
+
+
+class Command(object):
+    """ Class that stores a statement of a Modelica script, such as
+    ``simulateModel("MyLib.MyModel", stopTime=3600, resultFile="MyModel");``.
+
+    :ivar name: The name of the function that is called, such as ``simulateModel``,
+                or ``None`` if the statement is not a function call.
+    :ivar args: A list with the values of the positional arguments.
+    :ivar kwargs: A dictionary with the names and the values of the named arguments,
+                  in the order of the script.
+    :ivar target: The name of the variable to which the statement assigns its value,
+                  such as ``ok`` for ``ok := simulateModel(...)``, or ``None``.
+    :ivar value: The value of a statement that is not a function call, such as ``true``
+                 for ``Advanced.Define.DAEsolver = true``, or ``None``.
+    :ivar start: The position of the first character of the statement in the script.
+    :ivar end: The position after the last character of the statement,
+               including the semicolon if there is one.
+    :ivar line: The line number of the first character of the statement, starting at ``1``.
+
+    The values are strings for string literals, lists for arrays such as ``{"x", "y"}``,
+    and :class:`Expression` for all other expressions.
+    """
+
+    def __init__(self, name, args, kwargs, target, value, start, end, line):
+        self.name = name
+        self.args = args
+        self.kwargs = kwargs
+        self.target = target
+        self.value = value
+        self.start = start
+        self.end = end
+        self.line = line
+
+    def __repr__(self):
+        return "Command({!r}, args={!r}, kwargs={!r}, line={})".format(
+            self.name, self.args, self.kwargs, self.line)
+
+
+def _get_line(newlines, pos):
+    """ Return the line number of the position ``pos``.
+    """
+    return bisect.bisect_right(newlines, pos) + 1
+
+
+def _iter_tokens(text, newlines):
+    """ Return an iterator over the tokens of ``text``, each as a tuple with the kind,
+    the text, the start and the end position of the token.
+    """
+    pos = 0
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        kind = m.lastgroup
+        if kind == 'error':
+            raise ValueError("Line {}: Unexpected character '{}'{}.".format(
+                _get_line(newlines, pos), m.group(),
+                ", the string is not terminated" if m.group() == '"' else ""))
+        if kind == 'comment' and m.group().startswith('/*') and not m.group().endswith('*/'):
+            raise ValueError("Line {}: The comment is not terminated.".format(
+                _get_line(newlines, pos)))
+        if kind != 'space' and kind != 'comment':
+            yield (kind, m.group(), m.start(), m.end())
+        pos = m.end()
+
+
+def _is_word(token):
+    return token[0] == 'name' or token[0] == 'number'
+
+
+def _join(tokens):
+    """ Return the source text of ``tokens`` without whitespace.
+    """
+    s = tokens[0][1]
+    for i in range(1, len(tokens)):
+        if _is_word(tokens[i - 1]) and _is_word(tokens[i]):
+            s += ' '
+        s += tokens[i][1]
+    return s
+
+
+def _unescape(string):
+    """ Return the content of a string literal.
+    """
+    return _ESCAPE.sub(lambda m: _ESCAPED.get(m.group(1), m.group(1)), string[1:-1])
+
+
+def _split(tokens):
+    """ Split ``tokens`` at the commas that are not inside brackets.
+    """
+    if len(tokens) == 0:
+        return []
+    parts = [[]]
+    depth = 0
+    for tok in tokens:
+        if tok[1] in _OPEN:
+            depth += 1
+        elif tok[1] in _CLOSE:
+            depth -= 1
+        elif tok[1] == ',' and depth == 0:
+            parts.append([])
+            continue
+        parts[-1].append(tok)
+    for par in parts:
+        if len(par) == 0:
+            raise ValueError("Expected an expression before ','.")
+    return parts
+
+
+def _is_enclosed(tokens, opening):
+    """ Return ``True`` if the first token is ``opening`` and its closing bracket is
+    the last token.
+    """
+    if len(tokens) < 2 or tokens[0][1] != opening:
+        return False
+    depth = 0
+    for (i, tok) in enumerate(tokens):
+        if tok[1] in _OPEN:
+            depth += 1
+        elif tok[1] in _CLOSE:
+            depth -= 1
+            if depth == 0:
+                return i == len(tokens) - 1
+    return False
+
+
+def _get_value(tokens):
+    """ Return the value of the expression ``tokens``.
+    """
+    if len(tokens) == 1 and tokens[0][0] == 'string':
+        return _unescape(tokens[0][1])
+    if _is_enclosed(tokens, '{'):
+        return [_get_value(ele) for ele in _split(tokens[1:-1])]
+    return Expression(_join(tokens))
+
+
+def _get_command(tokens, start, end, line):
+    """ Return the :class:`Command` of the statement ``tokens``, without the semicolon.
+    """
+    target = None
+    if len(tokens) > 2 and tokens[0][0] == 'name' and tokens[1][1] in ('=', ':='):
+        target = tokens[0][1]
+        tokens = tokens[2:]
+    if len(tokens) > 2 and tokens[0][0] == 'name' and _is_enclosed(tokens[1:], '('):
+        args = []
+        kwargs = dict()
+        for arg in _split(tokens[2:-1]):
+            if len(arg) > 2 and arg[0][0] == 'name' and arg[1][1] == '=':
+                kwargs[arg[0][1]] = _get_value(arg[2:])
+            else:
+                args.append(_get_value(arg))
+        return Command(tokens[0][1], args, kwargs, target, None, start, end, line)
+    value = _get_value(tokens) if len(tokens) > 0 else None
+    return Command(None, [], dict(), target, value, start, end, line)
+
+
+def parse(text):
+    """ Parse a Modelica script, and return a list with its statements.
+
+    :param text: The content of the script.
+    :return: A list with a :class:`Command` for each statement.
+
+    The script is read in one pass. Statements end with a semicolon, or at the end of a line
+    if the statement is complete and the next line does not continue it.
+    Hence, commands can span several lines, and several commands can be on one line.
+    A ``ValueError`` is raised if the script has an unterminated string or comment,
+    or unbalanced brackets.
+
+    Usage: Type
+
+       >>> from buildingspy.development.mos_script import parse
+       >>> coms = parse('''simulateModel("MyLib.MyModel", stopTime=3600*24, resultFile="MyModel");
+       ... createPlot(id=1,
+       ...   y={"x", "y[1, 1]"}) // Plot two variables''')
+       >>> coms[0].name, coms[0].args, coms[0].kwargs['stopTime']
+       ('simulateModel', ['MyLib.MyModel'], '3600*24')
+       >>> coms[1].kwargs['y'], coms[1].line
+       (['x', 'y[1, 1]'], 2)
+
+    """
+    newlines = [m.start() for m in re.finditer('\n', text)]
+    commands = []
+    cur = []
+    stack = []
+
+    def add(end):
+        if len(cur) > 0:
+            commands.append(_get_command(
+                cur, cur[0][2], end, _get_line(newlines, cur[0][2])))
+        del cur[:]
+
+    for tok in _iter_tokens(text, newlines):
+        val = tok[1]
+        if len(stack) == 0 and len(cur) > 0 and val != ';' and tok[0] == 'name':
+            # A statement without semicolon ends at the end of the line, unless
+            # the line ends with an operator.
+            prev = cur[-1]
+            if (prev[0] != 'operator' or prev[1] in _CLOSE) and \
+                    text.count('\n', prev[3], tok[2]) > 0:
+                add(prev[3])
+        if val in _OPEN:
+            stack.append(tok)
+        elif val in _CLOSE:
+            if len(stack) == 0 or stack[-1][1] != _CLOSE[val]:
+                raise ValueError("Line {}: Unexpected '{}'.".format(
+                    _get_line(newlines, tok[2]), val))
+            stack.pop()
+        elif val == ';' and len(stack) == 0:
+            add(tok[3])
+            continue
+        cur.append(tok)
+    if len(stack) > 0:
+        raise ValueError("Line {}: '{}' is not closed.".format(
+            _get_line(newlines, stack[-1][2]), stack[-1][1]))
+    if len(cur) > 0:
+        add(cur[-1][3])
+    return commands
+
+
+def parse_file(fileName):
+    """ Parse a Modelica script, and return a list with its statements.
+
+    :param fileName: The name of the ``.mos`` file.
+    :return: The list of :func:`parse`.
+    """
+    with open(fileName, mode="r", encoding="utf-8-sig") as fil:
+        return parse(fil.read())
+
+
+def parse_value(text, pos=0):
+    """ Parse the value of an argument of a Modelica script.
+
+    :param text: A string, such as a line of a script.
+    :param pos: The position of the value in ``text``.
+    :return: The value, which ends before the first comma, semicolon or closing bracket
+             that is not inside brackets.
+
+    A ``ValueError`` is raised if the value has an unterminated string
+    or unbalanced brackets.
+
+    Usage: Type
+
+       >>> from buildingspy.development.mos_script import parse_value
+       >>> parse_value('createPlot(y = {"a", "b"}, grid=true);', 15)
+       ['a', 'b']
+
+    """
+    tokens = []
+    depth = 0
+    for tok in _iter_tokens(text[pos:], []):
+        if tok[1] in _OPEN:
+            depth += 1
+        elif tok[1] in _CLOSE:
+            depth -= 1
+        if depth < 0 or (depth == 0 and tok[1] in (',', ';')):
+            break
+        tokens.append(tok)
+    if depth > 0:
+        raise ValueError("The value '{}' is not closed.".format(text[pos:].strip()))
+    if len(tokens) == 0:
+        raise ValueError("Did not find a value in '{}'.".format(text[pos:].strip()))
+    return _get_value(tokens)
+
+
+def remove_commands(text, names):
+    """ Remove commands from a Modelica script.
+
+    :param text: The content of the script.
+    :param names: A list with the names of the functions whose commands are removed,
+                  such as ``['createPlot', 'removePlots']``.
+    :return: The content of the script without these commands. Lines that only contain
+             removed commands are removed.
+
+    Usage: Type
+
+       >>> from buildingspy.development.mos_script import remove_commands
+       >>> print(remove_commands('''simulateModel("MyLib.MyModel");
+       ... createPlot(id=1,
+       ...   y={"x"});
+       ... plotExpression(x);''', ['createPlot']))
+       simulateModel("MyLib.MyModel");
+       plotExpression(x);
+
+    """
+    eol = re.compile(r'[ \t]*(?:\r?\n|\Z)')
+    out = []
+    pos = 0
+    for com in parse(text):
+        if com.name not in names:
+            continue
+        sta = com.start
+        end = com.end
+        linSta = text.rfind('\n', 0, sta) + 1
+        m = eol.match(text, end)
+        if text[max(linSta, pos):sta].strip() == '' and m is not None:
+            sta = max(linSta, pos)
+            end = m.end()
+        out.append(text[pos:sta])
+        pos = end
+    out.append(text[pos:])
+    return ''.join(out)
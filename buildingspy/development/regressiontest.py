@@ -23,6 +23,7 @@ import fnmatch
 import functools
 import glob
 import io
+import itertools
 import json
 import multiprocessing
 import numbers
@@ -43,10 +44,16 @@ import pyfunnel
 from buildingspy.development import error_dictionary_jmodelica
 from buildingspy.development import error_dictionary_optimica
 from buildingspy.development import error_dictionary_dymola
+import buildingspy.development.funnel as funnel
+import buildingspy.development.mos_script as mos_script
+from buildingspy.development.comparison_results import ComparisonResults
+from buildingspy.development.comparison_results import write_log_entry
 from buildingspy.io.outputfile import Reader
 from buildingspy.io.postprocess import Plotter
 import buildingspy.io.outputfile as of
+import buildingspy.io.reference_results as reference_results
 import buildingspy.io.reporter as rep
+from buildingspy.io.staging import stage_directory
 
 
 def runSimulation(worDir, cmd):
@@ -103,6 +110,299 @@ def runSimulation(worDir, cmd):
             sys.stderr.write("Users stopped simulation in %s.\n" % worDir)
 
 
+# Placeholder for the temporary directory in the scripts of the batches of
+# regression tests. It is replaced by the directory of the process that runs the batch.
+_WORKING_DIRECTORY = "@WORKING_DIRECTORY@"
+# Temporary directory that is used by this process to run batches of regression tests.
+_worker_directory = None
+
+
+def _initialize_worker(directories):
+    """ Assign a temporary directory to the process.
+
+    :param directories: A queue with the temporary directories that are not yet used
+                        by any process.
+
+    .. note:: This method is outside the class definition to
+              allow parallel computing.
+    """
+    global _worker_directory
+    _worker_directory = directories.get()
+
+
+def _run_batch(args):
+    """ Run a batch of regression tests in the temporary directory of this process.
+
+    :param args: A tuple ``(iBat, script, cmd, libNam)`` with the index of the batch,
+                 the script of the batch, the command passed to :func:`runSimulation`
+                 and the name of the library.
+    :return: A tuple with the index of the batch and the temporary directory in
+             which the batch was run.
+
+    .. note:: This method is outside the class definition to
+              allow parallel computing.
+    """
+    (iBat, script, cmd, libNam) = args
+    worDir = os.path.join(_worker_directory, libNam)
+    with open(os.path.join(worDir, cmd[1]), mode="w", encoding="utf-8") as fil:
+        fil.write(script.replace(_WORKING_DIRECTORY, _worker_directory.replace("\\", "/")))
+    runSimulation(worDir, cmd)
+    return (iBat, _worker_directory)
+
+
+# Tester that is used by this process to check reference results.
+_worker_tester = None
+
+
+def _initialize_reference_check(tester):
+    """ Assign the instance of :class:`Tester` that checks the reference results.
+
+    .. note:: This method is outside the class definition to
+              allow parallel computing.
+    """
+    global _worker_tester
+    _worker_tester = tester
+
+
+def _get_reference_check(args):
+    """ Read and compare the results of one regression test,
+    see :meth:`Tester._get_reference_check`.
+
+    .. note:: This method is outside the class definition to
+              allow parallel computing.
+    """
+    return _worker_tester._get_reference_check(*args)
+
+
+# Minimum number of .mos scripts that each process parses in Tester.setDataDictionary
+_MIN_SCRIPTS_PER_PROCESS = 100
+
+
+def _get_plot_variable(value):
+    """ Return the name of a plot variable of a ``.mos`` script,
+    as needed by :class:`buildingspy.io.outputfile.Reader`.
+
+    :param value: The element of the ``y`` argument of the plot command,
+                  as returned by :func:`buildingspy.development.mos_script.parse`.
+    """
+    # Replace a[1,1] by a[1, 1], which is required for the
+    # Reader to be able to read the result.
+    # Also, replace multiple white spaces with a single white space as
+    # reading .mat is picky. For example, it refused to read a[1,1] or a[1,  1]
+    return re.sub(r',\W*', ', ', str(value).replace('"', '').replace(' ', ''))
+
+
+def _get_string_argument(commands, keyword):
+    """ Return the value of the first argument ``keyword`` of ``commands``
+    that is a string, or ``None``.
+    """
+    for com in commands:
+        if keyword in com.kwargs and \
+                not isinstance(com.kwargs[keyword], (mos_script.Expression, list)):
+            return com.kwargs[keyword]
+    return None
+
+
+def _get_model_argument(command):
+    """ Return the name of the model of a ``simulateModel`` command, or ``None``.
+    """
+    modNam = command.kwargs.get('problem', command.args[0] if len(command.args) > 0 else None)
+    if modNam is None or isinstance(modNam, (mos_script.Expression, list)):
+        return None
+    return modNam
+
+
+def _parse_mos_file(libHome, root, mosFil, tool, include_fmu_test, reporter):
+    """ Parse a ``.mos`` script, and return the data of its regression test.
+
+    See :func:`_get_test_data` for the arguments.
+    A ``ValueError`` is raised if the result file cannot be determined.
+    """
+    scrDir = os.path.join(libHome, 'Resources', 'Scripts', 'Dymola')
+    # Path and name of mos file without 'Resources/Scripts/Dymola'
+    dat = {
+        'ScriptFile': os.path.join(root[len(scrDir) + 1:], mosFil),
+        'mustSimulate': False,
+        'mustExportFMU': False}
+    # Parse all commands of the mos file in one pass.
+    try:
+        commands = mos_script.parse_file(os.path.join(root, mosFil))
+    except ValueError as e:
+        s = "%s could not be parsed.\n" % mosFil
+        s += "%s\n" % e
+        reporter.writeError(s)
+        return dat
+
+    for com in commands:
+        # Add the model name to the dictionary.
+        # This is needed to export the model as an FMU.
+        # Also, set the flag mustSimulate to True.
+        modNam = _get_model_argument(com) if com.name == 'simulateModel' else None
+        if modNam is not None:
+            dat['mustSimulate'] = True
+            dat['model_name'] = modNam
+            dat['TranslationLogFile'] = modNam + ".translation.log"
+            # parse startTime and stopTime, if any
+            for attr in ["startTime", "stopTime"]:
+                if attr in com.kwargs:
+                    dat[attr] = str(com.kwargs[attr])
+
+        # Check if this model need to be translated as an FMU.
+        if include_fmu_test and com.name == 'translateModelFMU':
+            dat['mustExportFMU'] = True
+            if 'modelToOpen' in com.kwargs:
+                dat['modelToOpen'] = str(com.kwargs['modelToOpen'])
+            # Dymola uses in translateModelFMU the syntax
+            # modelName=... but our dictionary uses model_name
+            if 'modelName' in com.kwargs:
+                dat['model_name'] = str(com.kwargs['modelName'])
+            # The .mos script allows modelName="", hence
+            # we set the model name to be the entry of modelToOpen
+            if "model_name" in dat and dat["model_name"] == "":
+                if "modelToOpen" in dat:
+                    dat["model_name"] = dat["modelToOpen"]
+
+    # Get tolerance from mo file. This is used to set the tolerance
+    # for OPTIMICA and JModelica.
+    # Only get the tolerance for the models that need to be simulated,
+    # because those that are only exported as FMU don't need this setting.
+    if dat['mustSimulate']:
+        try:
+            dat['tolerance'] = Tester.get_tolerance(
+                libHome, dat['model_name'])
+        except Exception as e:
+            reporter.writeError(str(e))
+            dat['tolerance'] = None
+
+    # We are finished iterating over all lines of the .mos
+
+    # For FMU export, if model_name="", then Dymola uses the
+    # Modelica class name, with "." replaced by "_".
+    # If the Modelica class name consists of "_", then they
+    # are replaced by "_0".
+    # Hence, we update dat['model_name'] if needed.
+    if dat['mustExportFMU']:
+        # Strip quotes from model_name and modelToOpen
+        dat['FMUName'] = dat['model_name'].strip('"')
+        dat['modelToOpen'] = dat['modelToOpen'].strip('"')
+
+        # Update the name of the FMU if model_name is "" in .mos file.
+        if len(dat["FMUName"]) == 0:
+            dat['FMUName'] = dat['modelToOpen']
+        # Update the FMU name, for example to change
+        # Buildings.Fluid.FMI.Examples.FMUs.IdealSource_m_flow to
+        # Buildings_Fluid_FMI_Examples_FMUs_IdealSource_0m_0flow
+        dat['FMUName'] = dat['FMUName'].replace("_", "_0").replace(".", "_")
+        dat['FMUName'] = dat['FMUName'] + ".fmu"
+
+    # Plot variables are only used for those models that need to be simulated.
+    # For JModelica, if dat['jmodelica']['simulate'] == False:
+    #   dat['ResultVariables'] is reset to [] in _add_experiment_specifications
+    if dat['mustSimulate']:
+        plotVars = []
+        for com in commands:
+            if isinstance(com.kwargs.get('y'), list):
+                plotVars.append([_get_plot_variable(v) for v in com.kwargs['y']])
+
+        if len(plotVars) == 0:
+            s = "%s does not contain any plot command.\n" % mosFil
+            s += "You need to add a plot command to include its\n"
+            s += "results in the regression tests.\n"
+            reporter.writeError(s)
+
+        # Store grouped plot variables without duplicates.
+        # (Duplicates happen when the same y variables are plotted against
+        # different x variables.)
+        dat['ResultVariables'] = []
+        for v_i in plotVars:
+            if v_i not in dat['ResultVariables']:
+                dat['ResultVariables'].append(v_i)
+
+        # search for the result file
+        matFil = _get_string_argument(commands, 'resultFile')
+        if matFil is not None:
+            # Add the .mat extension as this is not included in the
+            # resultFile entry.
+            matFil = matFil + '.mat'
+
+        if tool == 'optimica' or tool == 'jmodelica':
+            matFil = '{}_result.mat'.format(
+                re.sub(r'\.', '_', dat['model_name']))
+
+        # Some *.mos file only contain plot commands, but no simulation.
+        # Hence, if 'resultFile=' could not be found, try to get the file that
+        # is used for plotting.
+        # Note that the filename entry already has the .mat extension.
+        if matFil is None:
+            matFil = _get_string_argument(commands, 'filename')
+        if matFil is None or len(matFil) == 0:
+            raise ValueError('Did not find *.mat file in ' + mosFil)
+
+        dat['ResultFile'] = matFil
+    return dat
+
+
+def _get_test_data(args):
+    """ Parse a ``.mos`` script, and return the data of its regression test.
+
+    :param args: A tuple ``(libHome, root, mosFil, tool, include_fmu_test)`` with the home
+                 directory of the library, the directory and the name of the ``.mos`` script,
+                 the Modelica tool and the flag whether FMU export is tested.
+    :return: A dictionary with the entry of the regression test in ``Tester._data`` as ``data``,
+             or ``None`` if the script neither simulates a model nor exports an FMU,
+             the ``records`` of the messages for the reporter,
+             a list with the ``files`` that were read, which are the script and the ``.mo``
+             file of the model, and the ``error`` message if the script could not be parsed.
+
+    .. note:: This method is outside the class definition to
+              allow parallel computing.
+    """
+    (libHome, root, mosFil, tool, include_fmu_test) = args
+    reporter = rep.MessageRecorder()
+    ret = {'data': None,
+           'records': reporter.records,
+           'files': [os.path.abspath(os.path.join(root, mosFil))],
+           'error': None}
+    try:
+        dat = _parse_mos_file(libHome, root, mosFil, tool, include_fmu_test, reporter)
+    except ValueError as e:
+        ret['error'] = str(e)
+        return ret
+    if dat['mustSimulate']:
+        # The tolerance is read from the .mo file of the model.
+        ret['files'].append(os.path.abspath(os.path.join(
+            libHome, '..', dat['model_name'].replace('.', os.path.sep) + ".mo")))
+    if dat['mustSimulate'] or dat['mustExportFMU']:
+        ret['data'] = dat
+    return ret
+
+
+# Messages of JModelica after which the translation log is not searched for warnings
+_IGNORED_JMODELICA_MESSAGES = (
+    "Ignoring erroneous 'each' for the modification ' = reference_X'",
+    "Ignoring erroneous 'each' for the modification ' = fill(0,0)'",
+    """Ignoring erroneous 'each' for the modification ' = {","}'""")
+
+
+def _compute_legacy_errors(yOld, yInt, tol):
+    """ Return the errors of the legacy comparison.
+
+    :param yOld: A two-dimensional array with the reference results, with one row per variable.
+    :param yInt: A two-dimensional array with the new results at the same time stamps.
+    :param tol: The absolute tolerance.
+    :return: A tuple with the absolute errors, the relative errors and their sum,
+             which have the same shape as ``yOld``.
+
+    The relative error is zero where the magnitude of the reference result is
+    at most ten times the tolerance.
+    """
+    errAbs = np.abs(yOld - yInt)
+    absOld = np.abs(yOld)
+    errRel = np.zeros_like(errAbs)
+    np.divide(errAbs, absOld, out=errRel, where=absOld > 10 * tol)
+    return (errAbs, errRel, errAbs + errRel)
+
+
 @contextmanager
 def _stdout_redirector(stream):
     """ Redirects sys.stdout to stream."""
@@ -183,6 +483,8 @@ class Tester(object):
        <BLANKLINE>
        Comparison files output by funnel are stored in the directory 'funnel_comp' of size ... MB.
        Run 'report' method of class 'Tester' to access a summary of the comparison results.
+       The report only plots the variables that exceed the tolerance.
+       Call 'writeAllFunnelFiles(True)' before running the tests to plot all variables.
        <BLANKLINE>
        Script that runs unit tests had 0 warnings and 0 errors.
        <BLANKLINE>
@@ -270,6 +572,8 @@ class Tester(object):
         self._failed_simulator_log_file = "failed-simulator-{}.log".format(tool)
         # File to which statistics is written to
         self._statistics_log = "statistics.json"
+        # Batches of regression tests, see _write_runscripts
+        self._batches = []
         self._nPro = multiprocessing.cpu_count()
         self._batch = False
         self._pedanticModelica = False
@@ -286,10 +590,28 @@ class Tester(object):
 
         # Flag to delete temporary directories.
         self._deleteTemporaryDirectories = cleanup
+        # Method used to stage the library in the temporary directories.
+        self._staging_method = 'auto'
 
         # Flag to use existing results instead of running a simulation.
         self._useExistingResults = False
 
+        # Cache of result files, or None if result files are not cached.
+        self._result_cache = None
+        self._runtime_history = None
+        # Changed files, if only the tests that depend on them are run
+        self._changed_files = None
+        # Cache of the fingerprints of tests that passed, or None if tests are not skipped.
+        self._verdict_cache = None
+        # Cache of the data of the regression tests, or None if the .mos scripts are not cached.
+        self._discovery_cache = None
+        # Models of the tests that failed, and number of messages reported by these tests
+        self._failed_tests = set()
+        self._nTestMessages = 0
+
+        # Format of the reference results, which is also the extension of their files
+        self._reference_format = 'txt'
+
         # Flag to compare results against reference points for OPTIMICA and JModelica.
         self._skip_verification = skip_verification
         #self._skip_verification = True
@@ -317,9 +639,16 @@ class Tester(object):
                 'Using legacy comparison tool: absolute tolerance along y axis must be specified.')
 
         # Data structures for storing comparison data.
-        self._comp_info = []
+        self._comp_info = ComparisonResults()
+        # Index of the variable groups of the tests, see _get_variable_groups
+        self._var_groups = dict()
         self._comp_log_file = "comparison-{}.log".format(tool)
         self._comp_dir = "funnel_comp"
+        # Flag to write the funnel files also for the variables that are within the tolerance.
+        self._write_all_funnel_files = False
+        # Errors of the variables of the test whose results are compared.
+        self._funnel_errors = dict()
+        self._legacy_errors = dict()
 
         # (Delete and) Create directory for storing funnel data.
         # Done by run method to allow for runing report method without having to rerun simulations.
@@ -363,6 +692,11 @@ class Tester(object):
         """Builds and displays HTML report.
 
         Serves until timeout (s) or KeyboardInterrupt.
+
+        The variables can only be plotted if the files of the funnel comparison
+        have been written. By default, these files are only written for the variables
+        that exceed the tolerance. To plot all variables, call
+        :meth:`writeAllFunnelFiles` with ``True`` before running the regression tests.
         """
         if self._comp_tool != 'funnel':
             raise ValueError('Report is only available with comp_tool="funnel".')
@@ -391,6 +725,19 @@ class Tester(object):
 
         server.browse(browser=browser, timeout=60 * 15)
 
+    def writeAllFunnelFiles(self, write):
+        """ Flag, if set to ``True``, then the files of the funnel comparison are written
+        for all variables.
+
+        :param write: Flag, set to ``True`` to write the files for all variables.
+
+        The files contain the reference and test data, the funnel bounds and the errors,
+        and they are used by :meth:`report` to plot the variables.
+        Unless this method is called prior to running the regression tests with ``write=True``,
+        the files are only written for the variables that exceed the tolerance.
+        """
+        self._write_all_funnel_files = write
+
     def get_unit_test_log_file(self):
         """ Return the name of the log file of the unit tests,
             such as ``unitTests-optimica.log``, ``unitTests-jmodelica.log`` or ``unitTests-dymola.log``.
@@ -456,6 +803,165 @@ class Tester(object):
         self.deleteTemporaryDirectories(False)
         self._useExistingResults = True
 
+    def setResultCache(self, directory, maxSize=10E9):
+        """ Cache the result files in a columnar format for faster reading.
+
+        :param directory: The directory in which the cached files are stored.
+        :param maxSize: The maximum size of the cache in bytes.
+
+        This method can be used together with :func:`useExistingResults`, in which case
+        the same result files are read repeatedly.
+        See :class:`buildingspy.io.resultcache.ResultCache` for details.
+
+        >>> import os
+        >>> import tempfile
+        >>> import buildingspy.development.regressiontest as r
+        >>> rt = r.Tester()
+        >>> rt.setResultCache(os.path.join(tempfile.gettempdir(), "buildingspy-cache"))
+        >>> rt.useExistingResults(['/tmp/tmp-Buildings-0-zABC44'])
+        >>> rt.run() # doctest: +SKIP
+
+        """
+        from buildingspy.io.resultcache import ResultCache
+
+        self._result_cache = ResultCache(directory, maxSize)
+
+    def setRuntimeHistory(self, fileName):
+        """ Store the computing time of the regression tests in a database.
+
+        :param fileName: The name of the SQLite database file.
+
+        After each run, the translation and simulation time of each model, as reported
+        by the simulator, are added to the database.
+        The median computing times of the previous runs are then used to start
+        the regression tests that take longest first.
+        See :class:`buildingspy.development.runtime_history.RuntimeHistory` for how
+        to query the database.
+
+        >>> import os
+        >>> import tempfile
+        >>> import buildingspy.development.regressiontest as r
+        >>> rt = r.Tester()
+        >>> rt.setRuntimeHistory(os.path.join(tempfile.gettempdir(), "runtimes.sqlite"))
+        >>> rt.run() # doctest: +SKIP
+
+        """
+        from buildingspy.development.runtime_history import RuntimeHistory
+
+        self._runtime_history = RuntimeHistory(fileName)
+
+    def getRuntimeHistory(self):
+        """ Return the database with the computing time of the regression tests.
+
+        :return: An instance of :class:`buildingspy.development.runtime_history.RuntimeHistory`,
+                 or ``None`` if :func:`setRuntimeHistory` has not been called.
+        """
+        return self._runtime_history
+
+    def setVerdictCache(self, directory, maxSize=100E6):
+        """ Skip the regression tests that passed before and that did not change since.
+
+        :param directory: The directory in which the fingerprints of the tests that passed
+                          are stored.
+        :param maxSize: The maximum size of the cache in bytes.
+
+        For each test, a fingerprint is computed from the content of the ``.mo`` files
+        that the model uses, directly or indirectly, the resource files they link to,
+        the ``.mos`` script, the reference results, the experiment specification,
+        the simulator and its version, and the settings of this class that affect the
+        outcome of the test, such as :func:`pedanticModelica`.
+        If a test with the same fingerprint passed before, it is not run again.
+        After the run, the fingerprints of the tests that passed are added to the cache.
+        A test only passes if no error and no warning was reported for it.
+
+        The version of the simulator is taken to be the location, size and modification
+        time of its executable. Changes to other libraries than the one that is tested
+        are not detected, unless they are installed with the simulator.
+        As OpenModelica does not verify the results, this method has no effect
+        if the tool is ``omc``.
+        See :class:`buildingspy.development.verdict_cache.VerdictCache` for details.
+
+        >>> import os
+        >>> import tempfile
+        >>> import buildingspy.development.regressiontest as r
+        >>> rt = r.Tester()
+        >>> rt.setVerdictCache(os.path.join(tempfile.gettempdir(), "buildingspy-verdicts"))
+        >>> rt.run() # doctest: +SKIP
+
+        """
+        from buildingspy.development.verdict_cache import VerdictCache
+
+        self._verdict_cache = VerdictCache(directory, maxSize)
+
+    def setDiscoveryCache(self, directory):
+        """ Cache the data of the regression tests that are parsed from the ``.mos`` scripts.
+
+        :param directory: The directory in which the cache is stored.
+
+        When the regression tests are searched, only the ``.mos`` scripts that changed,
+        or whose model changed, since the last search are parsed again.
+        A file is considered to have changed if its modification time or its size changed.
+        This method needs to be called before :func:`setSinglePackage` or :func:`run`.
+        See :class:`buildingspy.development.discovery_cache.DiscoveryCache` for details.
+
+        >>> import os
+        >>> import tempfile
+        >>> import buildingspy.development.regressiontest as r
+        >>> rt = r.Tester()
+        >>> rt.setDiscoveryCache(os.path.join(tempfile.gettempdir(), "buildingspy-discovery"))
+        >>> rt.run() # doctest: +SKIP
+
+        """
+        from buildingspy.development.discovery_cache import DiscoveryCache
+
+        self._discovery_cache = DiscoveryCache(directory)
+
+    def setStagingMethod(self, method):
+        """ Set how the library is staged in the temporary directories.
+
+        :param method: The method, which is ``hardlink``, ``reflink``, ``symlink``,
+                       ``copy`` or ``auto``.
+
+        By default, the method is ``auto``, for which the files of the library are
+        hard linked into each temporary directory, and copied if hard links are
+        not supported. This avoids copying large libraries once for each processor.
+        See :func:`buildingspy.io.staging.stage_directory` for details.
+
+        >>> import buildingspy.development.regressiontest as r
+        >>> rt = r.Tester()
+        >>> rt.setStagingMethod('copy')
+
+        """
+        if method not in ['auto', 'hardlink', 'reflink', 'symlink', 'copy']:
+            raise ValueError(
+                "Argument 'method' must be 'auto', 'hardlink', 'reflink', 'symlink' or 'copy'."
+                " Received '{}'.".format(method))
+        self._staging_method = method
+
+    def setReferenceResultsFormat(self, fmt):
+        """ Set the format of the reference results.
+
+        :param fmt: The format, which is ``txt`` or ``npz``.
+
+        By default, the format is ``txt``, for which the reference results are
+        text files with one line per variable, such as
+        ``Resources/ReferenceResults/Dymola/Buildings_Fluid_Examples_A.txt``.
+        For ``npz``, the reference results are compressed binary files that
+        are faster to read and write, such as
+        ``Resources/ReferenceResults/Dymola/Buildings_Fluid_Examples_A.npz``.
+        Existing reference results can be converted with
+        :func:`buildingspy.io.reference_results.convert`.
+
+        >>> import buildingspy.development.regressiontest as r
+        >>> rt = r.Tester()
+        >>> rt.setReferenceResultsFormat('npz')
+
+        """
+        if fmt not in reference_results.FORMATS:
+            raise ValueError(
+                "Argument 'fmt' must be 'txt' or 'npz'. Received '{}'.".format(fmt))
+        self._reference_format = fmt
+
     def setNumberOfThreads(self, number):
         """ Set the number of parallel threads that are used to run the regression tests.
 
@@ -777,6 +1283,94 @@ class Tester(object):
                 raise ValueError(msg)
             self.setDataDictionary(rooPat)
 
+    def setChangedFiles(self, fileNames):
+        """
+        Run only the regression tests that depend on changed files.
+
+        :param fileNames: A list with the names of the changed files, either absolute
+                          or relative to the directory of the library.
+
+        Calling this method will cause the regression tests to run only for
+        the models that use, directly or indirectly, a class or a resource file
+        that is in ``fileNames``, and for the tests whose ``.mos`` script or reference
+        results are in ``fileNames``.
+        The dependencies are obtained from
+        :class:`buildingspy.development.dependency_graph.DependencyGraph`.
+        If ``Resources/Scripts/BuildingsPy/conf.json`` changed, all regression tests are run.
+
+        This method can be combined with :func:`setSinglePackage`, which
+        needs to be called first.
+
+        For example, to run the tests that depend on the base class of the movers, type
+
+        >>> import os
+        >>> import buildingspy.development.regressiontest as r
+        >>> rt = r.Tester()
+        >>> rt.setChangedFiles(['Fluid/Movers/BaseClasses/PartialFlowMachine.mo']) # doctest: +SKIP
+        >>> rt.run() # doctest: +SKIP
+
+        """
+        from buildingspy.development.dependency_graph import DependencyGraph
+
+        if self.get_number_of_tests() == 0:
+            self.setDataDictionary(self._rootPackage)
+
+        changed = set()
+        for fil in fileNames:
+            if os.path.isabs(fil):
+                fil = os.path.relpath(fil, self._libHome)
+            changed.add(os.path.normpath(fil).replace(os.sep, '/'))
+
+        self._changed_files = sorted(changed)
+        if 'Resources/Scripts/BuildingsPy/conf.json' in changed:
+            self._reporter.writeOutput(
+                "Running all regression tests as the experiment specifications changed.")
+            return
+
+        graph = DependencyGraph(self._libHome)
+        affected = graph.get_dependent_classes(changed)
+        data = []
+        for dat in self._data:
+            scrFil = os.path.join('Resources', 'Scripts', 'Dymola', dat['ScriptFile'])
+            # Name of the reference results in any format, see _checkReferencePoints
+            refFil = os.path.splitext(self._get_reference_file_name(dat))[0]
+            model = dat['modelToOpen'] if 'modelToOpen' in dat else dat['model_name']
+            if model in affected or \
+                    graph.get_class_file(model) is None or \
+                    scrFil.replace(os.sep, '/') in changed or \
+                    any([c.startswith('Resources/ReferenceResults/') and
+                         os.path.splitext(c)[0].endswith('/' + refFil) for c in changed]):
+                data.append(dat)
+        self._data = data
+        # Inform the user that not all tests are run, but don't add to warnings
+        # as this would flag the test to have failed
+        self._reporter.writeOutput(
+            "Regression tests are only run for the {} model{} that depend on "
+            "the {} changed file{}.".format(len(data), '' if len(data) == 1 else 's',
+                                            len(changed), '' if len(changed) == 1 else 's'))
+
+    def setChangedSinceRevision(self, revision):
+        """
+        Run only the regression tests that depend on files that changed since a git revision.
+
+        :param revision: The git revision, such as ``master`` or ``HEAD~3``.
+
+        The changed files are the files of the library that differ between the
+        revision and the working tree, and the files that are not yet tracked by git.
+        See :func:`setChangedFiles` for how the regression tests are selected.
+        """
+        def git(args):
+            out = subprocess.check_output(['git'] + args, cwd=self._libHome)
+            return [lin for lin in out.decode('utf-8').splitlines() if len(lin) > 0]
+
+        try:
+            changed = git(['diff', '--name-only', '--relative', revision, '--'])
+            changed += git(['ls-files', '--others', '--exclude-standard'])
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise ValueError(
+                "Failed to get the files that changed since revision '{}': {}".format(revision, e))
+        self.setChangedFiles(changed)
+
     def writeOpenModelicaResultDictionary(self):
         """ Write in ``Resources/Scripts/OpenModelica/compareVars`` files whose
         name are the name of the example model, and whose content is::
@@ -824,8 +1418,10 @@ class Tester(object):
         """ For a string of the form `*y={aa,bb,cc}*`, optionally with whitespace characters,
         return the list `[aa, bb, cc]`.
         If the string does not contain `y = ...`, return `None`.
+        The array may span multiple lines, and a `ValueError` is raised
+        if it is not closed.
 
-        A usage may be as follows. Note that the second call returns `None` as
+        A usage may be as follows. Note that the third call returns `None` as
         it has a different format.
 
           >>> import buildingspy.development.regressiontest as r
@@ -837,42 +1433,19 @@ class Tester(object):
           True
 
         """
-        import re
-        import shlex
-
-        # Make sure line has no "y = {..." that is not closed, e.g., it spans multiple lines
-        incomplete = re.search(r"y\s*=\s*{.*\n", line)
-        # This evaluates for example
-        #   re.search("y.*=.*{.*}", "aay = {aa, bb, cc}aa").group()
-        #   'y = {aa, bb, cc}'
-        var = re.search(r"y\s*=\s*{.*}", line)
-        if var is None and incomplete is None:
+        # This finds for example
+        #   re.search(r"y\s*=\s*{", "aay = {aa, bb, cc}aa").group()
+        #   'y = {'
+        var = re.search(r"y\s*=\s*{", line)
+        if var is None:
             return None
-        if var is None and incomplete is not None:
-            msg = "Malformed line '{}'".format(line)
-            raise ValueError(msg)
-
-        s = var.group()
-        s = re.search('{.*?}', s).group()
-        s = s.strip('{}')
-        # Use the lexer module as simply splitting by "," won't work because arrays have
+        # Parse the array, which may span multiple lines and contain
         # commas in the form "a[1, 1]", "a[1, 2]"
-        lexer = shlex.shlex(s)
-        lexer.quotes = '"'
-        lexer.whitespace = ", \t"  # Skip commas, otherwise they are also returned as a token
-        y = list(lexer)
-
-        for i in range(len(y)):
-            # Remove quotes as we deal with a string already
-            y[i] = y[i].replace('"', '')
-            # Strip whitespace characters
-            y[i] = y[i].strip()
-            # Replace a[1,1] by a[1, 1], which is required for the
-            # Reader to be able to read the result.
-            # Also, replace multiple white spaces with a single white space as
-            # reading .mat is picky. For example, it refused to read a[1,1] or a[1,  1]
-            y[i] = re.sub(r',\W*', ', ', y[i])
-        return y
+        try:
+            y = mos_script.parse_value(line, var.end() - 1)
+        except ValueError:
+            raise ValueError("Malformed line '{}'".format(line))
+        return [_get_plot_variable(v) for v in y]
 
     @staticmethod
     def get_tolerance(library_home, model_name):
@@ -912,39 +1485,17 @@ class Tester(object):
            :param: root_package The name of the top-level package for which the files need to be parsed.
                                 Separate package names with a period.
 
+        The ``.mos`` scripts are parsed in parallel, and if :func:`setDiscoveryCache`
+        has been called, only the scripts that changed since the last call are parsed.
         """
-        def _get_attribute_value(line, keyword, dat):
-            """ Get the value of an attribute in the `.mos` file.
-
-                This function will remove leading and ending quotes.
-
-                :param line: The line that contains the keyword and the value.
-                :param keyword: The keyword
-                :param dat: The data dictionary to which dat[keyword] = value will be written.
-
-            """
-            line = re.sub(' ', '', line)
-            pos = line.find(keyword)
-            if pos > -1:
-                posEq = line.find('=', pos)
-                posComma = line.find(',', pos)
-                posBracket = line.find(')', pos)
-                posEnd = min(posComma, posBracket)
-                if posEnd < 0:
-                    posEnd = max(posComma, posBracket)
-                # Ensure that keyword is directly located before the next = sign
-                if posEq == pos + len(keyword):
-                    entry = line[posEq + 1:posEnd]
-                    dat[keyword] = re.sub(r'^"|"$', '', entry)
-            return
-
         old_len = self.get_number_of_tests()
         # Check if the data dictionary has already been set, in
         # which case we return doing nothing.
         # This is needed because methods append to the dictionary, which
         # can lead to double entries.
-        roo_pac = root_package if root_package is not None else os.path.join(
-            self._libHome, 'Resources', 'Scripts', 'Dymola')
+        scrDir = os.path.join(self._libHome, 'Resources', 'Scripts', 'Dymola')
+        roo_pac = root_package if root_package is not None else scrDir
+        tasks = []
         for root, _, files in os.walk(roo_pac):
             for mosFil in files:
                 # Exclude the conversion scripts and also backup copies
@@ -952,169 +1503,27 @@ class Tester(object):
                 if mosFil.endswith('.mos') and (
                     not mosFil.startswith(
                         "Convert" + self.getLibraryName())):
-                    matFil = ""
-                    dat = {
-                        'ScriptFile': os.path.join(root[len(os.path.join(self._libHome, 'Resources', 'Scripts', 'Dymola')) + 1:],
-                                                   mosFil),
-                        'mustSimulate': False,
-                        'mustExportFMU': False}
+                    scrFil = os.path.join(root[len(scrDir) + 1:], mosFil)
                     # ScriptFile is something like Controls/Continuous/Examples/LimPIDWithReset.mos
                     # JModelica CI testing needs files below 140 characters, which includes Buildings.
                     # Hence, write warning if a file is equal or longer than 140-9=131 characters.
-                    if len(dat['ScriptFile']) >= 131:
+                    if len(scrFil) >= 131:
                         self._reporter.writeError(
                             """File {} is too long. Reduce it to maximum of 130 characters.""".format(
-                                dat['ScriptFile'], len(
-                                    dat['ScriptFile'])))
-                    # _check_reference_result_file_name(dat['ScriptFile'])
-                    # open the mos file and read its content.
-                    # Path and name of mos file without 'Resources/Scripts/Dymola'
-                    with open(os.path.join(root, mosFil), mode="r", encoding="utf-8-sig") as fMOS:
-                        Lines = fMOS.readlines()
-
-                    # Remove white spaces
-                    for i in range(len(Lines)):
-                        Lines[i] = Lines[i].replace(' ', '')
-
-                    # Set some attributes in the Data object
+                                scrFil, len(scrFil)))
                     if self._includeFile(os.path.join(root, mosFil)):
-                        for lin in Lines:
-                            # Add the model name to the dictionary.
-                            # This is needed to export the model as an FMU.
-                            # Also, set the flag mustSimulate to True.
-                            simCom = re.search(r'simulateModel\(\s*".*"', lin)
-                            if simCom is not None:
-                                modNam = re.sub(r'simulateModel\(\s*"', '', simCom.string)
-                                modNam = modNam[0:modNam.index('"')]
-                                dat['mustSimulate'] = True
-                                dat['model_name'] = modNam
-                                dat['TranslationLogFile'] = modNam + ".translation.log"
-                            # parse startTime and stopTime, if any
-                            if dat['mustSimulate']:
-                                for attr in ["startTime", "stopTime"]:
-                                    _get_attribute_value(lin, attr, dat)
-
-                            # Check if this model need to be translated as an FMU.
-                            if (self._include_fmu_test and "translateModelFMU" in lin):
-                                dat['mustExportFMU'] = True
-                            if dat['mustExportFMU']:
-                                for attr in ["modelToOpen", "modelName"]:
-                                    _get_attribute_value(lin, attr, dat)
-                                    # Dymola uses in translateModelFMU the syntax
-                                    # modelName=... but our dictionary uses model_name
-                                    if attr == "modelName" and "modelName" in dat:
-                                        dat["model_name"] = dat["modelName"]
-                                        del dat["modelName"]
-                                # The .mos script allows modelName="", hence
-                                # we set the model name to be the entry of modelToOpen
-                                if "model_name" in dat and dat["model_name"] == "":
-                                    if "modelToOpen" in dat:
-                                        dat["model_name"] = dat["modelToOpen"]
-
-                        # Get tolerance from mo file. This is used to set the tolerance
-                        # for OPTIMICA and JModelica.
-                        # Only get the tolerance for the models that need to be simulated,
-                        # because those that are only exported as FMU don't need this setting.
-                        if dat['mustSimulate']:
-                            try:
-                                dat['tolerance'] = self.get_tolerance(
-                                    self._libHome, dat['model_name'])
-                            except Exception as e:
-                                self._reporter.writeError(str(e))
-                                dat['tolerance'] = None
-
-                        # We are finished iterating over all lines of the .mos
-
-                        # For FMU export, if model_name="", then Dymola uses the
-                        # Modelica class name, with "." replaced by "_".
-                        # If the Modelica class name consists of "_", then they
-                        # are replaced by "_0".
-                        # Hence, we update dat['model_name'] if needed.
-                        if dat['mustExportFMU']:
-                            # Strip quotes from model_name and modelToOpen
-                            dat['FMUName'] = dat['model_name'].strip('"')
-                            dat['modelToOpen'] = dat['modelToOpen'].strip('"')
-
-                            # Update the name of the FMU if model_name is "" in .mos file.
-                            if len(dat["FMUName"]) == 0:
-                                dat['FMUName'] = dat['modelToOpen']
-                            # Update the FMU name, for example to change
-                            # Buildings.Fluid.FMI.Examples.FMUs.IdealSource_m_flow to
-                            # Buildings_Fluid_FMI_Examples_FMUs_IdealSource_0m_0flow
-                            dat['FMUName'] = dat['FMUName'].replace("_", "_0").replace(".", "_")
-                            dat['FMUName'] = dat['FMUName'] + ".fmu"
-
-                        # Plot variables are only used for those models that need to be simulated.
-                        # For JModelica, if dat['jmodelica']['simulate'] == False:
-                        #   dat['ResultVariables'] is reset to [] in _add_experiment_specifications
-                        if dat['mustSimulate']:
-                            plotVars = []
-                            iLin = 0
-                            for lin in Lines:
-                                iLin = iLin + 1
-                                try:
-                                    y = self.get_plot_variables(lin)
-                                    if y is not None:
-                                        plotVars.append(y)
-                                except (AttributeError, ValueError) as e:
-                                    s = "%s, line %s, could not be parsed.\n" % (mosFil, iLin)
-                                    s += "The problem occurred at the line below:\n"
-                                    s += "%s\n" % lin
-                                    s += "Make sure that each assignment of the plot command is on one line.\n"
-                                    self._reporter.writeError(s)
-                                    # Store the error, but keep going to check other lines and files
-                                    pass
-
-                            if len(plotVars) == 0:
-                                s = "%s does not contain any plot command.\n" % mosFil
-                                s += "You need to add a plot command to include its\n"
-                                s += "results in the regression tests.\n"
-                                self._reporter.writeError(s)
-
-                            # Store grouped plot variables without duplicates.
-                            # (Duplicates happen when the same y variables are plotted against
-                            # different x variables.)
-                            dat['ResultVariables'] = []
-                            for v_i in plotVars:
-                                if v_i not in dat['ResultVariables']:
-                                    dat['ResultVariables'].append(v_i)
-
-                            # search for the result file
-                            for lin in Lines:
-                                if 'resultFile=\"' in lin:
-                                    matFil = re.search(
-                                        '(?<=resultFile=\")[a-zA-Z0-9_\.]+', lin).group()
-                                    # Add the .mat extension as this is not included in the
-                                    # resultFile entry.
-                                    matFil = matFil + '.mat'
-                                    break
-
-                            if self._modelica_tool == 'optimica' or self._modelica_tool == 'jmodelica':
-                                matFil = '{}_result.mat'.format(
-                                    re.sub(r'\.', '_', dat['model_name']))
-
-                            # Some *.mos file only contain plot commands, but no simulation.
-                            # Hence, if 'resultFile=' could not be found, try to get the file that
-                            # is used for plotting.
-                            # cf. BUG
-                            if len(matFil) == 0:
-                                for lin in Lines:
-                                    if 'filename=\"' in lin:
-                                        # Note that the filename entry already has the .mat
-                                        # extension.
-                                        matFil = re.search(
-                                            '(?<=filename=\")[a-zA-Z0-9_\.]+', lin).group()
-                                        break
-                            if len(matFil) == 0:
-                                raise ValueError('Did not find *.mat file in ' + mosFil)
-
-                            dat['ResultFile'] = matFil
-
-                    # Some files like plotFan.mos has neither a simulateModel
-                    # nor a translateModelFMU command.
-                    # These there must not be added to the data array.
-                    if dat['mustSimulate'] or dat['mustExportFMU']:
-                        self._data.append(dat)
+                        tasks.append((self._libHome, root, mosFil,
+                                      self._modelica_tool, self._include_fmu_test))
+
+        for res in self._get_test_data(tasks):
+            self._reporter.writeRecords(res['records'])
+            if res['error'] is not None:
+                raise ValueError(res['error'])
+            # Some files like plotFan.mos has neither a simulateModel
+            # nor a translateModelFMU command.
+            # These there must not be added to the data array.
+            if res['data'] is not None:
+                self._data.append(res['data'])
 
         # Make sure we found at least one unit test.
         if self.get_number_of_tests() == old_len:
@@ -1131,6 +1540,43 @@ class Tester(object):
 
         return
 
+    def _get_test_data(self, tasks):
+        """ Return the data of the regression tests of the ``.mos`` scripts.
+
+        :param tasks: A list with the arguments of :func:`_get_test_data` for each script.
+        :return: A list with the return values of :func:`_get_test_data`, in the order of ``tasks``.
+
+        The data of the scripts that did not change are taken from the discovery cache,
+        and the other scripts are parsed in parallel if there are many of them.
+        """
+        cache = self._discovery_cache
+        # The data depend on the tool and on whether FMU export is tested.
+        keys = ["{}|{}|{}".format(tool, fmu, os.path.abspath(os.path.join(root, mosFil)))
+                for (_, root, mosFil, tool, fmu) in tasks]
+        results = [None if cache is None else cache.get(key) for key in keys]
+        todo = [i for i in range(len(tasks)) if results[i] is None]
+
+        nPro = min(self._nPro, len(todo) // _MIN_SCRIPTS_PER_PROCESS)
+        if nPro > 1:
+            pool = multiprocessing.Pool(nPro)
+            try:
+                parsed = pool.map(_get_test_data, [tasks[i] for i in todo],
+                                  chunksize=max(1, len(todo) // (4 * nPro)))
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            parsed = [_get_test_data(tasks[i]) for i in todo]
+
+        for (i, res) in zip(todo, parsed):
+            results[i] = res
+            # Scripts that cannot be parsed are parsed again, so that the error is reported.
+            if cache is not None and res['error'] is None:
+                cache.set(keys[i], res['files'], res)
+        if cache is not None:
+            cache.save()
+        return results
+
     def _add_experiment_specifications(self):
         """ Add the experiment specification to the data structure.
 
@@ -1271,7 +1717,7 @@ class Tester(object):
             fulFilNam = os.path.join(data['ResultDirectory'], data['ResultFile'])
         ret = []
         try:
-            r = Reader(fulFilNam, self._modelica_tool)
+            r = Reader(fulFilNam, self._modelica_tool, lazy=True, cache=self._result_cache)
         except IOError as e:
             errors.append("Failed to read %s generated by %s.\n%s\n" %
                           (fulFilNam, data['ScriptFile'], e))
@@ -1281,18 +1727,30 @@ class Tester(object):
                           (fulFilNam, data['ScriptFile'], e))
             return ret
 
+        def getVarMat(var):
+            # Matrix variables in OPTIMICA and JModelica are stored in mat file with
+            # no space e.g. [1,1].
+            if self._modelica_tool == 'optimica' or self._modelica_tool == 'jmodelica':
+                return re.sub(' ', '', var)
+            return var
+
+        # Extract the data series of all variables at once, as this reads
+        # each data block of the result file only once.
+        allNames = set(r.varNames())
+        varNames = set([getVarMat(var) for pai in data['ResultVariables'] for var in pai])
+        series = dict()
+        for (time, names, values) in r.values_many(
+                [var for var in varNames if var in allNames]):
+            for iVar, var_mat in enumerate(names):
+                series[var_mat] = (time, values[iVar])
+
         for pai in data['ResultVariables']:  # pairs of variables that are plotted together
             dat = dict()
             for var in pai:
                 time = []
                 val = []
                 try:
-                    var_mat = var
-                    # Matrix variables in OPTIMICA and JModelica are stored in mat file with
-                    # no space e.g. [1,1].
-                    if self._modelica_tool == 'optimica' or self._modelica_tool == 'jmodelica':
-                        var_mat = re.sub(' ', '', var_mat)
-                    (time, val) = r.values(var_mat)
+                    (time, val) = series[getVarMat(var)]
                     # Make time grid to which simulation results
                     # will be interpolated.
                     # This reduces the data that need to be stored.
@@ -1353,29 +1811,18 @@ class Tester(object):
                                  self.getLibraryName(), data['TranslationLogFile'])
         return of.get_model_statistics(fulFilNam, self._modelica_tool)
 
-    def legacy_comp(self, tOld, yOld, tNew, yNew, tGriOld, tGriNew, varNam, filNam, tol):
-        # Interpolate the new variables to the old time stamps
-        #
+    def _interpolate_legacy(self, tGriOld, tGriNew, yNew):
+        """ Return the new results of a variable interpolated to the old time stamps.
+        """
         if len(yNew) > 2:
-            try:
-                yInt = Plotter.interpolate(tGriOld, tGriNew, yNew)
-            except (IndexError, ValueError):
-                em = (
-                    "Data series have different length:\n"
-                    "File=%s\n"
-                    "variable=%s\n"
-                    "len(tGriOld) = %d\n"
-                    "len(tGriNew) = %d\n"
-                    "len(yNew)    = %d\n") % (filNam,
-                                              varNam,
-                                              len(tGriOld),
-                                              len(tGriNew),
-                                              len(yNew))
-                self._reporter.writeError(em)
-                raise ValueError(em)
+            return Plotter.interpolate(tGriOld, tGriNew, yNew)
         else:
-            yInt = [yNew[0], yNew[0]]
+            return [yNew[0], yNew[0]]
 
+    def _align_legacy(self, tOld, yOld, yInt, varNam, filNam):
+        """ Return the old results and the interpolated new results of a variable,
+        with the same number of values.
+        """
         # If the variable is heatPort.T or heatPort.Q_flow, with length=2, then
         # it has been evaluated as a parameter in the Buildings library. In the Annex60
         # library, this may be a variable as the Buildings library uses a more efficient
@@ -1407,36 +1854,108 @@ class Tester(object):
                     "len(yInt)=%d\n"
                     "Stop processing.\n") % (filNam, varNam, len(yOld), len(yInt))
                 )
+        return (yOld, yInt)
+
+    def _get_legacy_errors(self, t_ref, y_ref, y_sim):
+        """ Return a dictionary with the errors of the legacy comparison of the variables of a test.
+
+        :param t_ref: The time of the reference results.
+        :param y_ref: A dictionary with the reference results.
+        :param y_sim: A list where each element is a dictionary of variable names and simulation
+                       results that are to be plotted together.
+
+        The values of the dictionary are tuples with the old results, the interpolated
+        new results, and the absolute, relative and total errors.
+        The variables that have the same number of values are compared in one call of
+        :func:`_compute_legacy_errors`.
+        The time grids are the same as in :meth:`areResultsEqual`.
+        Variables that cannot be compared are not in the returned dictionary.
+        Their errors are computed by :meth:`legacy_comp`, which also reports the
+        reason why they cannot be compared.
+        """
+        def getTimeGrid(t, nPoi):
+            if len(t) == 2:
+                return self._getTimeGrid(t[0], t[-1], nPoi)
+            elif len(t) == nPoi:
+                return t
+            raise ValueError("Wrong number of time stamps.")
 
-        errAbs = np.zeros(len(yInt))
-        errRel = np.zeros(len(yInt))
-        errFun = np.zeros(len(yInt))
-
-        for i in range(len(yInt)):
-            errAbs[i] = abs(yOld[i] - yInt[i])
-            if np.isnan(errAbs[i]):
-                raise ValueError('NaN in errAbs ' + varNam + " " + str(yOld[i]) +
-                                 "  " + str(yInt[i]) + " i, N " + str(i) + " --:" + str(yInt[i - 1]) +
-                                 " ++:", str(yInt[i + 1]))
-            if (abs(yOld[i]) > 10 * tol):
-                errRel[i] = errAbs[i] / abs(yOld[i])
-            else:
-                errRel[i] = 0
-            errFun[i] = errAbs[i] + errRel[i]
+        groups = dict()
+        for pai in y_sim:
+            for varNam in pai.keys():
+                if varNam == 'time' or varNam not in y_ref:
+                    continue
+                yOld = y_ref[varNam]
+                yNew = pai[varNam]
+                if self._isParameter(yNew):
+                    tNew = [min(pai['time']), max(pai['time'])]
+                else:
+                    tNew = pai['time']
+                if len(yNew) < len(yOld) and len(yNew) > 2:
+                    continue
+                try:
+                    if len(yNew) > 2:
+                        tGriOld = getTimeGrid(t_ref, len(yNew))
+                        tGriNew = getTimeGrid(tNew, min(len(yNew), self._nPoi))
+                    else:
+                        tGriOld = t_ref
+                        tGriNew = tNew
+                    yInt = self._interpolate_legacy(tGriOld, tGriNew, yNew)
+                    (yOld, yInt) = self._align_legacy(t_ref, yOld, yInt, varNam, '')
+                except (IndexError, ValueError):
+                    continue
+                groups.setdefault(len(yOld), dict())[varNam] = (yOld, yInt)
+
+        errors = dict()
+        for variables in groups.values():
+            names = list(variables.keys())
+            yOld = np.array([variables[n][0] for n in names], dtype=float)
+            yInt = np.array([variables[n][1] for n in names], dtype=float)
+            err = _compute_legacy_errors(yOld, yInt, self._tol['ay'])
+            for (i, n) in enumerate(names):
+                errors[n] = (yOld[i], yInt[i], err[0][i], err[1][i], err[2][i])
+        return errors
+
+    def legacy_comp(self, tOld, yOld, tNew, yNew, tGriOld, tGriNew, varNam, filNam, tol):
+        # Use the errors of the comparison of all variables of the test, if available.
+        try:
+            (yOld, yInt, errAbs, errRel, errFun) = self._legacy_errors.pop(varNam)
+        except KeyError:
+            # Interpolate the new variables to the old time stamps
+            try:
+                yInt = self._interpolate_legacy(tGriOld, tGriNew, yNew)
+            except (IndexError, ValueError):
+                em = (
+                    "Data series have different length:\n"
+                    "File=%s\n"
+                    "variable=%s\n"
+                    "len(tGriOld) = %d\n"
+                    "len(tGriNew) = %d\n"
+                    "len(yNew)    = %d\n") % (filNam,
+                                              varNam,
+                                              len(tGriOld),
+                                              len(tGriNew),
+                                              len(yNew))
+                self._reporter.writeError(em)
+                raise ValueError(em)
+            (yOld, yInt) = self._align_legacy(tOld, yOld, yInt, varNam, filNam)
+            (errAbs, errRel, errFun) = _compute_legacy_errors(
+                np.asarray(yOld, dtype=float), np.asarray(yInt, dtype=float), tol)
+
+        if np.isnan(errAbs).any():
+            i = int(np.argmax(np.isnan(errAbs)))
+            raise ValueError('NaN in errAbs ' + varNam + " " + str(yOld[i]) +
+                             "  " + str(yInt[i]) + " i, N " + str(i) + " --:" + str(yInt[i - 1]) +
+                             " ++:" + str(yInt[min(i + 1, len(yInt) - 1)]))
 
         t_err_max, warning = 0, None
 
-        if max(errFun) > tol:
-            iMax = 0
-            eMax = 0
-            for i in range(len(errFun)):
-                if errFun[i] > eMax:
-                    eMax = errFun[i]
-                    iMax = i
+        if np.max(errFun) > tol:
+            iMax = int(np.argmax(errFun))
             tGri = self._getTimeGrid(tOld[0], tOld[-1], self._nPoi)
             t_err_max = tGri[iMax]
             warning = filNam + ": " + varNam + " has absolute and relative error = " + \
-                ("%0.3e" % max(errAbs)) + ", " + ("%0.3e" % max(errRel)) + ".\n"
+                ("%0.3e" % np.max(errAbs)) + ", " + ("%0.3e" % np.max(errRel)) + ".\n"
             if self._isParameter(yInt):
                 warning += "             %s is a parameter.\n" % varNam
             else:
@@ -1457,11 +1976,49 @@ class Tester(object):
             data_idx,
             keep_dir=True):
         t_err_max, warning = 0, None
+        target_path = None
+
+        # Use the errors of the comparison of all variables of the test, if available.
+        err = self._funnel_errors.pop(varNam, None)
+        try:
+            if err is None or len(err) != len(yNew):
+                err = funnel.get_errors(tOld, yOld, tNew, yNew, tol)
+        except ValueError as e:
+            warning = "While processing file {} for variable {}: {}\n".format(
+                filNam, varNam, e)
+            test_passed = False
+        else:
+            idx_err_max = np.argmax(err)
+            err_max = err[idx_err_max]  # difference between y test value and funnel bounds
+            t_err_max = float(tNew[idx_err_max])
+            test_passed = (err_max == 0)
+            if err_max > 0:
+                warning = (
+                    "{}: {} exceeds funnel tolerance with absolute error = {:.3e}. "
+                ).format(filNam, varNam, err_max)
+                if self._isParameter(yOld):
+                    warning += "{} is a parameter.\n".format(varNam)
+                else:
+                    warning += "Maximum error is at t = {}\n".format(t_err_max)
+            # Only write the files for the plots of the report if they are needed.
+            if keep_dir and (not test_passed or self._write_all_funnel_files):
+                target_path = os.path.join(self._comp_dir, '{}_{}'.format(filNam, varNam))
+                self._write_funnel_files(tOld, yOld, tNew, yNew, tol, target_path)
 
+        self._init_comp_info(model_name, filNam)
+        self._update_comp_info(
+            model_name, varNam, target_path, test_passed, t_err_max, warning, data_idx)
+
+        return (t_err_max, warning)
+
+    def _write_funnel_files(self, tOld, yOld, tNew, yNew, tol, target_path):
+        """ Write the reference and test data, the funnel bounds and the errors
+        to the directory ``target_path``, as used by :meth:`funnel_plot` and :meth:`report`.
+        """
         tmp_dir = tempfile.mkdtemp()
         log_stdout = io.StringIO()
         with _stdout_redirector(log_stdout):
-            exitcode = pyfunnel.compareAndReport(
+            pyfunnel.compareAndReport(
                 xReference=tOld,
                 yReference=yOld,
                 xTest=tNew,
@@ -1472,75 +2029,83 @@ class Tester(object):
                 rtolx=tol['rx'],
                 rtoly=tol['ry'],
             )
-        log_content = log_stdout.getvalue()
-        log_content = re.sub(r'(^.*Warning:\s+)|(Error:\s+)', '', log_content)
         log_stdout.close()
+        shutil.move(tmp_dir, target_path)
+
+    def _get_funnel_errors(self, t_ref, y_ref, y_sim):
+        """ Return a dictionary with the funnel errors of the variables of a test.
+
+        :param t_ref: The time of the reference results.
+        :param y_ref: A dictionary with the reference results.
+        :param y_sim: A list where each element is a dictionary of variable names and simulation
+                       results that are to be plotted together.
+
+        The variables that have the same time grids are compared in one call of
+        :func:`buildingspy.development.funnel.get_errors`.
+        The time grids are the same as in :meth:`areResultsEqual`.
+        Variables that cannot be compared are not in the returned dictionary.
+        Their errors are computed by :meth:`funnel_comp`, which also reports the
+        reason why they cannot be compared.
+        """
+        def getTimeGrid(t, y):
+            if len(y) > 2 and len(t) == 2:
+                return self._getTimeGrid(t[0], t[-1], len(y))
+            return t
 
-        if exitcode != 0:
-            warning = "While processing file {} for variable {}: {}".format(
-                filNam, varNam, log_content)
-            test_passed = False
-            funnel_success = False
-        else:
-            err_path = os.path.join(tmp_dir, 'errors.csv')
-            err_arr = np.genfromtxt(err_path, delimiter=',', skip_header=1).transpose()
-            err_max = np.max(err_arr[1])  # difference between y test value and funnel bounds
-            idx_err_max = np.where(err_arr[1] == err_max)[0][0]
-            t_err_max = err_arr[0][idx_err_max]
-            test_passed = (err_max == 0)
-            if err_max > 0:
-                warning = (
-                    "{}: {} exceeds funnel tolerance with absolute error = {:.3e}. "
-                ).format(filNam, varNam, err_max)
-                if self._isParameter(yOld):
-                    warning += "{} is a parameter.\n".format(varNam)
+        groups = dict()
+        for pai in y_sim:
+            for varNam in pai.keys():
+                if varNam == 'time' or varNam not in y_ref:
+                    continue
+                yOld = y_ref[varNam]
+                yNew = pai[varNam]
+                if self._isParameter(yNew):
+                    tNew = [min(pai['time']), max(pai['time'])]
                 else:
-                    warning += "Maximum error is at t = {}\n".format(t_err_max)
-            funnel_success = True
-
-        if keep_dir and funnel_success:
-            target_path = os.path.join(self._comp_dir, '{}_{}'.format(filNam, varNam))
-            shutil.move(tmp_dir, target_path)
-        else:
-            target_path = None
-            shutil.rmtree(tmp_dir)
-
-        idx = self._init_comp_info(model_name, filNam)
-        self._update_comp_info(idx, varNam, target_path, test_passed, t_err_max, warning, data_idx)
-
-        return (t_err_max, warning)
+                    tNew = pai['time']
+                if len(yNew) < len(yOld) and len(yNew) > 2:
+                    continue
+                tOld = getTimeGrid(t_ref, yOld)
+                tNew = getTimeGrid(tNew, yNew)
+                if len(tOld) != len(yOld) or len(tNew) != len(yNew):
+                    continue
+                key = (np.asarray(tOld, dtype=float).tobytes(),
+                       np.asarray(tNew, dtype=float).tobytes())
+                if key not in groups:
+                    groups[key] = (tOld, tNew, dict())
+                groups[key][2][varNam] = (yOld, yNew)
+
+        errors = dict()
+        for (tOld, tNew, variables) in groups.values():
+            names = list(variables.keys())
+            try:
+                err = funnel.get_errors(tOld, [variables[n][0] for n in names],
+                                        tNew, [variables[n][1] for n in names], self._tol)
+            except ValueError:
+                continue
+            errors.update(zip(names, err))
+        return errors
 
     def _init_comp_info(self, model_name, file_name):
-        """Update self._comp_info with dict to store comparison results for model_name.
+        """Update self._comp_info to store comparison results for model_name."""
+        self._comp_info.add_model(model_name, file_name)
 
-        Returns: index of dict storing results for model_name.
+    def _get_variable_groups(self, data_idx):
+        """ Return a dictionary with the variable names of ``self._data[data_idx]`` as keys,
+        and the indices of the groups of ``ResultVariables`` that contain the variable as values.
         """
-        try:
-            idx = next(i for i, el in enumerate(self._comp_info) if el['model'] == model_name)
-        except StopIteration:  # no model_name found in self._comp_info (case dymola): create
-            self._comp_info.append({
-                "model": model_name,
-            })
-            idx = len(self._comp_info) - 1
-        try:
-            self._comp_info[idx]["comparison"]
-        except KeyError:  # no comparison data stored for model_name: create
-            self._comp_info[idx]["comparison"] = {
-                "variables": [],
-                "funnel_dirs": [],
-                "test_passed": [],
-                "file_name": file_name,
-                "success_rate": 0,
-                "var_groups": [],  # index of the group of variables belonging to the same subplot
-                "warnings": [],
-                "t_err_max": [],
-            }
-
-        return idx
+        if data_idx not in self._var_groups:
+            groups = defaultdict(list)
+            for iv, vl in enumerate(self._data[data_idx]["ResultVariables"]):
+                for var in vl:
+                    if len(groups[var]) == 0 or groups[var][-1] != iv:
+                        groups[var].append(iv)
+            self._var_groups[data_idx] = dict(groups)
+        return self._var_groups[data_idx]
 
     def _update_comp_info(
             self,
-            idx,
+            model_name,
             var_name,
             funnel_dir,
             test_passed,
@@ -1550,34 +2115,25 @@ class Tester(object):
             var_group=None):
         """Store comparison info for var_name in self._comp_info."""
 
-        # NOTE: data_idx can differ from idx if simulation failed or variable not available.
+        # NOTE: data_idx can differ from the model if simulation failed or variable not available.
 
         should_update = True
 
         if var_group is None:
             try:
-                var_group = next(
-                    iv for iv, vl in enumerate(
-                        self._data[data_idx]["ResultVariables"]) if var_name in vl)
-            except StopIteration:
+                var_group = self._get_variable_groups(data_idx)[var_name][0]
+            except KeyError:
                 if warning == 'skip':
                     should_update = False
                 else:
                     warning = ("Variable {} not found in ResultVariables for model {}. "
                                "However it was found in reference results file.\n").format(
-                        var_name, self._comp_info[idx]['model'])
+                        var_name, model_name)
                     self._reporter.writeWarning(warning)
 
         if should_update:
-            self._comp_info[idx]["comparison"]["variables"].append(var_name)
-            self._comp_info[idx]["comparison"]["funnel_dirs"].append(funnel_dir)
-            self._comp_info[idx]["comparison"]["test_passed"].append(
-                int(test_passed))  # Boolean not JSON serializable
-            self._comp_info[idx]["comparison"]["t_err_max"].append(t_err_max)
-            self._comp_info[idx]["comparison"]["warnings"].append(warning)
-            self._comp_info[idx]["comparison"]["var_groups"].append(var_group)
-            self._comp_info[idx]["comparison"]["success_rate"] = sum(
-                self._comp_info[idx]["comparison"]["test_passed"]) / len(self._comp_info[idx]["comparison"]["variables"])
+            self._comp_info.add_variable(
+                model_name, var_name, funnel_dir, test_passed, t_err_max, warning, var_group)
 
         return None
 
@@ -1684,26 +2240,27 @@ class Tester(object):
                 t_err_max, warning = self.legacy_comp(
                     tOld, yOld, tNew, yNew, tGriOld, tGriNew, varNam, filNam, self._tol['ay'])
         else:
-            idx = self._init_comp_info(model_name, filNam)
-            comp_tmp = self._comp_info[idx]['comparison']
+            self._init_comp_info(model_name, filNam)
             try:
                 # Check if the variable has already been tested. (This might happen if the variable is used in several
                 # subplots of different plots.)
                 # In this case we do not want to perform the comparison again but we still want the variable to be
                 # plotted several times as it was originally intended: update _comp_info
                 # with stored data.
-                var_idx = comp_tmp['variables'].index(varNam)
-                fun_dir = comp_tmp['funnel_dirs'][var_idx]
-                test_passed = comp_tmp['test_passed'][var_idx]
+                comp_var = self._comp_info.get_variable(model_name, varNam)
+                if comp_var is None:
+                    raise ValueError("Variable has not been tested.")
+                fun_dir = comp_var['funnel_dir']
+                test_passed = comp_var['test_passed']
                 # variable group already stored for this variable
-                var_group_str = comp_tmp['var_groups'][var_idx]
+                var_group_str = comp_var['var_group']
                 # Now looking for the new variable group to be stored.
-                var_group = var_group_str + 1 + next(iv for iv, vl in enumerate(
-                    self._data[data_idx]["ResultVariables"][(var_group_str + 1):]) if varNam in vl)
-                warning = comp_tmp['warnings'][var_idx]
-                t_err_max = comp_tmp['t_err_max'][var_idx]
+                var_group = next(iv for iv in self._get_variable_groups(data_idx).get(varNam, [])
+                                 if iv > var_group_str)
+                warning = comp_var['warning']
+                t_err_max = comp_var['t_err_max']
                 self._update_comp_info(
-                    idx,
+                    model_name,
                     varNam,
                     fun_dir,
                     test_passed,
@@ -1714,7 +2271,7 @@ class Tester(object):
             except (ValueError, StopIteration):
                 try:  # In case a warning has been raised before: no comparison performed.
                     self._update_comp_info(
-                        idx, varNam, None, test_passed, t_err_max, warning, data_idx)
+                        model_name, varNam, None, test_passed, t_err_max, warning, data_idx)
                 except NameError:
                     t_err_max, warning = self.funnel_comp(
                         tOld, yOld, tNew, yNew, varNam, filNam, model_name, self._tol, data_idx)
@@ -1749,41 +2306,31 @@ class Tester(object):
         :param y_sim: The data points to be written to the file.
         :param y_tra: The dictionary with the translation log.
 
-        This method writes the results in the form ``key=value``, with one line per entry.
+        If ``refFilNam`` has the extension ``.txt``, this method writes the results in
+        the form ``key=value``, with one line per entry.
+        If it has the extension ``.npz``, the results are written in a binary format.
+        See :func:`buildingspy.io.reference_results.write`.
         """
-        from datetime import date
-        import json
-
-        with open(refFilNam, mode="w", encoding="utf-8") as f:
-            f.write('last-generated=' + str(date.today()) + '\n')
-            for stage in ['initialization', 'simulation', 'fmu-dependencies']:
-                if stage in y_tra:
-                    # f.write('statistics-%s=\n%s\n' % (stage, _pretty_print(y_tra[stage])))
-                    f.write('statistics-%s=\n%s\n' % (stage, json.dumps(y_tra[stage],
-                                                                        indent=2,
-                                                                        separators=(',', ': '),
-                                                                        sort_keys=True)))
-            # FMU exports do not have simulation results.
-            # Hence, we preclude them if y_sim == None
-            if y_sim is not None:
-                # Set, used to avoid that data series that are plotted in two plots are
-                # written twice to the reference data file.
-                s = set()
-                for pai in y_sim:
-                    for k, v in list(pai.items()):
-                        if k not in s:
-                            s.add(k)
-                            f.write(k + '=')
-                            # Use many digits, otherwise truncation errors occur that can be higher
-                            # than the required accuracy.
-                            formatted = [str(self.format_float(e)) for e in v]
-                            f.write(str(formatted).replace("'", ""))
-                            f.write('\n')
+        statistics = dict()
+        for stage in ['initialization', 'simulation', 'fmu-dependencies']:
+            if stage in y_tra:
+                statistics[stage] = y_tra[stage]
+        results = dict()
+        # FMU exports do not have simulation results.
+        # Hence, we preclude them if y_sim == None
+        if y_sim is not None:
+            # Data series that are plotted in two plots are only written once
+            # to the reference data file.
+            for pai in y_sim:
+                for k, v in list(pai.items()):
+                    if k not in results:
+                        results[k] = v
+        reference_results.write(refFilNam, results, statistics=statistics)
 
     def _readReferenceResults(self, refFilNam):
         """ Read the reference results.
 
-        :param refFilNam: The name of the reference file.
+        :param refFilNam: The name of the reference file, with extension ``.txt`` or ``.npz``.
         :return: A dictionary with the reference results.
 
         If the simulation statistics was found in the reference results,
@@ -1792,53 +2339,17 @@ class Tester(object):
         where the value is a dictionary. Otherwise, this key is not present.
 
         """
-        import numpy
-        import ast
+        try:
+            ref = reference_results.read(refFilNam)
+        except ValueError as detail:
+            s = "%s could not be parsed.\n" % refFilNam
+            self._reporter.writeError(s)
+            raise TypeError(detail)
 
         d = dict()
-        with open(refFilNam, mode="r", encoding="utf-8-sig") as f:
-            lines = f.readlines()
-
-        # Compute the number of the first line that contains the results
-        iSta = 0
-        for iLin in range(min(2, len(lines))):
-            if "svn-id" in lines[iLin]:
-                iSta = iSta + 1
-            if "last-generated" in lines[iLin]:
-                iSta = iSta + 1
-
-        r = dict()
-        iLin = iSta
-        while iLin < len(lines):
-            lin = lines[iLin].strip('\n')
-            try:
-                (key, value) = lin.split("=")
-                # Check if this is a statistics-* entry.
-                if key.startswith("statistics-"):
-                    # Call ast.literal_eval as value is a string that needs to be
-                    # converted to a dictionary.
-
-                    # The json string was pretty printed over several lines.
-                    # Add to value the next line, unless it contains "-" or it does not exist.
-                    value = value.strip()
-                    while (iLin < len(lines) - 1 and lines[iLin + 1].find('=') == -1):
-                        value = value + lines[iLin + 1].strip('\n').strip()
-                        iLin += 1
-                    d[key] = ast.literal_eval(value)
-                else:
-                    s = (value[value.find('[') + 1: value.rfind(']')]).strip()
-                    numAsStr = s.split(',')
-                    val = []
-                    for num in numAsStr:
-                        # We need to use numpy.float64 here for the comparison to work
-                        val.append(numpy.float64(num))
-                    r[key] = val
-            except ValueError as detail:
-                s = "%s could not be parsed.\n" % refFilNam
-                self._reporter.writeError(s)
-                raise TypeError(detail)
-            iLin += 1
-        d['results'] = r
+        for (stage, value) in ref['statistics'].items():
+            d['statistics-' + stage] = value
+        d['results'] = ref['results']
 
         return d
 
@@ -1915,32 +2426,29 @@ class Tester(object):
                 r = True
         return r
 
-    def _compareResults(self, data_idx, oldRefFulFilNam, y_sim, y_tra, refFilNam, ans):
-        """ Compares the new and the old results.
+    def _compare_results(self, data_idx, oldRefFulFilNam, y_sim, y_tra):
+        """ Compares the new and the old results, without asking the user.
 
-            :param matFilNam: Matlab file name.
-            :param oldRefFilFilNam: File name including path of old reference files.
+            :param data_idx: Index of the regression test in ``self._data``.
+            :param oldRefFulFilNam: File name including path of old reference files.
             :param y_sim: A list where each element is a dictionary of variable names and simulation
                            results that are to be plotted together.
             :param y_tra: A dictionary with the translation statistics.
-            :param refFilNam: Name of the file with reference results (used for reporting only).
-            :param ans: A previously entered answer, either ``y``, ``Y``, ``n`` or ``N``.
-            :param model_name: Model name, used for reporting.
-            :return: A triple ``(updateReferenceData, foundError, ans)`` where ``updateReferenceData``
-                     and ``foundError`` are booleans, and ``ans`` is ``y``, ``Y``, ``n`` or ``N``.
-
+            :return: A dictionary with the keys ``foundError`` and ``newStatistics``, which are
+                     booleans, ``t_ref`` and ``y_ref``, which are the old results,
+                     ``timOfMaxErr``, which is a dictionary with the time of the maximum error
+                     of the variables that differ, and ``noOldResults``, which is a list with
+                     the variables that are not in the old results.
+                     If the old reference data have no results, only ``y_ref`` is set,
+                     to an empty dictionary.
+
+            This method only writes to ``self._reporter`` and ``self._comp_info``.
+            Hence, it can be run in parallel for different tests,
+            see :meth:`_get_reference_check`.
         """
         matFilNam = self._data[data_idx]['ResultFile']
         model_name = self._data[data_idx]['model_name']
 
-        # Reset answer, unless it is set to Y or N
-        if not (ans == "Y" or ans == "N"):
-            ans = "-"
-        updateReferenceData = False
-        # If previously the user chose to update all refererence data, then
-        # we set updateReferenceData = True
-        if ans == "Y":
-            updateReferenceData = True
         foundError = False
         verifiedTime = False
 
@@ -1950,7 +2458,7 @@ class Tester(object):
         y_ref = old_results['results']
 
         if len(y_ref) == 0:
-            return self._askNoReferenceResultsFound(y_sim, refFilNam, ans)
+            return {'y_ref': y_ref}
 
         # The old data contains results
         t_ref = y_ref.get('time')
@@ -1963,11 +2471,19 @@ class Tester(object):
         list_var_sim = [el for gr in y_sim for el in gr.keys() if not re.search('time', el, re.I)]
         for var in list_var_ref:  # reference variables not available in simulation results
             if var not in list_var_sim:
-                idx = self._init_comp_info(model_name, matFilNam)
+                self._init_comp_info(model_name, matFilNam)
                 # We skip warning considering it is only the case for x variables against which y variables
                 # are plotted.
-                self._update_comp_info(idx, var, None, False, 0, 'skip', data_idx)
+                self._update_comp_info(model_name, var, None, False, 0, 'skip', data_idx)
 
+        if self._comp_tool == 'funnel':
+            # Compare all variables at once. The errors are used by funnel_comp.
+            self._funnel_errors = self._get_funnel_errors(t_ref, y_ref, y_sim)
+        else:
+            # Likewise for legacy_comp.
+            self._legacy_errors = self._get_legacy_errors(t_ref, y_ref, y_sim)
+
+        refFilNam = os.path.basename(oldRefFulFilNam)
         for pai in y_sim:
             t_sim = pai['time']
             if not verifiedTime:
@@ -2003,6 +2519,9 @@ class Tester(object):
                         foundError = True
                         noOldResults.append(varNam)
 
+        self._funnel_errors = dict()
+        self._legacy_errors = dict()
+
         # Compare the simulation statistics
         # There are these cases:
         # 1. The old reference results have no statistics, in which case new results may be written.
@@ -2016,18 +2535,62 @@ class Tester(object):
                 newStatistics = self._check_statistics(
                     old_results, y_tra, stage, foundError, newStatistics, matFilNam)
 
+        return {'foundError': foundError,
+                'newStatistics': newStatistics,
+                't_ref': t_ref,
+                'y_ref': y_ref,
+                'timOfMaxErr': timOfMaxErr,
+                'noOldResults': noOldResults}
+
+    def _compareResults(self, data_idx, oldRefFulFilNam, y_sim, y_tra, refFilNam, ans,
+                        comparison=None):
+        """ Compares the new and the old results.
+
+            :param data_idx: Index of the regression test in ``self._data``.
+            :param oldRefFilFilNam: File name including path of old reference files.
+            :param y_sim: A list where each element is a dictionary of variable names and simulation
+                           results that are to be plotted together.
+            :param y_tra: A dictionary with the translation statistics.
+            :param refFilNam: Name of the file with reference results (used for reporting only).
+            :param ans: A previously entered answer, either ``y``, ``Y``, ``n`` or ``N``.
+            :param comparison: The return value of :meth:`_compare_results`, or ``None``
+                               to compare the results.
+            :return: A triple ``(updateReferenceData, foundError, ans)`` where ``updateReferenceData``
+                     and ``foundError`` are booleans, and ``ans`` is ``y``, ``Y``, ``n`` or ``N``.
+
+        """
+        matFilNam = self._data[data_idx]['ResultFile']
+        model_name = self._data[data_idx]['model_name']
+
+        # Reset answer, unless it is set to Y or N
+        if not (ans == "Y" or ans == "N"):
+            ans = "-"
+        updateReferenceData = False
+        # If previously the user chose to update all refererence data, then
+        # we set updateReferenceData = True
+        if ans == "Y":
+            updateReferenceData = True
+
+        if comparison is None:
+            comparison = self._compare_results(data_idx, oldRefFulFilNam, y_sim, y_tra)
+
+        if 'foundError' not in comparison:
+            return self._askNoReferenceResultsFound(y_sim, refFilNam, ans)
+
+        foundError = comparison['foundError']
         # If the users selected "Y" or "N" (to not accept or reject any new results) in previous tests,
         # or if the script is run in batch mode, then don't plot the results.
         # If we found an error, plot the results, and ask the user to accept or
         # reject the new values.
-        if (foundError or newStatistics) and (not self._batch) and (
+        if (foundError or comparison['newStatistics']) and (not self._batch) and (
                 not ans == "N") and (not ans == "Y"):
             print("             For {},".format(refFilNam))
             print("             accept new file and update reference files?")
 
             if self._comp_tool == 'legacy':
                 print("(Close plot window to continue.)")
-                self.legacy_plot(y_sim, t_ref, y_ref, noOldResults, timOfMaxErr, matFilNam)
+                self.legacy_plot(y_sim, comparison['t_ref'], comparison['y_ref'],
+                                 comparison['noOldResults'], comparison['timOfMaxErr'], matFilNam)
             else:
                 self.funnel_plot(model_name)
 
@@ -2041,8 +2604,7 @@ class Tester(object):
         return (updateReferenceData, foundError, ans)
 
     def funnel_plot(self, model_name, browser=None):
-        idx = next(i for i, el in enumerate(self._comp_info) if el['model'] == model_name)
-        comp_data = self._comp_info[idx]['comparison']
+        comp_data = self._comp_info.get_comparison(model_name)
         dict_var_info = defaultdict(list)
         list_files = []
         for iv, v in enumerate(comp_data['variables']):
@@ -2253,10 +2815,9 @@ class Tester(object):
             # Name of the reference file, which is the same as that matlab file name but with another extension.
             # Only check data for FMU exort.
             if self._includeFile(data['ScriptFile']) and data['mustExportFMU']:
-                # Convert 'aa/bb.mos' to 'aa_bb.txt'
-                mosFulFilNam = os.path.join(self.getLibraryName(), data['ScriptFile'])
-                mosFulFilNam = mosFulFilNam.replace(os.sep, '_')
-                refFilNam = os.path.splitext(mosFulFilNam)[0] + ".txt"
+                nMes = self._get_number_of_messages()
+                updated_reference_data = False
+                refFilNam = self._get_reference_file_name(data)
                 fmu_fil = os.path.join(data['ResultDirectory'],
                                        self.getLibraryName(), data['FMUName'])
                 try:
@@ -2285,35 +2846,33 @@ class Tester(object):
                         " is excluded from unit tests because\n"
                     em += "the file " + fmu_fil + " does not exist\n."
                     self._reporter.writeError(em)
+                self._flag_failed_test(data['model_name'], nMes, updated_reference_data)
         return retVal
 
     def _get_jmodelica_warnings(self, error_text, model):
         """ Return a list with all JModelica warnings
         """
-        import re
+        # JModelica/ThirdParty/MSL/Modelica/Media/package.mo has errorneous each
+        # which we skip in our testing: the lines after such a message are not searched.
+        lines = itertools.takewhile(
+            lambda lin: not any(ign in lin for ign in _IGNORED_JMODELICA_MESSAGES), error_text)
+        # Search all warnings in one pass, and report them in the order of the dictionary.
+        scanner = self._error_dict.get_scanner()
+        keys = scanner.keys()
+        found = [[] for k in keys]
+        for (lin, indices) in scanner.scan(lines):
+            for i in indices:
+                found[i].append(lin)
 
         lis = list()
-        # Search for all warnings
-        for k, v in list(self._error_dict.get_dictionary().items()):
-            # Search in each line of the error file
-            for lin in error_text:
-                # JModelica/ThirdParty/MSL/Modelica/Media/package.mo has errorneous each
-                # which we skip in our testing
-                if ("Ignoring erroneous 'each' for the modification ' = reference_X'" in lin) or \
-                        ("Ignoring erroneous 'each' for the modification ' = fill(0,0)'" in lin) or \
-                        ("""Ignoring erroneous 'each' for the modification ' = {","}'""" in lin):
-                    break
-                # Ignore warnings of the form Iteration variable "der(xxx)" is missing start value!
-#                if re.search(r"""Iteration variable "der\(\S|.\)" is missing start value!""", lin):
-#                    break
-                if v['tool_message'] in lin:
-                    # Found a warning. Report it to the reporter, and add it to the list that will be written to
-                    # the json file.
-                    #                  self._reporter.writeWarning(v["model_message"].format(model))
-                    msg = lin.strip(' \n')
-                    self._reporter.writeWarning("{}: {}".format(model, msg))
-                    lis.append(msg)
-                    self._error_dict.increment_counter(k)
+        for (k, lines) in zip(keys, found):
+            for lin in lines:
+                # Found a warning. Report it to the reporter, and add it to the list that will be written to
+                # the json file.
+                msg = lin.strip(' \n')
+                self._reporter.writeWarning("{}: {}".format(model, msg))
+                lis.append(msg)
+                self._error_dict.increment_counter(k)
         # Return a dictionary with all warnings
         return lis
 
@@ -2368,6 +2927,7 @@ class Tester(object):
                     self._reporter.writeError(em)
                     iTra = iTra + 1
                 else:
+                    nMes = self._get_number_of_messages()
                     with open(json_name, 'r', encoding="utf-8-sig") as json_file:
                         res = json.load(json_file)
                         # Get warnings from stdout that was captured from the compilation
@@ -2419,6 +2979,7 @@ class Tester(object):
                                     res['model'], res["simulation"]["exception"])
                                 self._reporter.writeError(em)
                                 iSim = iSim + 1
+                    self._flag_failed_test(res['model'], nMes)
 
         if iTra > 0:
             print("\nNumber of models that failed translation                     : {}".format(iTra))
@@ -2441,6 +3002,110 @@ class Tester(object):
                 total_size += os.path.getsize(fp)
         return total_size
 
+    def _get_reference_file_name(self, data):
+        """ Return the name of the file with the reference results of a regression test.
+
+        :param data: The element of ``self._data`` of the regression test.
+        :return: The name of the file, such as ``Buildings_Fluid_Examples_A.txt``,
+                 with the extension of the format set by :meth:`setReferenceResultsFormat`.
+        """
+        # Convert 'aa/bb.mos' to 'aa_bb.txt'
+        mosFulFilNam = os.path.join(self.getLibraryName(), data['ScriptFile'])
+        mosFulFilNam = mosFulFilNam.replace(os.sep, '_')
+        return os.path.splitext(mosFulFilNam)[0] + "." + self._reference_format
+
+    def _must_check_results(self, data):
+        """ Return ``True`` if the results of a regression test are compared
+        with the reference results.
+
+        :param data: The element of ``self._data`` of the regression test.
+        """
+        # Note for OPTIMICA and JModelica: data['jmodelica']['simulate']=True is
+        # an additional condition.
+        check_condition = self._includeFile(data['ScriptFile']) and data['mustSimulate']
+        if self._modelica_tool == 'optimica' or self._modelica_tool == 'jmodelica':
+            check_condition = check_condition and data[self._modelica_tool]['simulate']
+        return check_condition
+
+    def _get_reference_check(self, data_idx, oldRefFulFilNam, keep_results):
+        """ Read the results of a regression test and compare them with the reference results.
+
+        :param data_idx: Index of the regression test in ``self._data``.
+        :param oldRefFulFilNam: The name of the file with the reference results.
+        :param keep_results: Set to ``False`` to not return the simulation and reference
+                             results, which are only needed if the user may be asked
+                             whether to update the reference results.
+        :return: A dictionary with the warnings and errors of reading the results,
+                 the simulation results ``y_sim``, the translation statistics ``y_tra``,
+                 the return value of :meth:`_compare_results` or ``None`` if the results
+                 were not compared, an ``exception`` that is raised if the results
+                 could not be decoded, and the messages, standard output and entries of
+                 ``self._comp_info`` that are written by :meth:`_write_reference_check`.
+
+        This method does not change ``self``, and it does not ask the user.
+        Hence, it can run in parallel for different tests.
+        """
+        data = self._data[data_idx]
+        ret = {'warnings': [],
+               'errors': [],
+               'y_sim': None,
+               'y_tra': None,
+               'comparison': None,
+               'exception': None}
+        reporter = self._reporter
+        comp_info = self._comp_info
+        self._reporter = rep.MessageRecorder(model=data['model_name'])
+        self._comp_info = ComparisonResults()
+        out = io.StringIO()
+        try:
+            with _stdout_redirector(out):
+                try:
+                    # Get the simulation results
+                    ret['y_sim'] = self._getSimulationResults(data, ret['warnings'], ret['errors'])
+                    # Get the translation statistics
+                    if self._modelica_tool == 'dymola':
+                        ret['y_tra'] = self._getTranslationStatistics(
+                            data, ret['warnings'], ret['errors'])
+                except UnicodeDecodeError as e:
+                    ret['exception'] = e
+                else:
+                    for entry in ret['warnings']:
+                        self._reporter.writeWarning(entry)
+                    for entry in ret['errors']:
+                        self._reporter.writeError(entry)
+                    if len(ret['errors']) == 0 and os.path.exists(oldRefFulFilNam):
+                        ret['comparison'] = self._compare_results(
+                            data_idx, oldRefFulFilNam, ret['y_sim'], ret['y_tra'])
+            ret['messages'] = self._reporter.records
+            ret['comp_info'] = self._comp_info
+        finally:
+            self._reporter = reporter
+            self._comp_info = comp_info
+        ret['stdout'] = out.getvalue()
+        out.close()
+        if not keep_results and ret['comparison'] is not None and \
+                len(ret['comparison']['y_ref']) > 0:
+            ret['y_sim'] = None
+            ret['comparison']['t_ref'] = None
+            ret['comparison']['y_ref'] = None
+        return ret
+
+    def _write_reference_check(self, check):
+        """ Write the messages and store the comparison information of
+        :meth:`_get_reference_check`.
+        """
+        sys.stdout.write(check['stdout'])
+        self._reporter.writeRecords(check['messages'])
+        self._comp_info.update(check['comp_info'])
+
+    def _log_comp_info(self, model_name, logged_models):
+        """ Append the entry of ``model_name`` in ``self._comp_info`` to the comparison log file,
+        unless the model is not in ``self._comp_info`` or it is in the set ``logged_models``.
+        """
+        if model_name in self._comp_info and model_name not in logged_models:
+            write_log_entry(self._comp_log_file, self._comp_info.get_entry(model_name))
+            logged_models.add(model_name)
+
     def _checkReferencePoints(self, ans):
         """ Check reference points from each regression test and compare it with the previously
             saved reference points of the same test stored in the library home folder.
@@ -2461,114 +3126,142 @@ class Tester(object):
         refDir = os.path.join(self._libHome, 'Resources', 'ReferenceResults', 'Dymola')
         if not os.path.exists(refDir):
             os.makedirs(refDir)
+        # The variable groups are indexed again, as self._data may have changed.
+        self._var_groups = dict()
+        # The comparison log file is written while the tests are verified, with one line
+        # for each model, so that the results are available if the run is interrupted.
+        with open(self._comp_log_file, 'w', encoding="utf-8"):
+            pass
+        logged_models = set()
+
+        # Read and compare the results of the tests in parallel. The messages and the
+        # comparison information are then written in the order of the tests, and the user
+        # is asked whether to update the reference results.
+        tasks = [(data_idx, os.path.join(refDir, self._get_reference_file_name(data)), ans != "N")
+                 for data_idx, data in enumerate(self._data) if self._must_check_results(data)]
+        if self._nPro > 1 and len(tasks) > 1:
+            pool = multiprocessing.Pool(min(self._nPro, len(tasks)),
+                                        initializer=_initialize_reference_check,
+                                        initargs=(self,))
+            checks = pool.imap(_get_reference_check, tasks,
+                               chunksize=max(1, len(tasks) // (4 * self._nPro)))
+        else:
+            pool = None
+            checks = (self._get_reference_check(*task) for task in tasks)
 
         ret_val = 0
-        for data_idx, data in enumerate(self._data):
-            # Only check data that need to be simulated. This excludes the FMU export
-            # from this test.
-            # Note for OPTIMICA and JModelica: data['jmodelica']['simulate']=True is
-            # an additional condition.
-            check_condition = self._includeFile(data['ScriptFile']) and data['mustSimulate']
-            if self._modelica_tool == 'optimica' or self._modelica_tool == 'jmodelica':
-                check_condition = check_condition and data[self._modelica_tool]['simulate']
-            if check_condition:
-                get_user_prompt = True
-                # Convert 'aa/bb.mos' to 'aa_bb.txt'
-                mosFulFilNam = os.path.join(self.getLibraryName(), data['ScriptFile'])
-                mosFulFilNam = mosFulFilNam.replace(os.sep, '_')
-                refFilNam = os.path.splitext(mosFulFilNam)[0] + ".txt"
-                try:
-                    # extract simulation results from the ".mat" file corresponding to "filNam"
-                    warnings = []
-                    errors = []
-                    # Get the simulation results
-                    y_sim = self._getSimulationResults(data, warnings, errors)
-                    # Get the translation statistics
-                    if self._modelica_tool == 'dymola':
-                        y_tra = self._getTranslationStatistics(data, warnings, errors)
+        try:
+            for data_idx, data in enumerate(self._data):
+                # Only check data that need to be simulated. This excludes the FMU export
+                # from this test.
+                check_condition = self._must_check_results(data)
+                nMes = self._get_number_of_messages()
+                # Flag to not store the test as passed if the results were not compared,
+                # see setVerdictCache
+                failed = check_condition
+                if check_condition:
+                    get_user_prompt = True
+                    refFilNam = self._get_reference_file_name(data)
+                    check = next(checks)
+                    self._write_reference_check(check)
+                    try:
+                        if check['exception'] is not None:
+                            raise check['exception']
+                        errors = check['errors']
+                        y_sim = check['y_sim']
+                        y_tra = check['y_tra']
+                        if len(errors) > 0:
+                            # If there were errors when getting the results or translation statistics
+                            # update self._comp_info to log errors and turn flags to return
+                            matFilNam = data['ResultFile']
+                            model_name = data['model_name']
+                            self._init_comp_info(model_name, matFilNam)
+                            list_var_ref = [el for gr in data['ResultVariables'] for el in gr]
+                            for iv, var_ref in enumerate(list_var_ref):
+                                if iv == 0:
+                                    self._update_comp_info(
+                                        model_name,
+                                        var_ref,
+                                        None,
+                                        False,
+                                        0,
+                                        'Translation, simulation or extracting simulation results failed. {}'.format(
+                                            '\n'.join(errors)),
+                                        data_idx)
+                                else:
+                                    self._update_comp_info(
+                                        model_name, var_ref, None, False, 0, '', data_idx)
+                            # flags to return
+                            ret_val = 1
+                            get_user_prompt = False
+
+                    except UnicodeDecodeError as e:
+                        em = "UnicodeDecodeError({0}): {1}".format(e.errno, e)
+                        em += "Output file of " + data['ScriptFile'] + \
+                            " is excluded from unit tests.\n"
+                        em += "The model appears to contain a non-asci character\n"
+                        em += "in the comment of a variable, parameter or constant.\n"
+                        em += "Check " + data['ScriptFile'] + " and the classes it instanciates.\n"
+                        self._reporter.writeError(em)
                     else:
-                        y_tra = None
-                    for entry in warnings:
-                        self._reporter.writeWarning(entry)
-                    for entry in errors:
-                        self._reporter.writeError(entry)
-                    if len(errors) > 0:
-                        # If there were errors when getting the results or translation statistics
-                        # update self._comp_info to log errors and turn flags to return
-                        matFilNam = data['ResultFile']
-                        model_name = data['model_name']
-                        idx = self._init_comp_info(model_name, matFilNam)
-                        list_var_ref = [el for gr in data['ResultVariables'] for el in gr]
-                        for iv, var_ref in enumerate(list_var_ref):
-                            if iv == 0:
-                                self._update_comp_info(
-                                    idx,
-                                    var_ref,
-                                    None,
-                                    False,
-                                    0,
-                                    'Translation, simulation or extracting simulation results failed. {}'.format(
-                                        '\n'.join(errors)),
-                                    data_idx)
+                        # if there was no error for this test case, check user feedback for result
+                        if get_user_prompt:
+                            # Reset answer, unless it is set to Y or N
+                            if not (ans == "Y" or ans == "N"):
+                                ans = "-"
+                            updateReferenceData = False
+                            # check if reference results already exist in library
+                            oldRefFulFilNam = os.path.join(refDir, refFilNam)
+                            # If the reference file exists, and if the reference file contains
+                            # results, compare the results.
+                            if check['comparison'] is not None:
+                                # print('Found results for ' + oldRefFulFilNam)
+                                [updateReferenceData, foundError, ans] = self._compareResults(
+                                    data_idx, oldRefFulFilNam, y_sim, y_tra, refFilNam, ans,
+                                    comparison=check['comparison'])
+                                failed = foundError or updateReferenceData
                             else:
-                                self._update_comp_info(idx, var_ref, None, False, 0, '', data_idx)
-                        # flags to return
-                        ret_val = 1
-                        get_user_prompt = False
-
-                except UnicodeDecodeError as e:
-                    em = "UnicodeDecodeError({0}): {1}".format(e.errno, e)
-                    em += "Output file of " + data['ScriptFile'] + " is excluded from unit tests.\n"
-                    em += "The model appears to contain a non-asci character\n"
-                    em += "in the comment of a variable, parameter or constant.\n"
-                    em += "Check " + data['ScriptFile'] + " and the classes it instanciates.\n"
-                    self._reporter.writeError(em)
+                                noOldResults = []
+                                # add all names since we do not have any reference results yet
+                                for pai in y_sim:
+                                    t_ref = pai["time"]
+                                    noOldResults = noOldResults + list(pai.keys())
+                                self.legacy_plot(y_sim, t_ref, {}, noOldResults, dict(),
+                                                 "New results: " + data['ScriptFile'])
+                                # Reference file does not exist
+                                print(
+                                    "*** Warning: Reference file {} does not yet exist.".format(refFilNam))
+                                while not (ans == "n" or ans == "y" or ans == "Y" or ans == "N"):
+                                    print("             Create new file?")
+                                    ans = input(
+                                        "             Enter: y(yes), n(no), Y(yes for all), N(no for all): ")
+                                if ans == "y" or ans == "Y":
+                                    updateReferenceData = True
+                            if updateReferenceData:    # If the reference data of any variable was updated
+                                # Make dictionary to save the results and the svn information
+                                self._writeReferenceResults(oldRefFulFilNam, y_sim, y_tra)
                 else:
-                    # if there was no error for this test case, check user feedback for result
-                    if get_user_prompt:
-                        # Reset answer, unless it is set to Y or N
-                        if not (ans == "Y" or ans == "N"):
-                            ans = "-"
-                        updateReferenceData = False
-                        # check if reference results already exist in library
-                        oldRefFulFilNam = os.path.join(refDir, refFilNam)
-                        # If the reference file exists, and if the reference file contains
-                        # results, compare the results.
-                        if os.path.exists(oldRefFulFilNam):
-                            # print('Found results for ' + oldRefFulFilNam)
-                            [updateReferenceData, _, ans] = self._compareResults(
-                                data_idx, oldRefFulFilNam, y_sim, y_tra, refFilNam, ans,
-                            )
-                        else:
-                            noOldResults = []
-                            # add all names since we do not have any reference results yet
-                            for pai in y_sim:
-                                t_ref = pai["time"]
-                                noOldResults = noOldResults + list(pai.keys())
-                            self.legacy_plot(y_sim, t_ref, {}, noOldResults, dict(),
-                                             "New results: " + data['ScriptFile'])
-                            # Reference file does not exist
-                            print(
-                                "*** Warning: Reference file {} does not yet exist.".format(refFilNam))
-                            while not (ans == "n" or ans == "y" or ans == "Y" or ans == "N"):
-                                print("             Create new file?")
-                                ans = input(
-                                    "             Enter: y(yes), n(no), Y(yes for all), N(no for all): ")
-                            if ans == "y" or ans == "Y":
-                                updateReferenceData = True
-                        if updateReferenceData:    # If the reference data of any variable was updated
-                            # Make dictionary to save the results and the svn information
-                            self._writeReferenceResults(oldRefFulFilNam, y_sim, y_tra)
-            else:
-                # Tests that export FMUs do not have an output file. Hence, we do not warn
-                # about these cases.
-                if not data['mustExportFMU']:
-                    self._reporter.writeWarning(
-                        "Output file of " + data['ScriptFile'] + " is excluded from result test.")
-
-        # Write all results to comparison log file and inform user.
-        with open(self._comp_log_file, 'w', encoding="utf-8-sig") as comp_log:
-            comp_log.write("{}\n".format(json.dumps(self._comp_info, indent=2, sort_keys=True)))
+                    # Tests that export FMUs do not have an output file. Hence, we do not warn
+                    # about these cases.
+                    if not data['mustExportFMU']:
+                        self._reporter.writeWarning(
+                            "Output file of " + data['ScriptFile'] +
+                            " is excluded from result test.")
+                self._flag_failed_test(data['model_name'], nMes, failed)
+                self._log_comp_info(data['model_name'], logged_models)
+        except BaseException:
+            # Stop the workers, as the remaining results are not read.
+            if pool is not None:
+                pool.terminate()
+            raise
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        # Write the models whose results have not been verified, and inform user.
+        for model_name in self._comp_info:
+            self._log_comp_info(model_name, logged_models)
 
         if self._comp_tool == 'funnel':
             s = (
@@ -2577,28 +3270,18 @@ class Tester(object):
                 "to access a summary of the comparison results.\n").format(
                 self._comp_dir,
                 self._get_size_dir(self._comp_dir) * 1e-6)
+            if not self._write_all_funnel_files:
+                s += ("The report only plots the variables that exceed the tolerance.\n"
+                      "Call 'writeAllFunnelFiles(True)' before running the tests "
+                      "to plot all variables.\n")
             self._reporter.writeOutput(s)
 
         return ret_val
 
     def _performTranslationErrorChecks(self, logFil, stat):
-        with open(logFil, mode="rt", encoding="utf-8-sig") as fil:
-            lines = fil.readlines()
-
-        for k, v in list(self._error_dict.get_dictionary().items()):
-            stat[k] = 0
-            for line in lines:
-                # use regex to extract first group and sum them in stat
-                if 'is_regex' in v and v['is_regex']:
-                    import re
-                    m = re.search(v["tool_message"], line)
-                    if m is not None:
-                        stat[k] = stat[k] + int(m.group(1))
-                # otherwise, default: count the number of line occurences
-                else:
-                    if v["tool_message"] in line:
-                        stat[k] = stat[k] + 1
-
+        # Count the tool messages in one pass over the log file. For regular expressions,
+        # the first group is summed, otherwise the number of lines is counted.
+        stat.update(self._error_dict.get_scanner().count_file(logFil))
         return stat
 
     def _checkSimulationError(self, errorFile):
@@ -2630,6 +3313,7 @@ class Tester(object):
         # Check for errors
         hasTranslationErrors = False
         for ele in stat:
+            nMes = self._get_number_of_messages()
             hasTranslationError = False
             if 'check' in ele and ele['check']['result'] is False:
                 hasTranslationError = True
@@ -2670,6 +3354,7 @@ class Tester(object):
                     with open(logFil, "r") as f2:
                         f.write(f2.read())
                     f.write("\n\n\n")
+            self._flag_failed_test(ele['model'], nMes, hasTranslationError)
 
         if iChe > 0:
             print("Number of models that failed check                           : {}".format(iChe))
@@ -2754,26 +3439,26 @@ class Tester(object):
         ``checkModel("Buildings.Controls.Continuous.Examples.LimPID")``
         """
 
-        def get_model_name(mosFil, line):
-            try:
-                iSta = line.index('\"') + 1
-                iEnd = line.index('\"', iSta)
-                return line[iSta:iEnd]
-            except ValueError as e:
-                em = str(e) + "\n"
-                em += "Did not find model name in '%s'\n" % mosFil
+        modNam = None
+        for com in mos_script.parse_file(mosFilNam):
+            if com.name == 'simulateModel':
+                modNam = _get_model_argument(com)
+            elif 'modelToOpen' in com.kwargs:
+                modNam = _get_string_argument([com], 'modelToOpen')
+            else:
+                continue
+            if modNam is None:
+                em = "Did not find model name in '%s'\n" % mosFilNam
                 self._reporter.writeError(em)
                 raise ValueError(em)
+            break
 
         retVal = None
-        with open(mosFilNam, mode="r+", encoding="utf-8-sig") as fil:
-            for lin in fil:
-                if "simulateModel" in lin or "modelToOpen" in lin:
-                    if self._modelica_tool == 'dymola':
-                        retVal = 'checkModel("{}")'.format(get_model_name(mosFilNam, lin))
-                    elif self._modelica_tool == 'omc':
-                        retVal = "checkModel({})".format(get_model_name(mosFilNam, lin))
-                    break
+        if modNam is not None:
+            if self._modelica_tool == 'dymola':
+                retVal = 'checkModel("{}")'.format(modNam)
+            elif self._modelica_tool == 'omc':
+                retVal = "checkModel({})".format(modNam)
         return retVal
 
     def _removePlotCommands(self, mosFilNam):
@@ -2785,28 +3470,160 @@ class Tester(object):
         This allows to work around a bug in Dymola 2012 which can cause an exception
         from the Windows operating system, or which can cause Dymola to hang on Linux.
         """
-        with open(mosFilNam, mode="r+", encoding="utf-8-sig") as fil:
-            lines = fil.readlines()
-        linWri = []
-        goToPlotEnd = False
-        for i in range(len(lines)):
-            if not goToPlotEnd:
-                if (lines[i].count("removePlots(") == 0) and (lines[i].count("createPlot(") == 0):
-                    linWri.append(i)
-                elif (lines[i].count("createPlot(")) > 0:
-                    goToPlotEnd = True
-            else:
-                if (lines[i].count(";") > 0):
-                    goToPlotEnd = False
-        # Write file
+        with open(mosFilNam, mode="r", encoding="utf-8-sig") as fil:
+            con = mos_script.remove_commands(fil.read(), ['createPlot', 'removePlots'])
+        # Write file. The file is deleted first as it may be linked to the file
+        # of the library, see setStagingMethod.
+        os.remove(mosFilNam)
         with open(mosFilNam, mode="w", encoding="utf-8") as filWri:
-            for i in range(len(linWri)):
-                filWri.write(lines[linWri[i]])
+            filWri.write(con)
+
+    def _get_expected_runtime(self, dat):
+        """ Return the expected computing time of a regression test.
+
+        :param dat: The element of ``self._data`` of the regression test.
+        :return: A number that is larger for regression tests that are expected to take longer.
+
+        The number is only used to schedule the regression tests, hence only
+        its order matters. The simulated time interval is used as an estimate.
+        If the start or stop time is an expression, such as ``3600*24``,
+        ``None`` is returned.
+        See :func:`_get_expected_runtimes` for how previous runs are taken into account.
+        """
+        if not dat.get('mustSimulate', False):
+            return 0.
+        try:
+            return max(0., float(dat.get('stopTime', 0)) - float(dat.get('startTime', 0)))
+        except ValueError:
+            # The times are the text of the .mos script, which may be an expression.
+            return None
+
+    def _get_expected_runtimes(self):
+        """ Return a list with the expected computing time of each regression test.
+
+        If :func:`setRuntimeHistory` has been called, the median computing time of
+        previous runs is used. For models without previous runs, the estimate of
+        :func:`_get_expected_runtime` is scaled with the median ratio between the
+        computing time and this estimate of the models that have previous runs.
+        Models without an estimate are assigned the median of the other estimates.
+        """
+        est = [self._get_expected_runtime(dat) for dat in self._data]
+        if None in est:
+            kno = [e for e in est if e is not None]
+            med_est = float(np.median(kno)) if len(kno) > 0 else 0.
+            est = [med_est if e is None else e for e in est]
+        if self._runtime_history is None:
+            return est
+        med = self._runtime_history.median_runtimes(tool=self._modelica_tool)
+        if len(med) == 0:
+            return est
+        fac = [med[dat['model_name']] / e for (dat, e) in zip(self._data, est)
+               if e > 0 and dat['model_name'] in med]
+        fac = float(np.median(fac)) if len(fac) > 0 else 1.
+        return [med[dat['model_name']] if dat['model_name'] in med else e * fac
+                for (dat, e) in zip(self._data, est)]
+
+    def _get_batches(self, nBatches):
+        """ Return the regression tests grouped into batches.
+
+        :param nBatches: The number of batches.
+        :return: A list with the batches, each being a list of indices of ``self._data``.
+
+        The regression tests are assigned, longest expected computing time first,
+        to the batch with the smallest expected computing time, or, if these are equal,
+        to the batch with the fewest regression tests.
+        Hence, the regression tests that take long are at the start of
+        a batch of their own, and the batches are returned longest expected computing time first.
+        If there are fewer regression tests than batches, fewer batches are returned.
+        """
+        import heapq
+
+        nTes = self.get_number_of_tests()
+        nBatches = min(nBatches, nTes)
+        if nBatches < 1:
+            return []
+        runTim = self._get_expected_runtimes()
+        # Stable sort, hence tests with the same expected computing time stay in order.
+        order = sorted(range(nTes), key=lambda i: -runTim[i])
+
+        batches = [[] for _ in range(nBatches)]
+        heap = [(0., 0, iBat) for iBat in range(nBatches)]
+        for i in order:
+            (load, nTesBat, iBat) = heapq.heappop(heap)
+            batches[iBat].append(i)
+            heapq.heappush(heap, (load + runTim[i], nTesBat + 1, iBat))
+        load = [sum([runTim[i] for i in bat]) for bat in batches]
+        return [batches[iBat] for iBat in sorted(range(nBatches), key=lambda iBat: -load[iBat])]
+
+    def _get_existing_result_directory(self, dat):
+        """ Return the temporary directory that contains the results of a regression test.
+
+        :param dat: The element of ``self._data`` of the regression test.
+
+        This function is used if :func:`useExistingResults` has been called, as the
+        regression tests are not assigned to a fixed temporary directory.
+        If no temporary directory contains the result file, the first one is returned.
+        """
+        if 'ResultFile' in dat:
+            for d in self._temDir:
+                if self._modelica_tool in ['dymola', 'omc']:
+                    fulFilNam = os.path.join(d, self.getLibraryName(), dat['ResultFile'])
+                else:
+                    fulFilNam = os.path.join(d, dat['ResultFile'])
+                if os.path.exists(fulFilNam):
+                    return d
+        return self._temDir[0]
+
+    def _run_batches(self, cmd):
+        """ Run the batches of regression tests that were written by :func:`_write_runscripts`.
+
+        :param cmd: The command passed to :func:`runSimulation`.
+        :return: A list with the temporary directory in which each batch was run.
+
+        Each process is assigned one temporary directory. The batches are taken one at a time
+        from a shared queue by the process that is idle, hence a regression test that takes
+        long does not delay the regression tests that would otherwise be run after it.
+        The directory in which a test has been run is stored as ``ResultDirectory``
+        in ``self._data``.
+        """
+        libNam = self.getLibraryName()
+        args = [(iBat, bat[1], cmd, libNam) for iBat, bat in enumerate(self._batches)]
+        directories = multiprocessing.Queue()
+        for d in self._temDir[:self._nPro]:
+            directories.put(d)
+
+        batDir = [None] * len(args)
+        if self._nPro > 1:
+            po = multiprocessing.Pool(self._nPro,
+                                      initializer=_initialize_worker,
+                                      initargs=(directories,))
+            # Use chunksize=1 so that the processes take the batches one by one.
+            for (iBat, d) in po.imap_unordered(_run_batch, args, chunksize=1):
+                batDir[iBat] = d
+            po.close()
+            po.join()
+        elif len(args) > 0:
+            _initialize_worker(directories)
+            for arg in args:
+                (iBat, d) = _run_batch(arg)
+                batDir[iBat] = d
+
+        for (bat, d) in zip(self._batches, batDir):
+            for i in bat[0]:
+                self._data[i]['ResultDirectory'] = d
+        return batDir
 
     def _write_runscripts(self):
-        """Create the runAll.mos scripts, one per processor (self._nPro).
+        """Create the scripts that run the regression tests.
 
         The commands in the script depend on the tool: 'dymola', 'optimica', 'jmodelica' or 'omc'
+
+        For 'dymola' and 'omc', one script is created for each batch returned by
+        :func:`_get_batches`, and stored in ``self._batches``. As the batches are run
+        by whatever process is idle, the temporary directory is not known yet, and hence
+        the scripts contain the placeholder ``_WORKING_DIRECTORY``.
+        For 'optimica' and 'jmodelica', one ``run.py`` file is written to the temporary
+        directory of each processor.
         """
         import platform
 
@@ -2848,16 +3665,26 @@ class Tester(object):
         #                     dat['ResultDirectory'] = allDat['ResultDirectory']
         #                     break
 
-        for iPro in range(self._nPro):
+        if self._modelica_tool in ['dymola', 'omc']:
+            # Small batches, so that the processes that are done early can take more work
+            batches = self._get_batches(max(min(nTes, 4 * self._nPro), (nTes + 9) // 10))
+        else:
+            batches = self._get_batches(self._nPro)
+        self._batches = []
+
+        for iBat, batch in enumerate(batches):
 
             ###################################################################################
             # Case for dymola and omc
             ###################################################################################
             if self._modelica_tool in ['dymola', 'omc']:
-                runFil = open(os.path.join(self._temDir[iPro], self.getLibraryName(
-                ), "runAll.mos"), mode="w", encoding="utf-8")
+                # Each batch writes its own statistics file, as several batches may be run
+                # in the same directory.
+                (root, ext) = os.path.splitext(self._statistics_log)
+                staLog = "{}-{}{}".format(root, iBat, ext)
+                runFil = io.StringIO()
                 runFil.write(
-                    "// File autogenerated for process {!s} of {!s}\n".format(iPro + 1, self._nPro))
+                    "// File autogenerated for batch {!s} of {!s}\n".format(iBat + 1, len(batches)))
                 runFil.write(
                     "// File created for execution by {}. Do not edit.\n".format(self._modelica_tool))
 
@@ -2882,8 +3709,7 @@ class Tester(object):
                         runFil.write('    sett[{}] = \"DDE=0\"; // Disable DDE.\n'.format(posDDE))
                         runFil.write('    SetDymolaCompiler(comp, sett);\n')
 
-                    runFil.write(
-                        ('cd(\"{}/{}\");\n'.format(self._temDir[iPro], self.getLibraryName())).replace("\\", "/"))
+                    runFil.write('cd(\"{}/{}\");\n'.format(_WORKING_DIRECTORY, self.getLibraryName()))
                     runFil.write('openModel("package.mo");\n')
                 elif self._modelica_tool == 'omc':
                     runFil.write('loadModel(Modelica, {"3.2"});\n')
@@ -2901,28 +3727,32 @@ class Tester(object):
                     runFil.write("Modelica.Utilities.Files.remove(\"%s\");\n" %
                                  self._simulator_log_file)
 
-                runFil.write("Modelica.Utilities.Files.remove(\"%s\");\n" % self._statistics_log)
+                runFil.write("Modelica.Utilities.Files.remove(\"%s\");\n" % staLog)
 
                 runFil.write(r"""
     Modelica.Utilities.Streams.print("{\"testCase\" : [", "%s");
-    """ % self._statistics_log)
+    """ % staLog)
                 # Count the number of experiments that need to be simulated or exported as an FMU.
                 # This is needed to properly close the json brackets.
                 nItem = 0
-                for i in range(iPro, nTes, self._nPro):
+                for i in batch:
                     if self._data[i]['mustSimulate'] or self._data[i]['mustExportFMU']:
                         nItem = nItem + 1
                 iItem = 0
                 # Write unit tests for this process
-                for i in range(iPro, nTes, self._nPro):
+                for i in batch:
                     # Check if this mos file should be simulated
                     if self._data[i]['mustSimulate'] or self._data[i]['mustExportFMU']:
                         isLastItem = (iItem == nItem - 1)
-                        self._data[i]['ResultDirectory'] = self._temDir[iPro]
+                        # The result directory is set once the batch has been run,
+                        # unless existing results are used.
+                        if self._useExistingResults:
+                            self._data[i]['ResultDirectory'] = \
+                                self._get_existing_result_directory(self._data[i])
                         mosFilNam = os.path.join(self.getLibraryName(),
                                                  "Resources", "Scripts", "Dymola",
                                                  self._data[i]['ScriptFile'])
-                        absMosFilNam = os.path.join(self._temDir[iPro], mosFilNam)
+                        absMosFilNam = os.path.join(self._temDir[0], mosFilNam)
 
                         values = {
                             "mosWithPath": mosFilNam.replace(
@@ -2945,11 +3775,11 @@ class Tester(object):
                                 "_"),
                             "start_time": self._data[i]['startTime'] if 'startTime' in self._data[i] else 0,
                             "final_time": self._data[i]['stopTime'] if 'stopTime' in self._data[i] else 0,
-                            "statisticsLog": self._statistics_log.replace(
+                            "statisticsLog": staLog.replace(
                                 "\\",
                                 "/"),
                             "translationLog": os.path.join(
-                                self._temDir[iPro],
+                                _WORKING_DIRECTORY,
                                 self.getLibraryName(),
                                 self._data[i]['model_name'] +
                                 ".translation.log").replace(
@@ -3091,7 +3921,7 @@ class Tester(object):
 
                             _print_end_of_json(isLastItem,
                                                runFil,
-                                               self._statistics_log)
+                                               staLog)
 
                         ##########################################################################
                         # FMU export
@@ -3131,7 +3961,7 @@ class Tester(object):
 
                             _print_end_of_json(isLastItem,
                                                runFil,
-                                               self._statistics_log)
+                                               staLog)
 
                         elif self._modelica_tool == 'omc':
                             template("""
@@ -3145,7 +3975,10 @@ class Tester(object):
                             print(
                                 "****** {} neither requires a simulation nor an FMU export.".format(self._data[i]['ScriptFile']))
 
-                        self._removePlotCommands(absMosFilNam)
+                        # Any process may run this test, hence remove the plot commands
+                        # in all temporary directories.
+                        for d in self._temDir:
+                            self._removePlotCommands(os.path.join(d, mosFilNam))
                         nUniTes = nUniTes + 1
                         iItem = iItem + 1
                 if self._modelica_tool == 'dymola' and platform.system() == 'Windows':
@@ -3154,19 +3987,24 @@ class Tester(object):
                     runFil.write('    sett[{}] = DDE_orig;\n'.format(posDDE))
                     runFil.write('    SetDymolaCompiler(comp, sett);\n')
                 runFil.write("exit();\n")
+                self._batches.append((batch, runFil.getvalue(), staLog))
                 runFil.close()
             ###################################################################################
             # Case for OPTIMICA and JModelica
             ###################################################################################
             elif self._modelica_tool == 'optimica' or self._modelica_tool == 'jmodelica':
                 data = []
-                for i in range(iPro, nTes, self._nPro):
+                for i in batch:
                     # Store ResultDirectory into data dict.
-                    self._data[i]['ResultDirectory'] = self._temDir[iPro]
+                    if self._useExistingResults:
+                        self._data[i]['ResultDirectory'] = \
+                            self._get_existing_result_directory(self._data[i])
+                    else:
+                        self._data[i]['ResultDirectory'] = self._temDir[iBat]
                     # Copy data used for this process only.
                     data.append(self._data[i])
                     nUniTes = nUniTes + 1
-                self._write_jmodelica_runfile(self._temDir[iPro], data)
+                self._write_jmodelica_runfile(self._temDir[iBat], data)
 
         print("Generated {} regression tests.\n".format(nUniTes))
 
@@ -3257,6 +4095,9 @@ class Tester(object):
     # Create the list of temporary directories that will be used to run the unit tests
     def _setTemporaryDirectories(self):
         self._temDir = []
+        staTim = 0
+        nLin = 0
+        nCop = 0
 
         # Make temporary directory, copy library into the directory and
         # write run scripts to directory
@@ -3268,10 +4109,16 @@ class Tester(object):
             # Directory that contains the library as a sub directory
             libDir = self._libHome
 
-            shutil.copytree(libDir,
-                            os.path.join(dirNam, self.getLibraryName()),
-                            symlinks=True,
-                            ignore=shutil.ignore_patterns('.svn', '.mat', 'request.', 'status.'))
+            sta = stage_directory(libDir,
+                                  os.path.join(dirNam, self.getLibraryName()),
+                                  ignore=['.svn', '.git', '.mat', 'request.', 'status.'],
+                                  method=self._staging_method)
+            staTim += sta['time']
+            nLin += sta['linked']
+            nCop += sta['copied']
+        self._reporter.writeOutput(
+            "Staged library in {} temporary directories in {:.1f} s, "
+            "with {} linked and {} copied files.".format(self._nPro, staTim, nLin, nCop))
         return
 
     def _run_simulation_info(self):
@@ -3295,6 +4142,175 @@ class Tester(object):
         dataJson = simplejson.dumps(data)
         return dataJson
 
+    def _get_runtime_records(self):
+        """ Return the computing times of the last run, as needed by
+        :meth:`buildingspy.development.runtime_history.RuntimeHistory.add_run`.
+
+        For Dymola, the CPU time for the integration is reported as simulation time.
+        For OPTIMICA and JModelica, the time to translate and to simulate the model
+        and the peak memory of these processes are reported.
+        """
+        def to_number(val):
+            try:
+                return float(val)
+            except (TypeError, ValueError):
+                return None
+
+        ret = []
+        if self._modelica_tool in ['dymola', 'omc']:
+            if not os.path.isfile(self._statistics_log):
+                return ret
+            with open(self._statistics_log, mode="rt", encoding="utf-8-sig") as fil:
+                cases = json.load(fil)["testCase"]
+            for case in cases:
+                if 'simulate' in case:
+                    sim = case['simulate']
+                    ret.append({'model': case['model'],
+                                'simulation_time': to_number(sim.get('elapsed_time')),
+                                'jacobians': to_number(sim.get('jacobians')),
+                                'state_events': to_number(sim.get('state_events')),
+                                'success': bool(sim.get('result'))})
+        else:
+            if not os.path.isfile(self._simulator_log_file):
+                return ret
+            with open(self._simulator_log_file, mode="rt", encoding="utf-8-sig") as fil:
+                cases = json.load(fil)
+            for case in cases:
+                tra = case.get('translation', {})
+                sim = case.get('simulation', {})
+                mem = [m for m in [tra.get('peak_memory'), sim.get('peak_memory')]
+                       if m is not None]
+                ret.append({'model': case['model'],
+                            'translation_time': to_number(tra.get('cpu_time')),
+                            'simulation_time': to_number(sim.get('cpu_time')),
+                            'peak_memory': max(mem) if len(mem) > 0 else None,
+                            'jacobians': to_number(sim.get('jacobians')),
+                            'state_events': to_number(sim.get('state_events')),
+                            'success': bool(tra.get('success')) and bool(sim.get('success'))})
+        return ret
+
+    def _get_simulator_version(self):
+        """ Return a string that changes if the simulator is updated.
+
+        The string contains the location, size and modification time of
+        the executable of the simulator.
+        """
+        program = self.getModelicaCommand()
+        for path in [''] + os.environ.get("PATH", "").split(os.pathsep):
+            for ext in ['', '.exe']:
+                exe_file = os.path.join(path, program + ext)
+                if os.path.isfile(exe_file):
+                    exe_file = os.path.realpath(exe_file)
+                    sta = os.stat(exe_file)
+                    return "{}|{}|{}".format(exe_file, sta.st_size, repr(sta.st_mtime))
+        return program
+
+    def _get_fingerprints(self):
+        """ Return a dictionary with the model names as keys and the fingerprints
+        of their tests as values.
+
+        Tests whose model is not found in the library have no fingerprint.
+        """
+        import hashlib
+        import buildingspy
+        from buildingspy.development.dependency_graph import DependencyGraph
+        from buildingspy.development.verdict_cache import VerdictCache
+
+        def get_content(fileName):
+            """ Return the content of a file, or of all files in a directory.
+            """
+            if fileName not in content:
+                fulNam = os.path.join(self._libHome, fileName)
+                if os.path.isdir(fulNam):
+                    lis = []
+                    for root, _, files in os.walk(fulNam):
+                        for fil in sorted(files):
+                            nam = os.path.relpath(os.path.join(root, fil), self._libHome)
+                            lis.append(nam + "|" + get_content(nam))
+                    content[fileName] = "\n".join(sorted(lis))
+                elif os.path.isfile(fulNam):
+                    with open(fulNam, mode="rb") as f:
+                        content[fileName] = hashlib.sha1(f.read()).hexdigest()
+                else:
+                    content[fileName] = ""
+            return content[fileName]
+
+        content = dict()
+        graph = DependencyGraph(self._libHome)
+        settings = json.dumps({'tool': self._modelica_tool,
+                               'version': self._get_simulator_version(),
+                               'buildingspy': buildingspy.__version__,
+                               'pedanticModelica': self._pedanticModelica,
+                               'skip_verification': self._skip_verification,
+                               'comp_tool': self._comp_tool,
+                               'tol': self._tol,
+                               'nPoi': self._nPoi}, sort_keys=True)
+        ret = dict()
+        for dat in self._data:
+            model = dat['modelToOpen'] if 'modelToOpen' in dat else dat['model_name']
+            if graph.get_class_file(model) is None:
+                continue
+            refFil = os.path.join('Resources', 'ReferenceResults', 'Dymola',
+                                  self._get_reference_file_name(dat))
+            parts = [settings,
+                     json.dumps(dict([(k, v) for (k, v) in dat.items() if k != 'ResultDirectory']),
+                                sort_keys=True, default=str),
+                     get_content(os.path.join('Resources', 'Scripts', 'Dymola',
+                                              dat['ScriptFile'])),
+                     get_content(refFil)]
+            for fil in sorted(graph.get_dependency_files(model)):
+                parts.append(fil + "|" + get_content(fil))
+            ret[dat['model_name']] = VerdictCache.get_fingerprint(parts)
+        return ret
+
+    def _get_number_of_messages(self):
+        """ Return the number of errors and warnings that have been reported.
+        """
+        return self._reporter.getNumberOfErrors() + self._reporter.getNumberOfWarnings()
+
+    def _flag_failed_test(self, model, nMes, failed=False):
+        """ Flag the test of ``model`` as failed if ``failed`` is ``True``, or if errors or
+        warnings were reported since the reporter had ``nMes`` errors and warnings.
+        """
+        n = self._get_number_of_messages() - nMes
+        self._nTestMessages += n
+        if failed or n > 0:
+            self._failed_tests.add(model)
+
+    def _skip_passed_tests(self):
+        """ Remove the tests that passed before from ``self._data``, and return the
+        fingerprints of the tests that are run.
+        """
+        fingerprints = self._get_fingerprints()
+        data = [dat for dat in self._data
+                if dat['model_name'] not in fingerprints or
+                not self._verdict_cache.has_passed(fingerprints[dat['model_name']])]
+        nSki = len(self._data) - len(data)
+        self._data = data
+        # Inform the user that not all tests are run, but don't add to warnings
+        # as this would flag the test to have failed
+        if nSki > 0:
+            self._reporter.writeOutput(
+                "Skipped {} regression test{} that passed before and did not change since.".format(
+                    nSki, '' if nSki == 1 else 's'))
+        return fingerprints
+
+    def _add_passed_tests(self, fingerprints, nMes):
+        """ Add the fingerprints of the tests that passed to the verdict cache.
+
+        :param fingerprints: The fingerprints returned by :meth:`_skip_passed_tests`.
+        :param nMes: The number of errors and warnings before the tests were run.
+        """
+        n = self._get_number_of_messages() - nMes
+        if n > self._nTestMessages:
+            # Some errors or warnings cannot be attributed to a test.
+            return
+        for dat in self._data:
+            model = dat['model_name']
+            if model in fingerprints and model not in self._failed_tests:
+                self._verdict_cache.add(fingerprints[model],
+                                        {'model': model, 'ScriptFile': dat['ScriptFile']})
+
     def run(self):
         """ Run all regression tests and checks the results.
 
@@ -3307,7 +4323,9 @@ class Tester(object):
         - copies the directory ``CURRENT_DIRECTORY`` into these
           temporary directories,
         - creates run scripts that run all regression tests,
-        - runs these regression tests,
+        - runs these regression tests, whereby each process takes the next
+          batch of regression tests as soon as it is idle,
+          starting with the tests that are expected to take longest,
         - collects the dymola log files from each process,
         - writes the combined log file ``unitTests-x.log``
           to the current directory, where `x` is the name of the
@@ -3322,8 +4340,22 @@ class Tester(object):
         self.checkPythonModuleAvailability()
 
         if self.get_number_of_tests() == 0:
+            if self._changed_files is not None:
+                print("No regression test depends on the changed files.")
+                return 0
             self.setDataDictionary(self._rootPackage)
 
+        # Skip the tests that passed before
+        useVerdicts = self._verdict_cache is not None and self._modelica_tool != 'omc'
+        if useVerdicts:
+            fingerprints = self._skip_passed_tests()
+            if self.get_number_of_tests() == 0:
+                print("All regression tests passed before and did not change since.")
+                return 0
+        self._failed_tests = set()
+        self._nTestMessages = 0
+        nMes = self._get_number_of_messages()
+
         # (Delete and) Create directory for storing funnel data.
         if self._comp_tool == 'funnel':
             shutil.rmtree(self._comp_dir, ignore_errors=True)
@@ -3400,7 +4432,9 @@ class Tester(object):
                 cmd = [self.getModelicaCommand(), "runAll.mos"]
             elif self._modelica_tool == 'optimica' or self._modelica_tool == 'jmodelica':
                 cmd = [self.getModelicaCommand(), "run.py"]
-            if self._nPro > 1:
+            if self._modelica_tool in ['dymola', 'omc']:
+                batDir = self._run_batches(cmd)
+            elif self._nPro > 1:
                 po = multiprocessing.Pool(self._nPro)
                 po.map(functools.partial(runSimulation,
                                          cmd=cmd),
@@ -3432,8 +4466,8 @@ class Tester(object):
             if self._modelica_tool == 'dymola' or self._modelica_tool == 'omc':
                 with open(self._statistics_log, mode="w", encoding="utf-8") as logFil:
                     stat = list()
-                    for d in self._temDir:
-                        temLogFilNam = os.path.join(d, self.getLibraryName(), self._statistics_log)
+                    for (bat, d) in zip(self._batches, batDir):
+                        temLogFilNam = os.path.join(d, self.getLibraryName(), bat[2])
                         if os.path.exists(temLogFilNam):
                             with open(temLogFilNam.replace('Temp\tmp', 'Temp\\tmp'), mode="r", encoding="utf-8-sig") as temSta:
                                 try:
@@ -3483,7 +4517,7 @@ class Tester(object):
                 # For Dymola: store available simulation info into
                 # self._comp_info used for reporting.
                 val = self._run_simulation_info()
-                self._comp_info = simplejson.loads(val)
+                self._comp_info = ComparisonResults(simplejson.loads(val))
 
                 r = self._checkReferencePoints(ans)
                 if r != 0:  # In case of comparison error. Comparison warnings are handled
@@ -3502,7 +4536,7 @@ class Tester(object):
                 # For OPTIMICA and JModelica: store available translation and simulation info
                 # into self._comp_info used for reporting.
                 with open(self._simulator_log_file, 'r') as f:
-                    self._comp_info = simplejson.loads(f.read())
+                    self._comp_info = ComparisonResults(simplejson.loads(f.read()))
 
                 r = self._checkReferencePoints(ans='N')
                 if r != 0:
@@ -3511,6 +4545,17 @@ class Tester(object):
                     else:
                         retVal = 4
 
+        # Store the fingerprints of the tests that passed
+        if useVerdicts:
+            self._add_passed_tests(fingerprints, nMes)
+
+        # Store the computing times of this run
+        if self._runtime_history is not None and not self._useExistingResults:
+            self._runtime_history.add_run(tool=self._modelica_tool,
+                                          results=self._get_runtime_records(),
+                                          library=self.getLibraryName(),
+                                          processors=self._nPro)
+
         # Update exit code after comparing with reference points
         # and print summary messages.
         if retVal == 0:
@@ -3539,6 +4584,7 @@ class Tester(object):
         if self._modelica_tool == 'dymola':
             os.remove(self._statistics_log)
 
+        self._reporter.flush()
         return retVal
 
     def _get_test_models(self, folder=None, packages=None):
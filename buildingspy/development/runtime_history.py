@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# import from future to make Python2 behave like Python3
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from io import open
+# end of from future import
+
+import sqlite3
+import time
+from contextlib import closing
+
+
+class RuntimeHistory(object):
+    """ Class that stores the computing time of regression tests in a database.
+
+    :param fileName: The name of the SQLite database file. The file is created if
+                     it does not exist.
+
+    For each run of the regression tests, the database stores for each model the
+    translation time, the simulation time, the peak memory, the number of Jacobian
+    evaluations and state events, and whether the test succeeded.
+    Values that are not reported by the simulator are stored as ``None``.
+    The database can be queried to schedule the regression tests, to set time outs,
+    or to find the models whose computing time increased.
+
+    The database can be written by several processes at the same time.
+
+    Usage: Type
+
+       >>> import os
+       >>> import tempfile
+       >>> from buildingspy.development.runtime_history import RuntimeHistory
+       >>> fileName = os.path.join(tempfile.mkdtemp(), "runtimes.sqlite")
+       >>> his = RuntimeHistory(fileName)
+       >>> for simTim in [10., 12., 14.]:
+       ...     runId = his.add_run(
+       ...         "dymola",
+       ...         [{'model': 'MyLib.Examples.A', 'simulation_time': simTim, 'success': True},
+       ...          {'model': 'MyLib.Examples.B', 'simulation_time': 1., 'success': True}])
+       >>> his.median_runtime('MyLib.Examples.A')
+       12.0
+       >>> his.trend('MyLib.Examples.A')
+       2.0
+       >>> his.slowest(1)
+       [('MyLib.Examples.A', 12.0)]
+       >>> os.remove(fileName)
+
+    """
+
+    def __init__(self, fileName):
+        self._fileName = fileName
+        with closing(self._connect()) as con:
+            with con:
+                con.execute("""CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp REAL NOT NULL,
+                    tool TEXT NOT NULL,
+                    library TEXT,
+                    processors INTEGER)""")
+                con.execute("""CREATE TABLE IF NOT EXISTS results (
+                    run_id INTEGER NOT NULL REFERENCES runs(id),
+                    model TEXT NOT NULL,
+                    translation_time REAL,
+                    simulation_time REAL,
+                    peak_memory REAL,
+                    jacobians INTEGER,
+                    state_events INTEGER,
+                    success INTEGER)""")
+                con.execute("CREATE INDEX IF NOT EXISTS results_model ON results (model)")
+
+    def _connect(self):
+        # Wait if another process writes to the database.
+        return sqlite3.connect(self._fileName, timeout=60)
+
+    def add_run(self, tool, results, library=None, processors=None, timestamp=None):
+        """ Add the results of one run of the regression tests.
+
+        :param tool: The name of the simulator, such as ``dymola``.
+        :param results: A list of dictionaries, one for each model. Each dictionary
+                        has the key ``model`` and optionally the keys
+                        ``translation_time``, ``simulation_time`` (in seconds),
+                        ``peak_memory`` (in kilobytes, or ``None`` if it cannot be measured,
+                        such as on Windows), ``jacobians``, ``state_events``
+                        and ``success``.
+        :param library: The name of the library.
+        :param processors: The number of processors used for the run.
+        :param timestamp: The time of the run in seconds since the epoch,
+                          or ``None`` to use the current time.
+        :return: The identifier of the run.
+        """
+        keys = ['translation_time', 'simulation_time', 'peak_memory',
+                'jacobians', 'state_events', 'success']
+        if timestamp is None:
+            timestamp = time.time()
+        with closing(self._connect()) as con:
+            with con:
+                cur = con.execute(
+                    "INSERT INTO runs (timestamp, tool, library, processors) VALUES (?, ?, ?, ?)",
+                    (timestamp, tool, library, processors))
+                run_id = cur.lastrowid
+                con.executemany(
+                    "INSERT INTO results (run_id, model, {}) VALUES (?, ?, {})".format(
+                        ", ".join(keys), ", ".join(["?"] * len(keys))),
+                    [[run_id, res['model']] + [res.get(key) for key in keys] for res in results])
+        return run_id
+
+    def get_runtimes(self, tool=None, last=None):
+        """ Return the computing times of all models.
+
+        :param tool: The name of the simulator, or ``None`` to use the runs of all simulators.
+        :param last: The number of most recent runs that are returned for each model,
+                     or ``None`` to return all runs.
+        :return: A dictionary whose keys are the model names, and whose values are
+                 lists with the computing times, oldest run first.
+
+        The computing time is the sum of the translation and simulation time.
+        Runs in which neither of these times has been reported are skipped.
+        """
+        sql = """SELECT results.model,
+                        COALESCE(results.translation_time, 0) + COALESCE(results.simulation_time, 0)
+                 FROM results JOIN runs ON results.run_id = runs.id
+                 WHERE (results.translation_time IS NOT NULL
+                        OR results.simulation_time IS NOT NULL)"""
+        args = []
+        if tool is not None:
+            sql += " AND runs.tool = ?"
+            args.append(tool)
+        sql += " ORDER BY runs.timestamp, runs.id"
+
+        ret = dict()
+        with closing(self._connect()) as con:
+            for (model, runTim) in con.execute(sql, args):
+                ret.setdefault(model, []).append(runTim)
+        if last is not None:
+            for model in ret:
+                ret[model] = ret[model][-last:]
+        return ret
+
+    @staticmethod
+    def _median(values):
+        s = sorted(values)
+        n = len(s)
+        if n % 2 == 1:
+            return s[n // 2]
+        return 0.5 * (s[n // 2 - 1] + s[n // 2])
+
+    def median_runtimes(self, tool=None, last=10):
+        """ Return the median computing time of all models.
+
+        :param tool: The name of the simulator, or ``None`` to use the runs of all simulators.
+        :param last: The number of most recent runs that are used for each model,
+                     or ``None`` to use all runs.
+        :return: A dictionary whose keys are the model names, and whose values are
+                 the median computing times.
+        """
+        runTim = self.get_runtimes(tool=tool, last=last)
+        return dict([(model, self._median(val)) for (model, val) in runTim.items()])
+
+    def median_runtime(self, model, tool=None, last=10):
+        """ Return the median computing time of a model.
+
+        :param model: The name of the model.
+        :param tool: The name of the simulator, or ``None`` to use the runs of all simulators.
+        :param last: The number of most recent runs that are used,
+                     or ``None`` to use all runs.
+        :return: The median computing time, or ``None`` if the model has no runs.
+        """
+        return self.median_runtimes(tool=tool, last=last).get(model)
+
+    def trend(self, model, tool=None, last=10):
+        """ Return how much the computing time of a model changed from run to run.
+
+        :param model: The name of the model.
+        :param tool: The name of the simulator, or ``None`` to use the runs of all simulators.
+        :param last: The number of most recent runs that are used,
+                     or ``None`` to use all runs.
+        :return: The slope of the least-squares line through the computing times,
+                 in seconds per run, or ``None`` if the model has fewer than two runs.
+        """
+        y = self.get_runtimes(tool=tool, last=last).get(model, [])
+        n = len(y)
+        if n < 2:
+            return None
+        xMea = 0.5 * (n - 1)
+        yMea = sum(y) / n
+        num = sum([(i - xMea) * (y[i] - yMea) for i in range(n)])
+        den = sum([(i - xMea)**2 for i in range(n)])
+        return num / den
+
+    def slowest(self, n=10, tool=None, last=10):
+        """ Return the models with the largest median computing time.
+
+        :param n: The number of models.
+        :param tool: The name of the simulator, or ``None`` to use the runs of all simulators.
+        :param last: The number of most recent runs that are used for each model,
+                     or ``None`` to use all runs.
+        :return: A list of tuples with the model name and the median computing time,
+                 slowest model first.
+        """
+        med = self.median_runtimes(tool=tool, last=last)
+        return sorted(med.items(), key=lambda x: (-x[1], x[0]))[:n]
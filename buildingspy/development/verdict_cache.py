@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# import from future to make Python2 behave like Python3
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from io import open
+# end of from future import
+
+import hashlib
+import json
+import os
+import time
+
+
+class VerdictCache(object):
+    """ Class that stores the fingerprints of regression tests that passed.
+
+    :param directory: The directory in which the verdicts are stored.
+    :param maxSize: The maximum size of the cache in bytes.
+
+    A fingerprint is a hash of everything that determines the outcome of a
+    regression test, such as the content of the Modelica files that the model
+    uses, of the ``.mos`` script and of the reference results, the experiment
+    specification and the version of the simulator.
+    If a test with the same fingerprint passed before, it will pass again,
+    and hence it need not be simulated.
+
+    For each fingerprint, the cache stores a small file with the verdict.
+    If the total size of the cache exceeds ``maxSize``, the verdicts
+    that have not been used for the longest time are deleted.
+
+    The cache is used by :func:`buildingspy.development.regressiontest.Tester.setVerdictCache`.
+
+    Usage: Type
+
+       >>> import tempfile
+       >>> import shutil
+       >>> from buildingspy.development.verdict_cache import VerdictCache
+       >>> cacheDir = tempfile.mkdtemp()
+       >>> cache = VerdictCache(cacheDir)
+       >>> fin = VerdictCache.get_fingerprint(['dymola', 'model MyModel end MyModel;'])
+       >>> cache.has_passed(fin)
+       False
+       >>> cache.add(fin, {'model': 'MyLib.MyModel'})
+       >>> cache.has_passed(fin)
+       True
+       >>> shutil.rmtree(cacheDir)
+
+    """
+
+    # Version of the format of the fingerprints and of the cached files
+    _VERSION = 1
+
+    def __init__(self, directory, maxSize=100E6):
+        self._directory = os.path.abspath(directory)
+        self._maxSize = maxSize
+        if not os.path.isdir(self._directory):
+            os.makedirs(self._directory)
+
+    @classmethod
+    def get_fingerprint(cls, parts):
+        """ Return the fingerprint of a list of strings.
+
+        :param parts: A list of strings, such as the content of the files used by a test.
+        :return: The fingerprint, as a string of hexadecimal digits.
+        """
+        h = hashlib.sha1("{}".format(cls._VERSION).encode('utf-8'))
+        for par in parts:
+            b = par.encode('utf-8')
+            # Add the length so that different splits of the same string differ.
+            h.update("|{}|".format(len(b)).encode('utf-8'))
+            h.update(b)
+        return h.hexdigest()
+
+    def _get_file_name(self, fingerprint):
+        return os.path.join(self._directory, fingerprint + '.json')
+
+    def has_passed(self, fingerprint):
+        """ Return ``True`` if a test with the fingerprint ``fingerprint`` passed before.
+
+        :param fingerprint: The fingerprint of the test.
+        """
+        fil = self._get_file_name(fingerprint)
+        if not os.path.isfile(fil):
+            return False
+        # Mark the verdict as recently used
+        try:
+            os.utime(fil, None)
+        except OSError:
+            # The verdict has been evicted by another process in the meantime.
+            return False
+        return True
+
+    def add(self, fingerprint, info=None):
+        """ Store that the test with the fingerprint ``fingerprint`` passed.
+
+        :param fingerprint: The fingerprint of the test.
+        :param info: A dictionary with information about the test, such as the model name,
+                     which is stored for reference.
+        """
+        import tempfile
+
+        ent = {'fingerprint': fingerprint, 'timestamp': time.time(), 'info': info}
+        # Write to a temporary file first, so that concurrent readers
+        # never see a partially written file.
+        (fd, tmpFil) = tempfile.mkstemp(dir=self._directory, prefix='tmp-')
+        try:
+            with open(fd, mode="w", encoding="utf-8") as f:
+                f.write(json.dumps(ent, sort_keys=True))
+            fil = self._get_file_name(fingerprint)
+            if os.path.exists(fil):
+                os.remove(fil)
+            os.rename(tmpFil, fil)
+        except OSError:
+            # Another process added the verdict in the meantime.
+            if not os.path.isfile(self._get_file_name(fingerprint)):
+                raise
+        finally:
+            if os.path.exists(tmpFil):
+                os.remove(tmpFil)
+        self._evict()
+
+    def _evict(self):
+        """ Delete the least recently used verdicts until the size of the
+        cache is below the maximum size.
+        """
+        entries = []
+        totSiz = 0
+        for nam in os.listdir(self._directory):
+            fil = os.path.join(self._directory, nam)
+            if not nam.endswith('.json'):
+                continue
+            try:
+                sta = os.stat(fil)
+            except OSError:
+                continue
+            entries.append((sta.st_mtime, fil, sta.st_size))
+            totSiz += sta.st_size
+        for (_, fil, siz) in sorted(entries):
+            if totSiz <= self._maxSize:
+                break
+            try:
+                os.remove(fil)
+            except OSError:
+                pass
+            totSiz -= siz
+
+    def clear(self):
+        """ Delete all verdicts.
+        """
+        for nam in os.listdir(self._directory):
+            if nam.endswith('.json'):
+                os.remove(os.path.join(self._directory, nam))
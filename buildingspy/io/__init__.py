@@ -1,6 +1,11 @@
 """
 This module contains the classes
  - *Reader* that can be used to read ``*.mat`` files that have been generated by Dymola,
- - *Reporter* that can be used to report to the standard output and standard error streams, and
+ - *ResultCache* that can be used to cache ``*.mat`` files for faster reading,
+ - *ResultSet* that can be used to read the same variables from many ``*.mat`` files,
+ - *reference_results* that can be used to read and write the reference results of unit tests,
+ - *stage_directory* that can be used to link a library into a working directory,
+ - *Reporter* that can be used to report to the standard output and standard error streams,
+ - *MessageRecorder* that can be used to record messages in other processes for a *Reporter*, and
  - *Plotter* that contains method to plot results.
 """
@@ -165,18 +165,32 @@ class Reader(object):
     :param fileName: The name of the file.
     :param simulator: The file format. Currently, the only supported
                    value is ``dymola``.
+    :param lazy: If ``True``, the data blocks of the file are memory-mapped
+                 rather than read into memory, and only the values of the
+                 variables that are accessed are read from disk.
+    :param cache: An instance of :class:`buildingspy.io.resultcache.ResultCache`.
+                  If specified, the file is read from this cache, and added to
+                  the cache if it has not yet been cached.
 
     This class reads ``*.mat`` files that were generated by Dymola
     or OpenModelica.
 
+    With ``lazy=True``, opening a large result file is fast and uses little
+    memory, which is useful if only a few of the variables are needed.
+    The arrays returned by :meth:`values` are then read-only views into the file,
+    and the file stays open as long as any of these arrays is referenced.
+
     """
 
-    def __init__(self, fileName, simulator):
+    def __init__(self, fileName, simulator, lazy=False, cache=None):
         if simulator not in ['dymola', 'optimica', 'jmodelica']:
             raise ValueError('Argument "simulator" needs to be set to "dymola" or "jmodelica".')
 
         self.fileName = fileName
-        self._data_ = DyMatFile(fileName)
+        if cache is None:
+            self._data_ = DyMatFile(fileName, lazy=lazy)
+        else:
+            self._data_ = cache.open(fileName)
 
     def varNames(self, pattern=None):
         """
@@ -207,36 +221,274 @@ class Reader(object):
               >>> r.varNames('u$')
               ['PID.P.u', 'PID.gainPID.u', 'PID.limiter.u', 'gain.u', 'PID.I.u', 'PID.gainTrack.u']
 
-        """
-        import re
+           The names are looked up in an index that is built on the first call.
+           If ``pattern`` starts with ``^`` followed by literal characters,
+           only the variables that start with these characters are searched.
+           The results are cached, hence repeated calls with the same
+           ``pattern`` are fast.
 
-        AllNames = self._data_.names()
+        """
+        index = self._data_.nameIndex()
         if pattern is None:
-            return sorted(AllNames)
+            return list(index.sortedNames)
         else:
-            AllNamesFilt = []    # Filtered variable names
-            for item in AllNames:
-                if re.search(pattern, item):
-                    AllNamesFilt.append(item)
-            return AllNamesFilt
+            return index.search(pattern)
+
+    def select(self, pattern):
+        """
+           :pattern: A shell-style wildcard pattern that will be used to filter the variable names.
+           :return: A sorted list of the variable names that match ``pattern``.
+
+           Return the variables whose full name matches ``pattern``,
+           where ``*`` matches any characters,
+           ``?`` matches any single character, and
+           ``[seq]`` matches any character in ``seq``,
+           as in `Python's fnmatch module <https://docs.python.org/3/library/fnmatch.html>`_.
+           The match is case-sensitive.
 
-    def values(self, varName):
+           Usage: Type
+
+              >>> import os
+              >>> from buildingspy.io.outputfile import Reader
+              >>> resultFile = os.path.join("buildingspy", "examples", "dymola", "PlotDemo.mat")
+              >>> r=Reader(resultFile, "dymola")
+              >>> r.select('PID.I.*')
+              ['PID.I.der(y)', 'PID.I.initType', 'PID.I.k', 'PID.I.u', 'PID.I.y', 'PID.I.y_start']
+              >>> r.select('const.?')
+              ['const.k', 'const.y']
+
+        """
+        return self._data_.nameIndex().glob(pattern)
+
+    def values(self, varName, t_start=None, t_end=None):
         """Get the time and data series.
 
         :param varName: The name of the variable.
+        :param t_start: The start time of the time window, or ``None`` for the start time
+                        of the data series.
+        :param t_end: The end time of the time window, or ``None`` for the final time
+                      of the data series.
         :return: An array where the first column is time and the second
                  column is the data series.
 
+        If ``t_start`` or ``t_end`` are specified, only the values at the time stamps
+        :math:`t_{start} \\le t \\le t_{end}` are returned. These are obtained by
+        a binary search and are views of the data series, hence no data are copied.
+        For parameters, whose data series consist of the values at the start and
+        the final time, the time stamps are limited to the time window
+        and the values are unchanged.
+
         Usage: Type
            >>> import os
            >>> from buildingspy.io.outputfile import Reader
            >>> resultFile = os.path.join("buildingspy", "examples", "dymola", "PlotDemo.mat")
            >>> r=Reader(resultFile, "dymola")
            >>> (time, heatFlow) = r.values('preHea.port.Q_flow')
+           >>> (time, heatFlow) = r.values('preHea.port.Q_flow', t_start=0.5, t_end=0.6)
+           >>> print("{:.3f}, {:.3f}".format(time[0], time[-1]))
+           0.500, 0.600
+           >>> r.values('const.k', t_start=0.5, t_end=0.6)
+           (array([0.5, 0.6]), array([293.15, 293.15], dtype=float32))
         """
+        import numpy as np
+
         d = self._data_.data(varName)
         a = self._data_.abscissa(blockOrName=varName, valuesOnly=True)
-        return a, d
+        if t_start is None and t_end is None:
+            return a, d
+        if t_start is not None and t_end is not None and t_start > t_end:
+            raise ValueError('Argument t_start = {} must not be larger than t_end = {}.'.format(
+                t_start, t_end))
+        if len(a) == 2 and d[0] == d[1]:
+            # Parameter, which is constant over the whole time window
+            tMin = a[0] if t_start is None else max(a[0], t_start)
+            tMax = a[1] if t_end is None else min(a[1], t_end)
+            return np.array([tMin, tMax]), d
+        # Compare in the precision of the time stamps, which are often single precision.
+        iSta = 0 if t_start is None else np.searchsorted(
+            a, np.asarray(t_start, dtype=a.dtype), side='left')
+        iEnd = len(a) if t_end is None else np.searchsorted(
+            a, np.asarray(t_end, dtype=a.dtype), side='right')
+        return a[iSta:iEnd], d[iSta:iEnd]
+
+    def resample(self, varNames, grid):
+        """Get the data series of several variables, interpolated to a time grid.
+
+        :param varNames: A list with the names of the variables.
+        :param grid: The time stamps to which the data series are interpolated.
+        :return: A 2-D array whose ``i``-th row contains the values of ``varNames[i]``
+                 at the time stamps ``grid``.
+
+        The data series are linearly interpolated. For all variables of the same data
+        block, the intervals that contain the time stamps are found by one binary search.
+        At time stamps that occur more than once in the data series, which happens
+        at events, the value after the event is returned.
+        Outside of the time span of a data series, its first or last value is returned.
+        Parameters are hence constant.
+
+        Usage: Type
+           >>> import os
+           >>> import numpy as np
+           >>> from buildingspy.io.outputfile import Reader
+           >>> resultFile = os.path.join("buildingspy", "examples", "dymola", "PlotDemo.mat")
+           >>> r=Reader(resultFile, "dymola")
+           >>> y = r.resample(['PID.u_m', 'const.k'], np.linspace(0, 1, 5))
+           >>> y.shape
+           (2, 5)
+        """
+        import numpy as np
+
+        grid = np.asarray(grid, dtype=np.float64)
+        ret = np.empty((len(varNames), len(grid)))
+        rows = dict()
+        for iVar, var in enumerate(varNames):
+            rows.setdefault(var, []).append(iVar)
+        for (time, names, values) in self.values_many(list(rows.keys())):
+            t = np.asarray(time, dtype=np.float64)
+            if len(t) == 1:
+                y = np.repeat(values.astype(np.float64), len(grid), axis=1)
+            else:
+                # Index of the interval [t[i], t[i+1]] that contains the grid point.
+                # side='right' selects the last of repeated time stamps.
+                i = np.clip(np.searchsorted(t, grid, side='right') - 1, 0, len(t) - 2)
+                dt = t[i + 1] - t[i]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    w = np.where(dt > 0, (grid - t[i]) / dt, 1.0)
+                w = np.clip(w, 0.0, 1.0)
+                y0 = values[:, i].astype(np.float64)
+                y = y0 + w * (values[:, i + 1] - y0)
+            for iVar, var in enumerate(names):
+                ret[rows[var]] = y[iVar]
+        return ret
+
+    def values_many(self, varNames):
+        """Get the time and data series of several variables.
+
+        :param varNames: A list with the names of the variables.
+        :return: A list with one tuple ``(time, names, values)`` for each
+                 data block of the result file that contains any of the variables.
+                 ``time`` is the time series of the block,
+                 ``names`` is the list of variables of the block, and
+                 ``values`` is a 2-D array whose ``i``-th row is
+                 the data series of ``names[i]``.
+
+        This function is faster than calling :meth:`values` for each variable,
+        as the data series of all variables of the same data block are
+        extracted with one read, and the time series is extracted only once per block.
+        Parameters and time-varying variables are typically stored in different
+        blocks.
+
+        Usage: Type
+           >>> import os
+           >>> from buildingspy.io.outputfile import Reader
+           >>> resultFile = os.path.join("buildingspy", "examples", "dymola", "PlotDemo.mat")
+           >>> r=Reader(resultFile, "dymola")
+           >>> for (time, names, values) in r.values_many(['const.k', 'PID.u_s', 'PID.u_m']):
+           ...     print(names, values.shape)
+           ['const.k', 'PID.u_s'] (2, 2)
+           ['PID.u_m'] (1, 504)
+        """
+        ret = []
+        blocks = self._data_.getBlockArrays(varNames)
+        for b in sorted(blocks):
+            (names, values) = blocks[b]
+            ret.append((self._data_.abscissa(blockOrName=b, valuesOnly=True), names, values))
+        return ret
+
+    def to_dataframe(self, varNames=None):
+        """Get the data series of several variables as a pandas data frame.
+
+        :param varNames: A list with the names of the variables.
+                         If ``None``, all variables are returned.
+        :return: A ``pandas.DataFrame`` whose index is the time and
+                 that has one column for each variable.
+
+        The index is the time series of the data block that contains the most
+        time stamps. Variables of other blocks, such as parameters,
+        are linearly interpolated to this time series.
+
+        This function requires the ``pandas`` package.
+        """
+        import numpy as np
+        import pandas as pd
+
+        if varNames is None:
+            varNames = self.varNames()
+        blocks = self.values_many(varNames)
+        if len(blocks) == 0:
+            return pd.DataFrame(columns=varNames)
+        time = max(blocks, key=lambda b: len(b[0]))[0]
+        columns = dict()
+        for (t, names, values) in blocks:
+            for i, name in enumerate(names):
+                if t is time:
+                    columns[name] = values[i]
+                else:
+                    columns[name] = np.interp(time, t, values[i])
+        return pd.DataFrame(columns, index=pd.Index(time, name='time'),
+                            columns=[n for n in varNames if n in columns])
+
+    def statistics(self, varNames, stats=('min', 'max', 'mean', 'integral')):
+        """Get summary statistics of several data series.
+
+        :param varNames: A list with the names of the variables.
+        :param stats: A list with the statistics that will be computed.
+                      Allowed values are ``min``, ``max``, ``mean`` and ``integral``.
+        :return: A dictionary whose keys are the variable names, and whose values
+                 are dictionaries with the requested statistics.
+
+        The statistics of all variables of the same data block
+        are computed together with vectorized operations.
+        The integral is computed with the trapezoidal rule in double precision, where
+        time stamps that are repeated at events do not contribute to the integral.
+        The mean is the integral divided by the duration of the data series, or the
+        arithmetic mean if the duration is zero.
+        See :meth:`integral`, :meth:`mean`, :meth:`min` and :meth:`max` for the definitions.
+
+        Usage: Type
+           >>> import os
+           >>> from buildingspy.io.outputfile import Reader
+           >>> resultFile = os.path.join("buildingspy", "examples", "dymola", "PlotDemo.mat")
+           >>> r=Reader(resultFile, "dymola")
+           >>> sta = r.statistics(['preHea.port.Q_flow', 'const.k'])
+           >>> sta['preHea.port.Q_flow']['min']
+           -50.0
+           >>> sta['const.k']['mean']
+           293.1499938964844
+        """
+        import numpy as np
+
+        for sta in stats:
+            if sta not in ['min', 'max', 'mean', 'integral']:
+                raise ValueError('Statistics "{}" is not supported.'.format(sta))
+
+        ret = dict()
+        for (time, names, values) in self.values_many(varNames):
+            t = np.asarray(time, dtype=np.float64)
+            res = dict()
+            if 'min' in stats:
+                res['min'] = values.min(axis=1)
+            if 'max' in stats:
+                res['max'] = values.max(axis=1)
+            if 'mean' in stats or 'integral' in stats:
+                # Weights of the trapezoidal rule, such that the integrals
+                # of all variables are obtained by one matrix-vector product.
+                dt = np.diff(t)
+                w = np.zeros(len(t))
+                w[:-1] += dt / 2.
+                w[1:] += dt / 2.
+                integral = values.astype(np.float64).dot(w)
+                if 'integral' in stats:
+                    res['integral'] = integral
+                if 'mean' in stats:
+                    duration = t[-1] - t[0]
+                    if duration > 0:
+                        res['mean'] = integral / duration
+                    else:
+                        res['mean'] = values.astype(np.float64).mean(axis=1)
+            for iVar, var in enumerate(names):
+                ret[var] = dict((sta, float(res[sta][iVar])) for sta in stats)
+        return ret
 
     def integral(self, varName):
         """Get the integral of the data series.
@@ -255,13 +507,9 @@ class Reader(object):
            >>> resultFile = os.path.join("buildingspy", "examples", "dymola", "PlotDemo.mat")
            >>> r=Reader(resultFile, "dymola")
            >>> r.integral('preHea.port.Q_flow')
-           -21.589191160164773
+           -21.589191243613076
         """
-        (t, v) = self.values(varName)
-        val = 0.0
-        for i in range(len(t) - 1):
-            val = val + (t[i + 1] - t[i]) * (v[i + 1] + v[i]) / 2.0
-        return val
+        return self.statistics([varName], stats=['integral'])[varName]['integral']
 
     def mean(self, varName):
         """Get the mean of the data series.
@@ -285,11 +533,9 @@ class Reader(object):
            >>> resultFile = os.path.join("buildingspy", "examples", "dymola", "PlotDemo.mat")
            >>> r=Reader(resultFile, "dymola")
            >>> r.mean('preHea.port.Q_flow')
-           -21.589191160164773
+           -21.589191243613076
         """
-        t = self.values(varName)[0]
-        r = self.integral(varName) / (max(t) - min(t))
-        return r
+        return self.statistics([varName], stats=['mean'])[varName]['mean']
 
     def min(self, varName):
         """Get the minimum of the data series.
@@ -308,8 +554,7 @@ class Reader(object):
            >>> r.min('preHea.port.Q_flow')
            -50.0
         """
-        v = self.values(varName)[1]
-        return min(v)
+        return self.statistics([varName], stats=['min'])[varName]['min']
 
     def max(self, varName):
         """Get the maximum of the data series.
@@ -326,7 +571,6 @@ class Reader(object):
            >>> resultFile = os.path.join("buildingspy", "examples", "dymola", "PlotDemo.mat")
            >>> r=Reader(resultFile, "dymola")
            >>> r.max('preHea.port.Q_flow')
-           -11.284342
+           -11.284341812133789
         """
-        v = self.values(varName)[1]
-        return max(v)
+        return self.statistics([varName], stats=['max'])[varName]['max']
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# import from future to make Python2 behave like Python3
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from io import open
+# end of from future import
+
+import ast
+import json
+import os
+import re
+
+import numpy as np
+
+# Formats of the reference results, which are also the extensions of the files
+FORMATS = ['txt', 'npz']
+
+# Non-significant zeros of a number in exponential notation, and the decimal
+# point if all decimals are zero, such as '.000e' in '1.000e+00'
+_ZEROS = re.compile(r'\.?0*e')
+
+# Name of the array with the metadata in the binary format
+_METADATA = '__metadata__'
+# Version of the binary format
+_VERSION = 1
+
+
+def format_values(values):
+    """ Return a string with the values, as written to the reference results.
+
+    :param values: A list or a numpy array with the values.
+    :return: A string such as ``[1e+00, 2.5e+00]``, where each value is in
+             exponential notation with 16 significant digits,
+             and non-significant zeros are removed.
+
+    Usage: Type
+
+       >>> from buildingspy.io.reference_results import format_values
+       >>> format_values([1, 0.5, -2.25E-3])
+       '[1e+00, 5e-01, -2.25e-03]'
+
+    """
+    formatted = ', '.join(['%.15e' % v for v in np.asarray(values, dtype=float).tolist()])
+    return '[' + _ZEROS.sub('e', formatted) + ']'
+
+
+def _get_format(fileName):
+    """ Return the format of the file ``fileName``, based on its extension.
+    """
+    fmt = os.path.splitext(fileName)[1][1:].lower()
+    if fmt not in FORMATS:
+        raise ValueError("File '{}' must have the extension '.txt' or '.npz'.".format(fileName))
+    return fmt
+
+
+def _read_text(fileName):
+    """ Read reference results in the text format.
+    """
+    with open(fileName, mode="r", encoding="utf-8-sig") as f:
+        lines = f.read().splitlines()
+
+    # The first lines may contain the svn id and the date when the file was generated.
+    iSta = 0
+    for iLin in range(min(2, len(lines))):
+        if "svn-id" in lines[iLin] or "last-generated" in lines[iLin]:
+            iSta = iSta + 1
+
+    statistics = dict()
+    results = dict()
+    iLin = iSta
+    while iLin < len(lines):
+        (key, value) = lines[iLin].split("=")
+        if key.startswith("statistics-"):
+            # The json string was pretty printed over several lines.
+            # Add to value the next line, unless it contains "=" or it does not exist.
+            value = value.strip()
+            while (iLin < len(lines) - 1 and lines[iLin + 1].find('=') == -1):
+                value = value + lines[iLin + 1].strip()
+                iLin += 1
+            statistics[key[len("statistics-"):]] = ast.literal_eval(value)
+        else:
+            s = value[value.find('[') + 1: value.rfind(']')]
+            # Convert all numbers at once, which raises a ValueError for invalid numbers.
+            results[key] = np.array(s.split(','), dtype=np.float64)
+        iLin += 1
+    return {'header': lines[:iSta], 'statistics': statistics, 'results': results}
+
+
+def _write_text(fileName, header, statistics, results):
+    """ Write reference results in the text format.
+    """
+    with open(fileName, mode="w", encoding="utf-8") as f:
+        for lin in header:
+            f.write(lin + '\n')
+        for (stage, value) in statistics.items():
+            f.write('statistics-%s=\n%s\n' % (stage, json.dumps(value,
+                                                                indent=2,
+                                                                separators=(',', ': '),
+                                                                sort_keys=True)))
+        for (key, value) in results.items():
+            # Use many digits, otherwise truncation errors occur that can be higher
+            # than the required accuracy.
+            f.write(key + '=' + format_values(value) + '\n')
+
+
+def _read_binary(fileName):
+    """ Read reference results in the binary format.
+    """
+    with np.load(fileName, allow_pickle=False) as npz:
+        metadata = json.loads(str(npz[_METADATA]))
+        if metadata['version'] > _VERSION:
+            raise ValueError("File '{}' has version {}, but only version {} is supported.".format(
+                fileName, metadata['version'], _VERSION))
+        results = dict()
+        for (i, key) in enumerate(metadata['variables']):
+            results[key] = npz['v{}'.format(i)]
+    return {'header': metadata['header'],
+            'statistics': metadata['statistics'],
+            'results': results}
+
+
+def _write_binary(fileName, header, statistics, results):
+    """ Write reference results in the binary format.
+    """
+    # The variable names are stored in the metadata, as they may not be valid
+    # names of the files in the archive.
+    metadata = {'version': _VERSION,
+                'header': header,
+                'statistics': statistics,
+                'variables': list(results.keys())}
+    arrays = dict([('v{}'.format(i), np.asarray(value, dtype=np.float64))
+                   for (i, value) in enumerate(results.values())])
+    arrays[_METADATA] = np.array(json.dumps(metadata, sort_keys=True))
+    # Use a file object, as otherwise numpy adds the extension .npz to the file name.
+    with open(fileName, mode="wb") as f:
+        np.savez_compressed(f, **arrays)
+
+
+def read(fileName):
+    """ Read reference results.
+
+    :param fileName: The name of the file, with extension ``.txt`` or ``.npz``.
+    :return: A dictionary with the keys ``header``, which is a list with the first lines
+             of the text format, such as ``last-generated=2020-06-01``,
+             ``statistics``, which is a dictionary with the simulation statistics, such as
+             ``{'simulation': {'nonlinear': '1, 1', 'linear': '0, 0'}}``,
+             and ``results``, which is a dictionary with the variable names as keys
+             and numpy arrays with their values.
+
+    A ``ValueError`` is raised if the file cannot be parsed.
+    """
+    if _get_format(fileName) == 'npz':
+        return _read_binary(fileName)
+    else:
+        return _read_text(fileName)
+
+
+def write(fileName, results, statistics=None, header=None):
+    """ Write reference results.
+
+    :param fileName: The name of the file. If the extension is ``.txt``, the file is
+                     written in the text format, with one line per variable.
+                     If the extension is ``.npz``, the file is written in a compressed
+                     binary format of numpy.
+    :param results: A dictionary with the variable names as keys and lists or
+                    numpy arrays with their values.
+    :param statistics: A dictionary with the simulation statistics.
+    :param header: A list with the first lines of the text format, or ``None``
+                   to write the date of today.
+
+    Both formats store the same information. Hence, a file that is written
+    in one format and converted with :func:`convert` to the other format
+    has the same content after it is converted back.
+
+    Usage: Type
+
+       >>> import os
+       >>> import tempfile
+       >>> import shutil
+       >>> from buildingspy.io.reference_results import read, write
+       >>> tmpDir = tempfile.mkdtemp()
+       >>> fileName = os.path.join(tmpDir, "MyLibrary_Examples_MyModel.npz")
+       >>> write(fileName, {'time': [0, 3600], 'x': [1.5, 2, 2.5]},
+       ...       statistics={'simulation': {'nonlinear': '1, 1'}})
+       >>> ref = read(fileName)
+       >>> print(ref['results']['x'])
+       [1.5 2.  2.5]
+       >>> print(ref['statistics']['simulation']['nonlinear'])
+       1, 1
+       >>> shutil.rmtree(tmpDir)
+
+    """
+    from datetime import date
+
+    if statistics is None:
+        statistics = dict()
+    if header is None:
+        header = ['last-generated=' + str(date.today())]
+    if _get_format(fileName) == 'npz':
+        _write_binary(fileName, header, statistics, results)
+    else:
+        _write_text(fileName, header, statistics, results)
+
+
+def convert(src, dst):
+    """ Convert reference results to another format.
+
+    :param src: The name of the file to be converted.
+    :param dst: The name of the converted file. Its extension determines the format.
+
+    For example, to convert all reference results of a library to the binary format, type
+
+    .. code-block:: python
+
+        import glob
+        import os
+        from buildingspy.io.reference_results import convert
+        for fil in glob.glob(os.path.join("Resources", "ReferenceResults", "Dymola", "*.txt")):
+            convert(fil, os.path.splitext(fil)[0] + ".npz")
+            os.remove(fil)
+
+    """
+    ref = read(src)
+    write(dst, ref['results'], statistics=ref['statistics'], header=ref['header'])
@@ -13,9 +13,31 @@ from io import open
 # end of from future import
 
 
+import atexit
+import json
+import time
+import weakref
+
+# Reporters whose buffers are written to their log files when the interpreter exits
+_REPORTERS = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all():
+    for rep in list(_REPORTERS):
+        try:
+            rep.flush()
+        except (IOError, OSError):
+            # The directory of the log file has been deleted.
+            pass
+
+
 class Reporter(object):
     """ Class that is used to report errors.
     """
+    # Number of buffered messages and time in seconds after which the buffer is written
+    _MAX_BUFFER = 1000
+    _FLUSH_INTERVAL = 1.0
 
     def __init__(self, fileName):
         """ Construct a reporter.
@@ -24,21 +46,50 @@ class Reporter(object):
 
         This class writes the standard output stream and the
         standard error stream to the file ``fileName``.
+
+        Error messages are written to the file ``fileName`` immediately.
+        Other messages are buffered and written if
+        1000 messages are buffered, if the last write was more than one second ago,
+        if :meth:`flush` is called, if the reporter is deleted,
+        and when the Python interpreter exits.
         """
         import os
 
         self._logToFile = True
+        self._structured = False
         self._verbose = True
         self._iWar = 0
         self._iErr = 0
+        self._buffer = []
+        self._lastFlush = time.time()
         self.logToFile()
         self._logFil = os.path.join(fileName)
         self.deleteLogFile()
+        _REPORTERS.add(self)
+
+    def __getstate__(self):
+        # The buffered messages are written by this instance, and not by copies
+        # in other processes.
+        state = self.__dict__.copy()
+        state['_buffer'] = []
+        return state
+
+    def __del__(self):
+        # Write the buffered messages if the reporter is deleted before the
+        # interpreter exits, such as in a function or in a worker process.
+        try:
+            self.flush()
+        except (IOError, OSError):
+            # The directory of the log file has been deleted.
+            pass
 
     def deleteLogFile(self):
         """ Deletes the log file if it exists.
+
+        Messages that have not yet been written to the log file are discarded.
         """
         import os
+        self._buffer = []
         if os.path.isfile(self._logFil):
             os.remove(self._logFil)
 
@@ -53,6 +104,27 @@ class Reporter(object):
         """
         self._logToFile = log
 
+    def logStructured(self, structured=True):
+        """ Function to write the log file in the JSON Lines format.
+
+        :param structured: If ``True``, then each message is written to the log file as one line
+                           with a JSON object with the keys ``severity``, which is ``error``,
+                           ``warning`` or ``output``, ``message``, ``model`` and ``category``.
+
+        The default setting is ``False``, in which case the messages are written as text.
+        """
+        self.flush()
+        self._structured = structured
+
+    def flush(self):
+        """ Writes the buffered messages to the log file.
+        """
+        if len(self._buffer) > 0:
+            with open(self._logFil, mode="a", encoding="utf-8") as fil:
+                fil.write("".join(self._buffer))
+            self._buffer = []
+        self._lastFlush = time.time()
+
     def getNumberOfErrors(self):
         """ Returns the number of error messages that were written.
 
@@ -67,33 +139,41 @@ class Reporter(object):
         """
         return self._iWar
 
-    def writeError(self, message):
+    def writeError(self, message, model=None, category=None):
         """ Writes an error message.
 
         :param message: The message to be written.
+        :param model: The name of the model the message refers to, or ``None``.
+        :param category: The category of the message, such as ``numerical Jacobians``, or ``None``.
 
         Note that this method adds a new line character at the end of the message.
+        The model and the category are only written to the structured log file.
         """
         self._iErr += 1
-        self._writeErrorOrWarning(True, message)
+        self._writeErrorOrWarning(True, message, model, category)
         return
 
-    def writeWarning(self, message):
+    def writeWarning(self, message, model=None, category=None):
         """ Writes a warning message.
 
         :param message: The message to be written.
+        :param model: The name of the model the message refers to, or ``None``.
+        :param category: The category of the message, such as ``numerical Jacobians``, or ``None``.
 
         Note that this method adds a new line character at the end of the message.
+        The model and the category are only written to the structured log file.
         """
         self._iWar += 1
-        self._writeErrorOrWarning(False, message)
+        self._writeErrorOrWarning(False, message, model, category)
         return
 
-    def _writeErrorOrWarning(self, isError, message):
+    def _writeErrorOrWarning(self, isError, message, model=None, category=None):
         """ Writes an error message or a warning message.
 
         :param isError: Set to 'True' if an error should be written, or 'False' for a warning.
         :param message: The message to be written.
+        :param model: The name of the model the message refers to, or ``None``.
+        :param category: The category of the message, or ``None``.
 
         Note that this method adds a new line character at the end of the message.
         """
@@ -107,23 +187,147 @@ class Reporter(object):
                 msg += "*** Warning: "
         msg += message + "\n"
         sys.stderr.write(msg)
-        if self._logToFile:
-            with open(self._logFil, mode="a", encoding="utf-8") as fil:
-                fil.write(msg)
+        self._log('error' if isError else 'warning', msg, message, model, category)
         return
 
-    def writeOutput(self, message):
+    def writeOutput(self, message, model=None, category=None):
         """ Writes a message to the standard output.
 
         :param message: The message to be written.
+        :param model: The name of the model the message refers to, or ``None``.
+        :param category: The category of the message, or ``None``.
 
         Note that this method adds a new line character at the end of the message.
         """
         import sys
 
         msg = message + "\n"
-        if self._logToFile:
-            with open(self._logFil, mode="a", encoding="utf-8") as fil:
-                fil.write(msg)
+        self._log('output', msg, message, model, category)
         sys.stdout.write(msg)
         return
+
+    def writeRecords(self, records):
+        """ Writes messages that were recorded by a :class:`MessageRecorder`.
+
+        :param records: A list with the records of :attr:`MessageRecorder.records`.
+
+        The messages are written, and counted, as if they had been written with this reporter.
+        """
+        for rec in records:
+            getattr(self, rec['method'])(rec['message'],
+                                         model=rec['model'],
+                                         category=rec['category'])
+
+    def readQueue(self, queue):
+        """ Writes the messages that a :class:`MessageRecorder` has put on a queue.
+
+        :param queue: The queue of the :class:`MessageRecorder`, such as
+                      a ``multiprocessing.Queue``.
+        :return: The number of messages that were written.
+
+        This method writes the messages that are on the queue, and it does not wait
+        for further messages.
+        """
+        from queue import Empty
+
+        records = []
+        while True:
+            try:
+                records.append(queue.get_nowait())
+            except Empty:
+                break
+        self.writeRecords(records)
+        return len(records)
+
+    def _log(self, severity, msg, message, model, category):
+        """ Adds a message to the buffer of the log file, and writes the buffer if needed.
+        """
+        if not self._logToFile:
+            return
+        if self._structured:
+            self._buffer.append(json.dumps({'severity': severity,
+                                            'message': message,
+                                            'model': model,
+                                            'category': category}, sort_keys=True) + "\n")
+        else:
+            self._buffer.append(msg)
+        if severity == 'error' or len(self._buffer) >= self._MAX_BUFFER or \
+                time.time() - self._lastFlush >= self._FLUSH_INTERVAL:
+            self.flush()
+
+
+class MessageRecorder(object):
+    """ Class that records the messages of a :class:`Reporter` so that
+    they can be written later, or by another process, with
+    :meth:`Reporter.writeRecords` or :meth:`Reporter.readQueue`.
+
+    :param queue: A queue, such as a ``multiprocessing.Queue``, on which the records
+                  are put, or ``None`` to store the records in the list :attr:`records`.
+    :param model: The name of the model of the messages that are written without a model,
+                  or ``None``.
+
+    Each record is a dictionary with the keys ``method``, which is the name of
+    the method of :class:`Reporter` that writes the message, ``message``,
+    ``model`` and ``category``.
+
+    Usage: Type
+
+       >>> import os
+       >>> import tempfile
+       >>> import shutil
+       >>> from buildingspy.io.reporter import MessageRecorder, Reporter
+       >>> rec = MessageRecorder()
+       >>> rec.writeWarning("Variable x not found.", model="MyLib.MyModel")
+       >>> tmpDir = tempfile.mkdtemp()
+       >>> rep = Reporter(os.path.join(tmpDir, "unitTests.log"))
+       >>> rep.writeRecords(rec.records)
+       >>> rep.getNumberOfWarnings()
+       1
+       >>> rep.flush()
+       >>> shutil.rmtree(tmpDir)
+
+    """
+
+    def __init__(self, queue=None, model=None):
+        self._queue = queue
+        self._model = model
+        self._iWar = 0
+        self._iErr = 0
+        self.records = []
+
+    def _record(self, method, message, model, category):
+        rec = {'method': method,
+               'message': message,
+               'model': self._model if model is None else model,
+               'category': category}
+        if self._queue is None:
+            self.records.append(rec)
+        else:
+            self._queue.put(rec)
+
+    def getNumberOfErrors(self):
+        """ Returns the number of error messages that were recorded.
+        """
+        return self._iErr
+
+    def getNumberOfWarnings(self):
+        """ Returns the number of warning messages that were recorded.
+        """
+        return self._iWar
+
+    def writeError(self, message, model=None, category=None):
+        """ Records an error message, see :meth:`Reporter.writeError`.
+        """
+        self._iErr += 1
+        self._record('writeError', message, model, category)
+
+    def writeWarning(self, message, model=None, category=None):
+        """ Records a warning message, see :meth:`Reporter.writeWarning`.
+        """
+        self._iWar += 1
+        self._record('writeWarning', message, model, category)
+
+    def writeOutput(self, message, model=None, category=None):
+        """ Records a message to the standard output, see :meth:`Reporter.writeOutput`.
+        """
+        self._record('writeOutput', message, model, category)
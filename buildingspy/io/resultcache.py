@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# import from future to make Python2 behave like Python3
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from io import open
+# end of from future import
+
+import os
+import shutil
+
+
+class ResultCache(object):
+    """ Class that caches result files in a columnar format for fast reading.
+
+    :param directory: The directory in which the cached files are stored.
+    :param maxSize: The maximum size of the cache in bytes.
+
+    When a result file is opened for the first time, it is converted to a
+    directory in ``directory`` that contains one ``*.npy`` file for each
+    data block of the result file, in which the values of each variable
+    are stored contiguously.
+    Later opens of the same result file memory-map these files,
+    which avoids parsing the result file, and only reads the values of the
+    variables that are accessed.
+
+    A cached file is identified by the absolute path, the modification time
+    and the size of the result file. Hence, if a result file is overwritten,
+    it is converted again when it is opened next.
+    If the total size of the cache exceeds ``maxSize``, the cached files
+    that have not been opened for the longest time are deleted.
+
+    The cache is used by passing it to :class:`buildingspy.io.outputfile.Reader`.
+
+    Usage: Type
+
+       >>> import os
+       >>> import tempfile
+       >>> import shutil
+       >>> from buildingspy.io.outputfile import Reader
+       >>> from buildingspy.io.resultcache import ResultCache
+       >>> cacheDir = tempfile.mkdtemp()
+       >>> cache = ResultCache(cacheDir)
+       >>> resultFile = os.path.join("buildingspy", "examples", "dymola", "PlotDemo.mat")
+       >>> r = Reader(resultFile, "dymola", cache=cache) # converts the file
+       >>> r = Reader(resultFile, "dymola", cache=cache) # memory-maps the cached file
+       >>> r.max('preHea.port.Q_flow')
+       -11.284341812133789
+       >>> del r
+       >>> shutil.rmtree(cacheDir)
+
+    """
+
+    # Version of the format of the cached files
+    _VERSION = 1
+
+    def __init__(self, directory, maxSize=10E9):
+        self._directory = os.path.abspath(directory)
+        self._maxSize = maxSize
+        if not os.path.isdir(self._directory):
+            os.makedirs(self._directory)
+
+    def _get_key(self, fileName):
+        """ Return the name of the cache entry of the file ``fileName``.
+        """
+        import hashlib
+
+        sta = os.stat(fileName)
+        s = "{}|{}|{}|{}".format(self._VERSION,
+                                 os.path.abspath(fileName), repr(sta.st_mtime), sta.st_size)
+        return hashlib.sha1(s.encode('utf-8')).hexdigest()
+
+    def open(self, fileName):
+        """ Return a :class:`DyMatFile` of the result file ``fileName``.
+
+        :param fileName: The name of the result file.
+
+        If the file is not yet in the cache, it is converted and added to the cache.
+        """
+        import numpy as np
+        from buildingspy.thirdParty.dymat.DyMat import DyMatFile
+
+        entry = os.path.join(self._directory, self._get_key(fileName))
+        if not os.path.isdir(entry):
+            self._add(fileName, entry)
+            self._evict(keep=entry)
+        # Mark the entry as recently used
+        os.utime(entry, None)
+        mat = dict()
+        for fil in os.listdir(entry):
+            (nam, ext) = os.path.splitext(fil)
+            if nam.startswith('data'):
+                mat[nam] = np.load(os.path.join(entry, fil), mmap_mode='r')
+            else:
+                mat[nam] = np.load(os.path.join(entry, fil))
+        return DyMatFile(fileName, mat=mat)
+
+    def _add(self, fileName, entry):
+        """ Convert the result file ``fileName`` and store it in the directory ``entry``.
+        """
+        import tempfile
+        import numpy as np
+        from buildingspy.thirdParty.dymat.DyMat import DyMatFile
+
+        mat = DyMatFile(fileName, lazy=True).normalizedMat()
+        # Write to a temporary directory first, so that concurrent readers
+        # never see a partially written entry.
+        tmpDir = tempfile.mkdtemp(dir=self._directory, prefix='tmp-')
+        try:
+            for (nam, val) in mat.items():
+                fil = os.path.join(tmpDir, nam + '.npy')
+                if nam.startswith('data'):
+                    # Copy by chunks of time steps, as the block may be larger than the memory.
+                    out = np.lib.format.open_memmap(fil, mode='w+', dtype=val.dtype,
+                                                    shape=val.shape)
+                    nChu = max(1, 2**24 // max(1, val.shape[0]))
+                    for i in range(0, val.shape[1], nChu):
+                        out[:, i:i + nChu] = val[:, i:i + nChu]
+                    out.flush()
+                    del out
+                else:
+                    np.save(fil, val)
+            try:
+                os.rename(tmpDir, entry)
+            except OSError:
+                # Another process added the entry in the meantime.
+                if not os.path.isdir(entry):
+                    raise
+        finally:
+            if os.path.isdir(tmpDir):
+                shutil.rmtree(tmpDir, ignore_errors=True)
+
+    def _evict(self, keep=None):
+        """ Delete the least recently used entries until the size of the
+        cache is below the maximum size.
+
+        :param keep: The name of an entry that will not be deleted.
+        """
+        entries = []
+        totSiz = 0
+        for nam in os.listdir(self._directory):
+            entry = os.path.join(self._directory, nam)
+            if not os.path.isdir(entry) or nam.startswith('tmp-'):
+                continue
+            siz = sum([os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry)])
+            entries.append((os.path.getmtime(entry), entry, siz))
+            totSiz += siz
+        for (_, entry, siz) in sorted(entries):
+            if totSiz <= self._maxSize:
+                break
+            if entry != keep:
+                shutil.rmtree(entry, ignore_errors=True)
+                totSiz -= siz
+
+    def clear(self):
+        """ Delete all cached files.
+        """
+        for nam in os.listdir(self._directory):
+            entry = os.path.join(self._directory, nam)
+            if os.path.isdir(entry):
+                shutil.rmtree(entry, ignore_errors=True)
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# import from future to make Python2 behave like Python3
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from io import open
+# end of from future import
+
+
+def _resample(args):
+    """ Return the values of the variables of one result file on the time grid.
+
+    This function is used by the process pool of :class:`ResultSet`.
+    """
+    from buildingspy.io.outputfile import Reader
+
+    (fileName, simulator, varNames, grid) = args
+    r = Reader(fileName, simulator, lazy=True)
+    return r.resample(varNames, grid)
+
+
+class ResultSet(object):
+    """ Class that reads the same variables from many result files.
+
+    :param fileNames: A list with the names of the result files, or a pattern
+                      such as ``sweep/*/*.mat`` that is expanded with Python's ``glob`` module.
+    :param simulator: The file format, see :class:`buildingspy.io.outputfile.Reader`.
+
+    This class can be used to postprocess parameter sweeps, which produce
+    many result files of the same model. The values of the variables are interpolated to a
+    common time grid, and stored in one array whose dimensions are the result files,
+    the variables and the time grid.
+    The result files are read in parallel.
+    If the array is too large for the memory, it can be stored in a file,
+    and the ensemble statistics are computed for a few time stamps at a time.
+
+    Usage: Type
+
+       >>> import os
+       >>> import numpy as np
+       >>> from buildingspy.io.resultset import ResultSet
+       >>> rs = ResultSet(os.path.join("buildingspy", "examples", "dymola", "case*", "*.mat"))
+       >>> len(rs.fileNames)
+       2
+       >>> y = rs.load(['Q_flow.Q_flow', 'con.eOn'], np.linspace(0, 86400, 25), nPro=1)
+       >>> y.shape
+       (2, 2, 25)
+       >>> sta = rs.statistics(percentiles=[50])
+       >>> sta['mean'].shape
+       (2, 25)
+
+    """
+
+    def __init__(self, fileNames, simulator="dymola"):
+        import glob
+
+        if isinstance(fileNames, str):
+            fileNames = sorted(glob.glob(fileNames))
+        if len(fileNames) == 0:
+            raise ValueError("Argument 'fileNames' must contain at least one result file.")
+        self.fileNames = list(fileNames)
+        self._simulator = simulator
+        self._values = None
+        self._varNames = None
+        self._grid = None
+
+    def load(self, varNames, grid, nPro=0, dataFile=None):
+        """ Read the variables from all result files.
+
+        :param varNames: A list with the names of the variables.
+        :param grid: The time stamps to which the data series are interpolated.
+        :param nPro: The number of processes used to read the files.
+                     If ``0``, the number of processors is used.
+        :param dataFile: The name of a file in which the values are stored,
+                         or ``None`` to keep them in memory.
+        :return: An array of dimension ``(len(fileNames), len(varNames), len(grid))``.
+
+        The data series are interpolated with
+        :meth:`buildingspy.io.outputfile.Reader.resample`.
+        If ``dataFile`` is specified, the returned array is a memory-map of this file,
+        hence only the results of a few files are in memory at any time.
+        The file is overwritten if it exists.
+        """
+        import multiprocessing
+        import numpy as np
+
+        grid = np.asarray(grid, dtype=np.float64)
+        varNames = list(varNames)
+        shape = (len(self.fileNames), len(varNames), len(grid))
+        if dataFile is None:
+            values = np.empty(shape)
+        else:
+            values = np.lib.format.open_memmap(dataFile, mode='w+', dtype=np.float64,
+                                               shape=shape)
+
+        args = [(fil, self._simulator, varNames, grid) for fil in self.fileNames]
+        if nPro == 0:
+            nPro = multiprocessing.cpu_count()
+        nPro = min(nPro, len(args))
+        if nPro > 1:
+            pool = multiprocessing.Pool(processes=nPro)
+            try:
+                # imap returns the results in order, and only keeps
+                # a few results in memory.
+                for iFil, y in enumerate(pool.imap(_resample, args)):
+                    values[iFil] = y
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            for iFil, arg in enumerate(args):
+                values[iFil] = _resample(arg)
+        if dataFile is not None:
+            values.flush()
+
+        self._values = values
+        self._varNames = varNames
+        self._grid = grid
+        return values
+
+    def values(self):
+        """ Return the array with the values of all result files.
+
+        :return: The array returned by :meth:`load`.
+        """
+        self._check_loaded()
+        return self._values
+
+    def statistics(self, stats=('mean', 'min', 'max'), percentiles=(), chunkSize=None):
+        """ Return statistics over all result files.
+
+        :param stats: A list with the statistics. Allowed values are
+                      ``mean``, ``std``, ``min`` and ``max``.
+        :param percentiles: A list with the percentiles, between ``0`` and ``100``.
+        :param chunkSize: The number of time stamps that are processed at once,
+                          or ``None`` to limit the memory to about 64 MB.
+        :return: A dictionary whose keys are the elements of ``stats`` and ``percentiles``,
+                 and whose values are arrays of dimension ``(len(varNames), len(grid))``.
+
+        The statistics are computed for each variable and each time stamp
+        over all result files. The percentiles are computed with linear interpolation
+        between the values of the result files.
+        The values are processed in chunks of time stamps, hence only one chunk
+        of the values needs to be in memory if they are stored in a file.
+        """
+        import numpy as np
+
+        self._check_loaded()
+        fun = {'mean': np.mean,
+               'std': np.std,
+               'min': np.min,
+               'max': np.max}
+        for sta in stats:
+            if sta not in fun:
+                raise ValueError('Statistics "{}" is not supported.'.format(sta))
+        for per in percentiles:
+            if per < 0 or per > 100:
+                raise ValueError('Percentile {} must be between 0 and 100.'.format(per))
+
+        (nFil, nVar, nGri) = self._values.shape
+        if chunkSize is None:
+            chunkSize = max(1, 2**23 // max(1, nFil * nVar))
+        ret = dict()
+        for key in list(stats) + list(percentiles):
+            ret[key] = np.empty((nVar, nGri))
+        for iSta in range(0, nGri, chunkSize):
+            chu = np.asarray(self._values[:, :, iSta:iSta + chunkSize])
+            for sta in stats:
+                ret[sta][:, iSta:iSta + chunkSize] = fun[sta](chu, axis=0)
+            if len(percentiles) > 0:
+                per = np.percentile(chu, list(percentiles), axis=0)
+                for iPer, key in enumerate(percentiles):
+                    ret[key][:, iSta:iSta + chunkSize] = per[iPer]
+        return ret
+
+    def varNames(self):
+        """ Return the names of the variables that were loaded.
+        """
+        self._check_loaded()
+        return list(self._varNames)
+
+    def grid(self):
+        """ Return the time grid of the values that were loaded.
+        """
+        self._check_loaded()
+        return self._grid
+
+    def _check_loaded(self):
+        if self._values is None:
+            raise ValueError("The results have not been loaded. Call 'load' first.")
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# import from future to make Python2 behave like Python3
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from io import open
+# end of from future import
+
+import fnmatch
+import os
+import shutil
+import time
+
+# Files that simulators write to their working directory. If such files are in
+# the source directory, they are copied rather than linked, as the simulator may
+# overwrite them. They include all files that are deleted by
+# buildingspy.simulate.Simulator.deleteOutputFiles and deleteLogFiles.
+WRITABLE_PATTERNS = ['*.mat', '*.log', '*.fmu', 'ds*.txt', 'dsmodel*', 'dymosim*',
+                     'buildlog.txt', 'request.', 'status', 'failure', 'stop', 'run*.mos']
+
+# Request code of the ioctl that clones a file on Linux file systems such as btrfs and xfs
+_FICLONE = 0x40049409
+
+
+def _reflink(src, dst):
+    """ Clone the file ``src`` to ``dst`` so that both share their data until one is modified.
+
+    Raises an ``OSError`` if the file system does not support cloning.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError("Cloning files is not supported on this platform.")
+    try:
+        with open(src, mode="rb") as fSrc:
+            with open(dst, mode="wb") as fDst:
+                fcntl.ioctl(fDst.fileno(), _FICLONE, fSrc.fileno())
+    except (IOError, OSError):
+        if os.path.exists(dst):
+            os.remove(dst)
+        raise OSError("Failed to clone '{}'.".format(src))
+    shutil.copystat(src, dst)
+
+
+def stage_directory(src, dst, ignore=None, writable=WRITABLE_PATTERNS, method='auto'):
+    """ Create the directory ``dst`` with the same files as the directory ``src``.
+
+    :param src: The source directory.
+    :param dst: The directory to be created, which must not exist.
+    :param ignore: A list of shell-style patterns, such as ``'.git'`` or ``'*.mat'``,
+                   of files and directories that are not staged.
+    :param writable: A list of shell-style patterns of files that are copied rather
+                     than linked, because they may be modified in ``dst``.
+    :param method: The method used to stage the files, which is
+                   ``hardlink``, ``reflink``, ``symlink``, ``copy`` or ``auto``.
+    :return: A dictionary with the keys ``linked`` and ``copied``, which contain the
+             number of linked and copied files, and ``time``, which contains the time
+             in seconds that it took to stage the directory.
+
+    Rather than copying the files, this function can create a hard link, a clone that
+    shares the data with the source until it is modified (reflink),
+    or a symbolic link for each file.
+    The directories are always created, hence new files that are written in ``dst``
+    are not added to ``src``.
+    Files that match ``writable`` are cloned if the file system supports it,
+    and copied otherwise.
+    With ``hardlink`` and ``symlink``, modifying any other file in ``dst`` modifies the
+    file in ``src``. Hence, files that may be modified need to be in ``writable``,
+    or they need to be deleted before they are written.
+
+    For ``auto``, files are hard linked, and copied if this is not possible,
+    for example if ``src`` and ``dst`` are on different file systems.
+    For ``hardlink``, ``reflink`` and ``symlink``, an ``OSError`` is raised if a file
+    cannot be staged with this method.
+
+    Usage: Type
+
+       >>> import os
+       >>> import shutil
+       >>> import tempfile
+       >>> from buildingspy.io.staging import stage_directory
+       >>> dstDir = os.path.join(tempfile.mkdtemp(), "MyModelicaLibrary")
+       >>> sta = stage_directory(os.path.join("buildingspy", "tests", "MyModelicaLibrary"),
+       ...                       dstDir, ignore=['.svn', '.git'])
+       >>> os.path.isfile(os.path.join(dstDir, "package.mo"))
+       True
+       >>> shutil.rmtree(os.path.dirname(dstDir))
+
+    """
+    if method not in ['auto', 'hardlink', 'reflink', 'symlink', 'copy']:
+        raise ValueError(
+            "Argument 'method' must be 'auto', 'hardlink', 'reflink', 'symlink' or 'copy'."
+            " Received '{}'.".format(method))
+    if ignore is None:
+        ignore = []
+    if writable is None:
+        writable = []
+
+    def matches(name, patterns):
+        return any([fnmatch.fnmatch(name, p) for p in patterns])
+
+    def copy(s, d):
+        if method != 'copy':
+            try:
+                _reflink(s, d)
+                return
+            except OSError:
+                pass
+        shutil.copy2(s, d)
+
+    staTim = time.time()
+    src = os.path.abspath(src)
+    nLin = 0
+    nCop = 0
+    for root, dirs, files in os.walk(src):
+        dirs[:] = [d for d in dirs if not matches(d, ignore)]
+        dstRoot = os.path.join(dst, os.path.relpath(root, src))
+        os.makedirs(dstRoot)
+        for fil in files:
+            if matches(fil, ignore):
+                continue
+            s = os.path.join(root, fil)
+            d = os.path.join(dstRoot, fil)
+            if os.path.islink(s):
+                # Keep symbolic links, as shutil.copytree with symlinks=True
+                os.symlink(os.readlink(s), d)
+                nCop += 1
+            elif method == 'copy' or matches(fil, writable):
+                copy(s, d)
+                nCop += 1
+            elif method == 'reflink':
+                _reflink(s, d)
+                nLin += 1
+            elif method == 'symlink':
+                os.symlink(s, d)
+                nLin += 1
+            else:
+                try:
+                    os.link(s, d)
+                    nLin += 1
+                except (AttributeError, OSError):
+                    # Hard links are not supported, or src and dst are on different devices
+                    if method == 'hardlink':
+                        raise
+                    copy(s, d)
+                    nCop += 1
+    return {'linked': nLin, 'copied': nCop, 'time': time.time() - staTim}
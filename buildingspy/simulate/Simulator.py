@@ -403,8 +403,9 @@ simulateModel(modelInstance, startTime={start_time}, stopTime={stop_time}, metho
 
         This method
           1. Deletes dymola output files
-          2. Copies the current directory, or the directory specified by the ``packagePath``
-             parameter of the constructor, to a temporary directory.
+          2. Stages the current directory, or the directory specified by the ``packagePath``
+             parameter of the constructor, in a temporary directory, using
+             :func:`buildingspy.io.staging.stage_directory`.
           3. Writes a Modelica script to the temporary directory.
           4. Starts the Modelica simulation environment from the temporary directory.
           5. Translates and simulates the model.
@@ -417,7 +418,7 @@ simulateModel(modelInstance, startTime={start_time}, stopTime={stop_time}, metho
 
         """
         import os
-        import shutil
+        from buildingspy.io.staging import stage_directory
 
         # Delete dymola output files
         self.deleteOutputFiles()
@@ -426,9 +427,8 @@ simulateModel(modelInstance, startTime={start_time}, stopTime={stop_time}, metho
         # then the simulations will be done in tmp??/Buildings
         worDir = self._create_worDir()
         self._simulateDir_ = worDir
-        # Copy directory
-        shutil.copytree(os.path.abspath(self._packagePath), worDir,
-                        ignore=shutil.ignore_patterns('*.svn', '*.git'))
+        # Stage directory
+        stage_directory(os.path.abspath(self._packagePath), worDir, ignore=['*.svn', '*.git'])
 
         # Construct the model instance with all parameter values
         # and the package redeclarations
@@ -440,6 +440,9 @@ simulateModel(modelInstance, startTime={start_time}, stopTime={stop_time}, metho
         try:
             # Write the Modelica script
             runScriptName = os.path.join(worDir, "run.mos")
+            # The file is deleted first as it may be linked to a file of the package.
+            if os.path.exists(runScriptName):
+                os.remove(runScriptName)
             with open(runScriptName, mode="w", encoding="utf-8") as fil:
                 fil.write(self._get_dymola_commands(
                     working_directory=worDir,
@@ -465,8 +468,9 @@ simulateModel(modelInstance, startTime={start_time}, stopTime={stop_time}, metho
 
         This method
           1. Deletes dymola output files
-          2. Copies the current directory, or the directory specified by the ``packagePath``
-             parameter of the constructor, to a temporary directory.
+          2. Stages the current directory, or the directory specified by the ``packagePath``
+             parameter of the constructor, in a temporary directory, using
+             :func:`buildingspy.io.staging.stage_directory`.
           3. Writes a Modelica script to the temporary directory.
           4. Starts the Modelica simulation environment from the temporary directory.
           5. Translates the model.
@@ -479,7 +483,7 @@ simulateModel(modelInstance, startTime={start_time}, stopTime={stop_time}, metho
 
         """
         import os
-        import shutil
+        from buildingspy.io.staging import stage_directory
 
         # Delete dymola output files
         self.deleteOutputFiles()
@@ -488,8 +492,8 @@ simulateModel(modelInstance, startTime={start_time}, stopTime={stop_time}, metho
         # then the simulations will be done in tmp??/Buildings
         worDir = self._create_worDir()
         self._translateDir_ = worDir
-        # Copy directory
-        shutil.copytree(os.path.abspath(self._packagePath), worDir)
+        # Stage directory
+        stage_directory(os.path.abspath(self._packagePath), worDir, ignore=['*.svn', '*.git'])
 
         # Construct the model instance with all parameter values
         # and the package redeclarations
@@ -501,6 +505,9 @@ simulateModel(modelInstance, startTime={start_time}, stopTime={stop_time}, metho
         try:
             # Write the Modelica script
             runScriptName = os.path.join(worDir, "run_translate.mos")
+            # The file is deleted first as it may be linked to a file of the package.
+            if os.path.exists(runScriptName):
+                os.remove(runScriptName)
             with open(runScriptName, mode="w", encoding="utf-8") as fil:
                 fil.write(self._get_dymola_commands(
                     working_directory=worDir,
@@ -591,7 +598,7 @@ simulateModel(modelInstance, startTime={start_time}, stopTime={stop_time}, metho
             except IOError as e:
                 self._reporter.writeError("Failed to copy '" +
                                           srcFil + "' to '" + newFil +
-                                          "; : " + e.strerror)
+                                          "; : " + str(e))
 
     def _deleteTemporaryDirectory(self, worDir):
         """ Deletes the working directory.
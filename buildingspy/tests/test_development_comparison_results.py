@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# import from future to make Python2 behave like Python3
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from io import open
+# end of from future import
+
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from buildingspy.development.comparison_results import ComparisonResults
+from buildingspy.development.comparison_results import read_log
+from buildingspy.development.comparison_results import write_log_entry
+
+
+class Test_development_comparison_results(unittest.TestCase):
+    """
+       This class contains the unit tests for
+       :mod:`buildingspy.development.comparison_results`.
+    """
+
+    def test_to_list(self):
+        """
+        Tests that the results are serialized in the format of the comparison log file.
+        """
+        com = ComparisonResults([{'model': 'A', 'simulation': {'success': True}},
+                                 {'model': 'B', 'simulation': {'success': False}}])
+        self.assertEqual(2, len(com))
+        com.add_model('A', 'A.mat')
+        com.add_variable('A', 'x', 'funnel_comp/A.mat_x', False, 1.5, 'x differs.\n', 0)
+        com.add_variable('A', 'y', None, True, None, None, None)
+        com.add_variable('A', 'x', 'funnel_comp/A.mat_x', False, 1.5, 'x differs.\n', 1)
+        com.add_model('C', 'C.mat')
+        self.assertIn('C', com)
+        expected = [{'model': 'A',
+                     'simulation': {'success': True},
+                     'comparison': {'file_name': 'A.mat',
+                                    'variables': ['x', 'y', 'x'],
+                                    'funnel_dirs': ['funnel_comp/A.mat_x', None,
+                                                    'funnel_comp/A.mat_x'],
+                                    'test_passed': [0, 1, 0],
+                                    't_err_max': [1.5, None, 1.5],
+                                    'warnings': ['x differs.\n', None, 'x differs.\n'],
+                                    'var_groups': [0, None, 1],
+                                    'success_rate': 1 / 3}},
+                    {'model': 'B',
+                     'simulation': {'success': False}},
+                    {'model': 'C',
+                     'comparison': {'file_name': 'C.mat',
+                                    'variables': [],
+                                    'funnel_dirs': [],
+                                    'test_passed': [],
+                                    't_err_max': [],
+                                    'warnings': [],
+                                    'var_groups': [],
+                                    'success_rate': 0}}]
+        self.assertEqual(expected, com.to_list())
+        self.assertEqual({'funnel_dir': 'funnel_comp/A.mat_x', 'test_passed': 0,
+                          't_err_max': 1.5, 'warning': 'x differs.\n', 'var_group': 0},
+                         com.get_variable('A', 'x'))
+        self.assertIsNone(com.get_variable('A', 'z'))
+        self.assertIsNone(com.get_variable('B', 'x'))
+        # The log file can be read again
+        self.assertEqual(expected, ComparisonResults(json.loads(json.dumps(expected))).to_list())
+
+    def test_update(self):
+        """
+        Tests that the comparison results of other instances, such as those of
+        other processes, are merged.
+        """
+        com = ComparisonResults([{'model': 'A'}, {'model': 'B'}])
+        for model in ['B', 'C']:
+            other = ComparisonResults()
+            other.add_model(model, model + '.mat')
+            other.add_variable(model, 'x', None, True, 0, None, 0)
+            com.update(pickle.loads(pickle.dumps(other)))
+        self.assertEqual(['A', 'B', 'C'], [c['model'] for c in com.to_list()])
+        self.assertIsNone(com.get_comparison('A'))
+        self.assertEqual(['x'], com.get_comparison('C')['variables'])
+
+    def test_read_log(self):
+        """
+        Tests that the comparison log file is read line by line, and that the
+        format of earlier versions can be read.
+        """
+        com = ComparisonResults([{'model': 'A', 'simulation': {'success': True}}])
+        com.add_model('A', 'A.mat')
+        com.add_variable('A', 'x', None, True, 0, None, 0)
+        com.add_model('B', 'B.mat')
+        temDir = tempfile.mkdtemp()
+        try:
+            fileName = os.path.join(temDir, "comparison-dymola.log")
+            for model in com:
+                write_log_entry(fileName, com.get_entry(model))
+            with open(fileName, mode="r", encoding="utf-8") as f:
+                self.assertEqual(2, len(f.readlines()))
+            self.assertEqual(com.to_list(), list(read_log(fileName)))
+            # An incomplete last line, written by an interrupted run, is skipped
+            with open(fileName, mode="a", encoding="utf-8") as f:
+                f.write('{"model": "C", "comp')
+            self.assertEqual(com.to_list(), list(read_log(fileName)))
+            # Format of BuildingsPy 2.1.0 and earlier
+            with open(fileName, mode="w", encoding="utf-8-sig") as f:
+                f.write(json.dumps(com.to_list(), indent=2, sort_keys=True) + '\n')
+            self.assertEqual(com.to_list(), ComparisonResults(read_log(fileName)).to_list())
+        finally:
+            shutil.rmtree(temDir)
+
+
+if __name__ == '__main__':
+    unittest.main()
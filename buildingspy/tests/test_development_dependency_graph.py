@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# import from future to make Python2 behave like Python3
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from io import open
+# end of from future import
+
+import os
+import shutil
+import tempfile
+import unittest
+from buildingspy.development.dependency_graph import DependencyGraph
+
+
+class Test_development_DependencyGraph(unittest.TestCase):
+    """
+       This class contains the unit tests for
+       :mod:`buildingspy.development.dependency_graph.DependencyGraph`.
+    """
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._libHome = os.path.join(self._dir, "Lib")
+        files = {
+            "package.mo": """within ;
+package Lib
+  type Reset = enumeration(Disabled, Parameter);
+end Lib;
+""",
+            "Base/package.mo": """within Lib;
+package Base
+  constant Real k = 1;
+end Base;
+""",
+            "Base/Partial.mo": """within Lib.Base;
+partial model Partial "Uses Lib.Unused only in a comment"
+  // Lib.Unused
+  parameter String fil = "modelica://Lib/Resources/Data/table.txt";
+end Partial;
+""",
+            "Base/Child.mo": """within Lib.Base;
+model Child
+  extends Partial;
+  Real y = Lib.Base.Functions.f(k) "Uses a function in a nested package";
+end Child;
+""",
+            "Base/Functions.mo": """within Lib.Base;
+package Functions
+  function f
+    input Real x;
+    output Real y = x;
+  end f;
+end Functions;
+""",
+            "Unused.mo": """within Lib;
+model Unused
+  package Medium = Lib.Base.Functions;
+  Medium.f f;
+end Unused;
+""",
+            "Examples/package.mo": """within Lib;
+package Examples
+end Examples;
+""",
+            "Examples/ImportAlias.mo": """within Lib.Examples;
+model ImportAlias
+  import B = Lib.Base;
+  B.Child c;
+end ImportAlias;
+""",
+            "Examples/ImportWildcard.mo": """within Lib.Examples;
+model ImportWildcard
+  import Lib.Base.*;
+  Partial p;
+  parameter Lib.Reset res = Lib.Reset.Disabled;
+end ImportWildcard;
+""",
+            "Examples/Local.mo": """within Lib.Examples;
+model Local
+  model Unused
+    Real x;
+  end Unused;
+  Unused u "Uses the local class, not Lib.Unused";
+end Local;
+"""}
+        for (nam, txt) in files.items():
+            fil = os.path.join(self._libHome, nam)
+            if not os.path.isdir(os.path.dirname(fil)):
+                os.makedirs(os.path.dirname(fil))
+            with open(fil, mode="w", encoding="utf-8") as f:
+                f.write(txt)
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+    def test_dependencies(self):
+        """
+        Tests the classes that a class depends on.
+        """
+        dep = DependencyGraph(self._libHome)
+        self.assertEqual("Base/Functions.mo", dep.get_class_file("Lib.Base.Functions.f"))
+        self.assertEqual("Examples/Local.mo", dep.get_class_file("Lib.Examples.Local.Unused"))
+        self.assertIsNone(dep.get_class_file("Lib.NotAClass"))
+        self.assertEqual(set(), dep.get_dependencies("Lib.Base.Partial"))
+        self.assertEqual(set(["Lib.Base.Partial", "Lib.Base.Functions", "Lib.Base"]),
+                         dep.get_dependencies("Lib.Base.Child"))
+        self.assertEqual(set(["Lib.Base.Child", "Lib.Base.Partial", "Lib.Base.Functions",
+                              "Lib.Base"]),
+                         dep.get_dependencies("Lib.Examples.ImportAlias"))
+        self.assertEqual(set(["Lib.Base.Partial", "Lib"]),
+                         dep.get_dependencies("Lib.Examples.ImportWildcard"))
+        self.assertEqual(set(), dep.get_dependencies("Lib.Examples.Local"))
+        self.assertEqual(set(["Lib.Base.Functions"]), dep.get_dependencies("Lib.Unused"))
+        self.assertRaises(ValueError, dep.get_dependencies, "Lib.NotAClass")
+        self.assertEqual(set(["Examples/ImportWildcard.mo", "Base/Partial.mo", "package.mo",
+                              "Resources/Data/table.txt"]),
+                         dep.get_dependency_files("Lib.Examples.ImportWildcard"))
+
+    def test_dependent_classes(self):
+        """
+        Tests the classes that depend on changed files.
+        """
+        dep = DependencyGraph(self._libHome)
+        self.assertEqual(set(["Lib.Base.Functions", "Lib.Base.Child", "Lib.Unused",
+                              "Lib.Examples.ImportAlias"]),
+                         dep.get_dependent_classes(["Base/Functions.mo"]))
+        self.assertEqual(set(["Lib.Base.Partial", "Lib.Base.Child",
+                              "Lib.Examples.ImportAlias", "Lib.Examples.ImportWildcard"]),
+                         dep.get_dependent_classes([os.path.join("Base", "Partial.mo")]))
+        # Resources
+        self.assertEqual(set(["Lib.Base.Partial", "Lib.Base.Child",
+                              "Lib.Examples.ImportAlias", "Lib.Examples.ImportWildcard"]),
+                         dep.get_dependent_classes(["Resources/Data/table.txt"]))
+        self.assertEqual(set(), dep.get_dependent_classes(["Resources/Data/other.txt"]))
+        self.assertEqual(set(["Lib", "Lib.Examples.ImportWildcard"]),
+                         dep.get_dependent_classes(["package.mo"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -74,6 +74,33 @@ class Test_development_error_dictionary(unittest.TestCase):
             self.assertEqual(k[i], k_expected[i],
                              "Wrong tool message, expected \"{}\".".format(k_expected[i]))
 
+    def test_scanner(self):
+        import buildingspy.development.error_dictionary_dymola as e
+        sca = e.ErrorDictionary().get_scanner()
+        lines = ["Number of numerical Jacobians: 3\n",
+                 "Redundant connection, which is suspicious\n",
+                 "Number of numerical Jacobians: 0\n",
+                 "No warning.\n",
+                 "Redundant connection\n"]
+        found = [(lin, [sca.keys()[i] for i in ind]) for (lin, ind) in sca.scan(lines)]
+        self.assertEqual([(lines[0], ['numerical Jacobians']),
+                          (lines[1], ['redundant connection', 'suspicious attributes']),
+                          (lines[2], ['numerical Jacobians']),
+                          (lines[4], ['redundant connection'])], found)
+        cou = sca.count(lines)
+        self.assertEqual(3, cou['numerical Jacobians'])
+        self.assertEqual(2, cou['redundant connection'])
+        self.assertEqual(1, cou['suspicious attributes'])
+        self.assertEqual(0, cou['unused connector'])
+        self.assertEqual(16, len(cou))
+        # The scanner is built once
+        err_dic = e.ErrorDictionary()
+        self.assertIs(err_dic.get_scanner(), err_dic.get_scanner())
+        # A dictionary without tool messages does not find anything
+        from buildingspy.development.error_dictionary import LogScanner
+        self.assertEqual([], list(LogScanner(dict()).scan(lines)))
+        self.assertEqual(dict(), LogScanner(dict()).count(lines))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# import from future to make Python2 behave like Python3
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from io import open
+# end of from future import
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pyfunnel
+from buildingspy.development.funnel import get_errors
+
+
+class Test_development_funnel(unittest.TestCase):
+    """
+       This class contains the unit tests for
+       :mod:`buildingspy.development.funnel`.
+    """
+
+    def _get_pyfunnel_errors(self, xRef, yRef, xTes, yTes, tol):
+        tmpDir = tempfile.mkdtemp()
+        try:
+            pyfunnel.compareAndReport(xRef, yRef, xTes, yTes, tmpDir,
+                                      atolx=tol['ax'], atoly=tol['ay'],
+                                      rtolx=tol['rx'], rtoly=tol['ry'])
+            err = np.genfromtxt(os.path.join(tmpDir, 'errors.csv'),
+                                delimiter=',', skip_header=1)
+        finally:
+            shutil.rmtree(tmpDir)
+        return err[:, 1]
+
+    def test_get_errors(self):
+        """
+        Tests that the errors are the same as the errors computed by pyfunnel.
+        """
+        rng = np.random.RandomState(1)
+        xRef = np.linspace(0, 10, 51)
+        xTes = np.linspace(0, 10, 101)
+        yRef = [np.sin(xRef), np.cumsum(rng.normal(size=len(xRef))), np.where(xRef > 5, 1., 0.)]
+        yTes = [np.interp(xTes, xRef, y) + rng.normal(scale=0.05, size=len(xTes)) for y in yRef]
+        for tol in [{'ax': 0.1, 'ay': 0.01, 'rx': None, 'ry': None},
+                    {'ax': 0.01, 'ay': 0.0, 'rx': 0.002, 'ry': 0.05}]:
+            err = get_errors(xRef, yRef, xTes, yTes, tol)
+            self.assertEqual((3, len(xTes)), err.shape)
+            for i in range(3):
+                np.testing.assert_allclose(
+                    self._get_pyfunnel_errors(list(xRef), list(yRef[i]),
+                                              list(xTes), list(yTes[i]), tol),
+                    err[i], atol=1E-10)
+                np.testing.assert_array_equal(
+                    err[i], get_errors(xRef, yRef[i], xTes, yTes[i], tol))
+        # Parameters
+        tol = {'ax': 0.0, 'ay': 0.1, 'rx': None, 'ry': None}
+        np.testing.assert_allclose([0, 0.4], get_errors([0, 1], [1, 1], [0, 1], [1, 1.5], tol))
+        # Different end times
+        self.assertRaises(ValueError, get_errors, [0, 1], [1, 1], [0, 1.1], [1, 1], tol)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# import from future to make Python2 behave like Python3
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from io import open
+# end of from future import
+
+import unittest
+import buildingspy.development.mos_script as m
+
+
+class Test_development_mos_script(unittest.TestCase):
+    """
+       This class contains the unit tests for
+       :mod:`buildingspy.development.mos_script`.
+    """
+
+    def test_parse(self):
+        """
+        Tests that the commands, their arguments and their lines are parsed.
+        """
+        coms = m.parse('''// Simulate and plot
+ok := simulateModel("MyLib.MyModel", startTime=-10, stopTime=1.0, method="dassl",
+    resultFile="MyModel");
+Advanced.Define.DAEsolver = true
+removePlots(); createPlot(id=1, position={75, 70, 1200, 650},
+  y={"x", "y[1,1]", "z.'a b'"},
+  /* a comment; with a semicolon */ range={0.0, 1.0, -0.5, 0.5}, grid=true)
+plotExpression(apply(MyModel[end].x), false, "x", 1)''')
+        self.assertEqual(['simulateModel', None, 'removePlots', 'createPlot', 'plotExpression'],
+                         [c.name for c in coms])
+        self.assertEqual([2, 4, 5, 5, 8], [c.line for c in coms])
+        sim = coms[0]
+        self.assertEqual('ok', sim.target)
+        self.assertEqual(['MyLib.MyModel'], sim.args)
+        self.assertEqual(['startTime', 'stopTime', 'method', 'resultFile'], list(sim.kwargs))
+        self.assertIsInstance(sim.kwargs['startTime'], m.Expression)
+        self.assertEqual('-10', sim.kwargs['startTime'])
+        self.assertEqual('MyModel', sim.kwargs['resultFile'])
+        self.assertEqual('Advanced.Define.DAEsolver', coms[1].target)
+        self.assertEqual('true', coms[1].value)
+        plo = coms[3]
+        self.assertEqual(['x', 'y[1,1]', "z.'a b'"], plo.kwargs['y'])
+        self.assertEqual(['0.0', '1.0', '-0.5', '0.5'], plo.kwargs['range'])
+        self.assertEqual('true', plo.kwargs['grid'])
+        self.assertEqual(['apply(MyModel[end].x)', 'false', 'x', '1'], coms[4].args)
+
+    def test_parse_errors(self):
+        """
+        Tests that malformed scripts raise a ValueError.
+        """
+        for (s, lin) in [('createPlot(y={"x"});\nsimulateModel("a);', 2),
+                         ('createPlot(y={"x");', 1),
+                         ('simulateModel("a"));', 1),
+                         ('createPlot(\ny={"x"});\n/* comment', 3),
+                         ('createPlot(y={"x",, "y"});', None)]:
+            with self.assertRaises(ValueError) as cm:
+                m.parse(s)
+            if lin is not None:
+                self.assertTrue(str(cm.exception).startswith("Line {}:".format(lin)),
+                                str(cm.exception))
+
+    def test_remove_commands(self):
+        """
+        Tests that commands are removed, including the lines that only contain them.
+        """
+        s = '''simulateModel("MyLib.MyModel");
+removePlots();
+createPlot(id=1,
+  y={"x"}); createPlot(id=2, y={"y"});
+plotExpression(x); createPlot(y={"z"});
+'''
+        self.assertEqual('''simulateModel("MyLib.MyModel");
+plotExpression(x); \n''', m.remove_commands(s, ['createPlot', 'removePlots']))
+        self.assertEqual(s, m.remove_commands(s, ['translateModelFMU']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,6 +12,7 @@ from builtins import *
 from io import open
 # end of from future import
 
+import multiprocessing
 import unittest
 import os
 
@@ -58,10 +59,13 @@ class Test_regressiontest_Tester(unittest.TestCase):
         self.assertEqual(["const1[1].y", "const2[1, 1].y"],
                          r.Tester.get_plot_variables(' y={"const1[1].y", "const2[1, 1].y"} '))
 
-        # Make sure line breaks are raising an error, as they are not parsed
+        # Make sure arrays that span multiple lines are parsed,
+        # and that arrays that are not closed are raising an error
+        self.assertEqual(["a", "b", "c"], r.Tester.get_plot_variables(
+            """y = {"a", "b",
+            "c"}"""), "Expected a b c")
         self.assertRaises(ValueError, r.Tester.get_plot_variables,
-                          """y = {"a", "b",
-                          "c"}""")
+                          """y = {"a", "b",""")
 
     def test_regressiontest(self):
         import buildingspy.development.regressiontest as r
@@ -133,6 +137,211 @@ class Test_regressiontest_Tester(unittest.TestCase):
         rt.setSinglePackage("MyModelicaLibrary.Examples,MyModelicaLibrary.Examples.FMUs")
         self.assertEqual(6, rt.get_number_of_tests())
 
+    def test_setChangedFiles(self):
+        import buildingspy.development.regressiontest as r
+        myMoLib = os.path.join("buildingspy", "tests", "MyModelicaLibrary")
+
+        def get_models(changed):
+            rt = r.Tester(check_html=False)
+            rt.setLibraryRoot(myMoLib)
+            rt.include_fmu_tests(True)
+            rt.setChangedFiles(changed)
+            return sorted([dat['model_name'] for dat in rt._data])
+
+        self.assertEqual(["MyModelicaLibrary.Examples.MyStep"], get_models(["MyModel.mo"]))
+        self.assertEqual(["MyModelicaLibrary.Examples.Constants"],
+                         get_models([os.path.join("Resources", "Scripts", "Dymola",
+                                                  "Examples", "Constants.mos")]))
+        self.assertEqual(["MyModelicaLibrary.Obsolete.Examples.Constant"],
+                         get_models([os.path.abspath(
+                             os.path.join(myMoLib, "Resources", "ReferenceResults", "Dymola",
+                                          "MyModelicaLibrary_Obsolete_Examples_Constant.txt"))]))
+        self.assertEqual(["MyModelicaLibrary.Examples.FMUs.Gain"],
+                         get_models(["Examples/FMUs/Gain.mo"]))
+        self.assertEqual([], get_models(["Examples/package.order"]))
+        self.assertEqual(7, len(get_models(["Resources/Scripts/BuildingsPy/conf.json"])))
+
+        rt = r.Tester(check_html=False)
+        rt.setLibraryRoot(myMoLib)
+        self.assertRaises(ValueError, rt.setChangedSinceRevision, "this_is_not_a_revision")
+
+    def test_setVerdictCache(self):
+        import shutil
+        import tempfile
+        import buildingspy.development.regressiontest as r
+
+        temDir = tempfile.mkdtemp()
+        myMoLib = os.path.join(temDir, "MyModelicaLibrary")
+        shutil.copytree(os.path.join("buildingspy", "tests", "MyModelicaLibrary"), myMoLib)
+
+        def get_models(pedantic=False, failed=None):
+            rt = r.Tester(check_html=False)
+            rt.setLibraryRoot(myMoLib)
+            rt.include_fmu_tests(True)
+            rt.pedanticModelica(pedantic)
+            rt.setVerdictCache(os.path.join(temDir, "verdicts"))
+            rt.setDataDictionary()
+            fingerprints = rt._skip_passed_tests()
+            models = sorted([dat['model_name'] for dat in rt._data])
+            if failed is not None:
+                rt._failed_tests = set([failed])
+                rt._add_passed_tests(fingerprints, 0)
+            return models
+
+        try:
+            self.assertEqual(7, len(get_models(failed="MyModelicaLibrary.Examples.MyStep")))
+            self.assertEqual(["MyModelicaLibrary.Examples.MyStep"], get_models())
+            # A change to a class that is used by a model
+            with open(os.path.join(myMoLib, "Examples", "FMUs", "Gain.mo"), mode="a") as f:
+                f.write("\n")
+            self.assertEqual(["MyModelicaLibrary.Examples.FMUs.Gain",
+                              "MyModelicaLibrary.Examples.MyStep"], get_models())
+            # A change to the settings
+            self.assertEqual(7, len(get_models(pedantic=True)))
+        finally:
+            shutil.rmtree(temDir)
+
+    def test_setDiscoveryCache(self):
+        import shutil
+        import tempfile
+        import buildingspy.development.regressiontest as r
+
+        temDir = tempfile.mkdtemp()
+        myMoLib = os.path.join(temDir, "MyModelicaLibrary")
+        shutil.copytree(os.path.join("buildingspy", "tests", "MyModelicaLibrary"), myMoLib)
+        parsed = []
+
+        def get_data(nPro=1):
+            rt = r.Tester(check_html=False)
+            rt.setLibraryRoot(myMoLib)
+            rt.setNumberOfThreads(nPro)
+            rt.setDiscoveryCache(os.path.join(temDir, "discovery"))
+            rt.setDataDictionary()
+            return rt._data
+
+        get_test_data = r._get_test_data
+
+        def counting_get_test_data(args):
+            parsed.append(args[2])
+            return get_test_data(args)
+
+        try:
+            r._get_test_data = counting_get_test_data
+            expected = get_data()
+            self.assertEqual(7, len(parsed))
+            # Only the changed script is parsed again
+            parsed[:] = []
+            mosFil = os.path.join(myMoLib, "Resources", "Scripts", "Dymola", "Examples",
+                                  "MyStep.mos")
+            with open(mosFil, mode="r", encoding="utf-8") as f:
+                con = f.read()
+            with open(mosFil, mode="w", encoding="utf-8") as f:
+                f.write(con.replace('stopTime=1.0', 'stopTime=10.0'))
+            data = get_data()
+            self.assertEqual(["MyStep.mos"], parsed)
+            self.assertEqual(['10.0'], [d['stopTime'] for d in data if 'MyStep' in d['model_name']])
+            # A change to the model of a script
+            parsed[:] = []
+            with open(os.path.join(myMoLib, "Examples", "Constants.mo"), mode="a") as f:
+                f.write("\n")
+            get_data()
+            self.assertEqual(["Constants.mos"], parsed)
+            # The scripts are also parsed in parallel
+            r._get_test_data = get_test_data
+            r._MIN_SCRIPTS_PER_PROCESS = 2
+            shutil.rmtree(os.path.join(temDir, "discovery"))
+            self.assertEqual(data, get_data(nPro=3))
+            self.assertNotEqual(expected, data)
+        finally:
+            r._get_test_data = get_test_data
+            r._MIN_SCRIPTS_PER_PROCESS = 100
+            shutil.rmtree(temDir)
+
+    def test_checkReferencePoints(self):
+        import shutil
+        import tempfile
+        import buildingspy.development.regressiontest as r
+        from buildingspy.development.comparison_results import read_log
+
+        temDir = tempfile.mkdtemp()
+        myMoLib = os.path.join(temDir, "MyModelicaLibrary")
+        shutil.copytree(os.path.join("buildingspy", "tests", "MyModelicaLibrary"), myMoLib)
+        refDir = os.path.join(myMoLib, "Resources", "ReferenceResults", "Dymola")
+
+        def get_tester(nPro):
+            rt = r.Tester(check_html=False, tool="jmodelica", tol=1E-3)
+            rt.setLibraryRoot(myMoLib)
+            rt.setNumberOfThreads(nPro)
+            rt._reporter.logToFile(False)
+            rt._comp_log_file = os.path.join(temDir, "comparison.log")
+            rt._comp_dir = tempfile.mkdtemp(dir=temDir)
+            rt._data = [
+                {'ScriptFile': 'Examples/{}.mos'.format(nam),
+                 'model_name': 'MyModelicaLibrary.Examples.{}'.format(nam),
+                 'ResultFile': 'PlotDemo.mat',
+                 'ResultDirectory': os.path.abspath(os.path.join("buildingspy", "examples",
+                                                                 "dymola")),
+                 'ResultVariables': [['PID.I.y', 'PID.P.y'], ['PID.y']],
+                 'mustSimulate': True,
+                 'mustExportFMU': False,
+                 'jmodelica': {'simulate': True}} for nam in ['A', 'B', 'C']]
+            return rt
+
+        def check(nPro):
+            rt = get_tester(nPro)
+            self.assertEqual(0, rt._checkReferencePoints("N"))
+            return rt
+
+        try:
+            # Write the reference results
+            rt = get_tester(1)
+            for dat in rt._data:
+                y_sim = rt._getSimulationResults(dat, [], [])
+                rt._writeReferenceResults(
+                    os.path.join(refDir, rt._get_reference_file_name(dat)), y_sim, {})
+            refFil = os.path.join(refDir, "MyModelicaLibrary_Examples_B.txt")
+            with open(refFil, mode="r", encoding="utf-8") as f:
+                lines = f.readlines()
+            with open(refFil, mode="w", encoding="utf-8") as f:
+                for lin in lines:
+                    f.write(lin.replace("PID.y=[", "PID.y=[1").replace("[1-", "[-1"))
+            # The messages and comparison results are the same in serial and in parallel
+            ser = check(1)
+            par = check(3)
+            self.assertEqual(1, ser._reporter.getNumberOfWarnings())
+            self.assertEqual(ser._reporter.getNumberOfWarnings(),
+                             par._reporter.getNumberOfWarnings())
+            serInf = ser._comp_info.to_list()
+            parInf = par._comp_info.to_list()
+            # The comparison log file has one line for each model
+            self.assertEqual(parInf, list(read_log(par._comp_log_file)))
+            self.assertEqual([[1, 1, 1], [1, 1, 0], [1, 1, 1]],
+                             [c['comparison']['test_passed'] for c in serInf])
+            # The funnel files are only written for the variable that exceeds the tolerance
+            self.assertEqual([[False, False, False], [False, False, True], [False, False, False]],
+                             [[d is not None for d in c['comparison']['funnel_dirs']]
+                              for c in serInf])
+            for c in serInf + parInf:
+                c['comparison']['funnel_dirs'] = None
+            self.assertEqual(serInf, parInf)
+            # The worker processes are stopped if the verification fails
+            rt = get_tester(3)
+
+            def write_reference_check(check):
+                raise RuntimeError("Failed to write the messages.")
+
+            rt._write_reference_check = write_reference_check
+            try:
+                rt._checkReferencePoints("N")
+                self.fail("Expected a RuntimeError.")
+            except RuntimeError as e:
+                # The traceback refers to the pool, hence the pool is not garbage collected.
+                err = e
+            self.assertEqual([], multiprocessing.active_children())
+            self.assertEqual("Failed to write the messages.", str(err))
+        finally:
+            shutil.rmtree(temDir)
+
     def test_setExcludeTest(self):
         import buildingspy.development.regressiontest as r
         print("*** Running test_setExcludeTest that excludes files from unit test.\n")
@@ -190,6 +399,30 @@ class Test_regressiontest_Tester(unittest.TestCase):
         (equ, timMaxErr, _) = rt.areResultsEqual(tNew, yNew, tOld, yOld, varNam, filNam)
         self.assertFalse(equ, "Test with smaller simulation start time should have returned false.")
 
+    def test_get_legacy_errors(self):
+        """Test that the legacy comparison of all variables of a test gives the same results."""
+        import numpy as np
+        import buildingspy.development.regressiontest as r
+        rt = r.Tester(comp_tool='legacy', tol=1E-3)
+        rt._data = [{'ResultFile': 'testFilename', 'model_name': 'testModel',
+                     'ResultVariables': [['x', 'y', 'p']]}]
+        t = [10 + 0.4 * i for i in range(101)]
+        y_ref = {'time': [10, 50], 'x': np.sin(t), 'y': np.cos(t), 'p': [2, 2]}
+        y_sim = [{'time': t, 'x': np.sin(t), 'y': np.cos(t) + 0.01 * np.sin(t), 'p': [2.1, 2.1]}]
+        expected = []
+        for varNam in ['x', 'y', 'p']:
+            tNew = [10, 50] if varNam == 'p' else t
+            expected.append(rt.areResultsEqual(
+                y_ref['time'], y_ref[varNam], tNew, y_sim[0][varNam], varNam, 0))
+        self.assertEqual([True, False, False], [e[0] for e in expected])
+        rt._legacy_errors = rt._get_legacy_errors(y_ref['time'], y_ref, y_sim)
+        self.assertEqual(['x', 'y', 'p'], list(rt._legacy_errors.keys()))
+        for (i, varNam) in enumerate(['x', 'y', 'p']):
+            tNew = [10, 50] if varNam == 'p' else t
+            self.assertEqual(expected[i], rt.areResultsEqual(
+                y_ref['time'], y_ref[varNam], tNew, y_sim[0][varNam], varNam, 0))
+        self.assertEqual(0, len(rt._legacy_errors))
+
     def test_statistics_are_equal(self):
         import buildingspy.development.regressiontest as r
 
@@ -237,6 +470,35 @@ class Test_regressiontest_Tester(unittest.TestCase):
         rt.setLibraryRoot(myMoLib)
         rt.setDataDictionary()
 
+    def test_get_batches(self):
+        import buildingspy.development.regressiontest as r
+        rt = r.Tester(check_html=False)
+        # Simulated time of the regression tests, one test requires no simulation
+        stopTimes = [10, 3600, 1, 86400, 60, 5, 5, 3600]
+        rt._data = [{'mustSimulate': True, 'startTime': 0, 'stopTime': s} for s in stopTimes]
+        rt._data[0]['mustSimulate'] = False
+
+        batches = rt._get_batches(3)
+        self.assertEqual(3, len(batches))
+        # Each test is in exactly one batch
+        self.assertEqual(list(range(len(stopTimes))), sorted(sum(batches, [])))
+        # The longest test is first, and in a batch of its own
+        self.assertEqual([3], batches[0])
+        self.assertEqual([1, 4], batches[1])
+        self.assertEqual([7, 5, 6, 2, 0], batches[2])
+        # Fewer tests than batches
+        self.assertEqual(len(stopTimes), len(rt._get_batches(20)))
+        # Tests whose stop time is an expression are scheduled with the median estimate
+        rt._data = [{'mustSimulate': True, 'startTime': '0', 'stopTime': s}
+                    for s in ['10', '3600*24', '1', '3600']]
+        self.assertEqual([10., 10., 1., 3600.], rt._get_expected_runtimes())
+        self.assertEqual([[3], [0, 2], [1]], rt._get_batches(3))
+        # Tests that have the same expected time are spread over the batches
+        rt._data = [{'mustSimulate': True} for i in range(6)]
+        self.assertEqual([[0, 3], [1, 4], [2, 5]], rt._get_batches(3))
+        rt._data = []
+        self.assertEqual([], rt._get_batches(3))
+
     def test_expand_packages(self):
         import buildingspy.development.regressiontest as r
 
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# import from future to make Python2 behave like Python3
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from io import open
+# end of from future import
+
+import os
+import shutil
+import tempfile
+import unittest
+from buildingspy.development.runtime_history import RuntimeHistory
+
+
+class Test_development_RuntimeHistory(unittest.TestCase):
+    """
+       This class contains the unit tests for
+       :mod:`buildingspy.development.runtime_history.RuntimeHistory`.
+    """
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._fileName = os.path.join(self._dir, "runtimes.sqlite")
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+    def test_queries(self):
+        """
+        Tests the queries of the runtime history.
+        """
+        his = RuntimeHistory(self._fileName)
+        for i in range(12):
+            his.add_run("dymola",
+                        [{'model': 'A', 'translation_time': 1., 'simulation_time': float(i)},
+                         {'model': 'B', 'simulation_time': 5., 'success': True},
+                         {'model': 'C', 'success': False}],
+                        library="MyLib",
+                        processors=2)
+        his.add_run("jmodelica", [{'model': 'B', 'simulation_time': 100.}])
+
+        # The database is persistent
+        his = RuntimeHistory(self._fileName)
+        runTim = his.get_runtimes(tool="dymola")
+        self.assertEqual(['A', 'B'], sorted(runTim.keys()))
+        self.assertEqual([float(i) + 1 for i in range(12)], runTim['A'])
+        self.assertEqual([float(i) + 1 for i in range(9, 12)],
+                         his.get_runtimes(tool="dymola", last=3)['A'])
+        # Median of the last 10 runs
+        self.assertEqual(7.5, his.median_runtime('A', tool="dymola"))
+        self.assertEqual(6.5, his.median_runtime('A', tool="dymola", last=None))
+        self.assertEqual(5., his.median_runtime('B', tool="dymola"))
+        self.assertEqual(5., his.median_runtime('B', tool="dymola", last=1))
+        self.assertEqual(100., his.median_runtime('B', last=1))
+        self.assertIsNone(his.median_runtime('C'))
+        # Trend
+        self.assertAlmostEqual(1., his.trend('A'))
+        self.assertAlmostEqual(0., his.trend('B', tool="dymola"))
+        self.assertIsNone(his.trend('B', tool="jmodelica"))
+        # Slowest models
+        self.assertEqual([('A', 7.5), ('B', 5.)], his.slowest(tool="dymola"))
+        self.assertEqual([('B', 100.)], his.slowest(n=1, tool="jmodelica"))
+
+    def test_expected_runtimes(self):
+        """
+        Tests that the regression tests are ordered using the runtime history.
+        """
+        import buildingspy.development.regressiontest as r
+
+        rt = r.Tester(check_html=False)
+        rt._data = [{'model_name': 'A', 'mustSimulate': True, 'startTime': 0, 'stopTime': 10},
+                    {'model_name': 'B', 'mustSimulate': True, 'startTime': 0, 'stopTime': 1},
+                    {'model_name': 'C', 'mustSimulate': True, 'startTime': 0, 'stopTime': 5}]
+        self.assertEqual([10., 1., 5.], rt._get_expected_runtimes())
+
+        rt.setRuntimeHistory(self._fileName)
+        self.assertEqual([10., 1., 5.], rt._get_expected_runtimes())
+        rt.getRuntimeHistory().add_run("dymola",
+                                       [{'model': 'A', 'simulation_time': 2.},
+                                        {'model': 'B', 'simulation_time': 20.}])
+        # C has no history and is scaled by the median ratio of A and B
+        self.assertEqual([2., 20., 5. * 10.1], rt._get_expected_runtimes())
+        self.assertEqual([[2], [1], [0]], rt._get_batches(3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -100,6 +100,202 @@ Translated Model
 
         os.remove(staFil)
 
+    def test_lazy_reader(self):
+        """
+        Tests that :mod:`buildingspy.io.outputfile.Reader` returns the same
+        results if the file is memory-mapped.
+        """
+        import os
+
+        for fil in [os.path.join("buildingspy", "examples", "dymola", "PlotDemo.mat"),
+                    os.path.join("buildingspy", "examples", "dymola", "TwoRoomsWithStorage.mat")]:
+            r = of.Reader(fil, "dymola")
+            r_lazy = of.Reader(fil, "dymola", lazy=True)
+            self.assertEqual(r.varNames(), r_lazy.varNames())
+            for var in r.varNames():
+                (t, y) = r.values(var)
+                (t_lazy, y_lazy) = r_lazy.values(var)
+                numpy.testing.assert_array_equal(t, t_lazy)
+                numpy.testing.assert_array_equal(y, y_lazy)
+                self.assertEqual(r._data_.description(var), r_lazy._data_.description(var))
+
+    def test_descriptions(self):
+        """
+        Tests the decoding of the variable descriptions.
+        """
+        import os
+
+        r = of.Reader(os.path.join("buildingspy", "examples", "dymola", "PlotDemo.mat"), "dymola")
+        self.assertEqual(r._data_.description('PID.I.k'), 'Integrator gain [s-1]')
+        self.assertEqual(r._data_.description('preHea.port.Q_flow'),
+                         'Heat flow rate (positive if flowing from outside into the component) [W]')
+        self.assertEqual(r._data_.abscissa('PID.I.k')[1:], ('Time', 'Time in [s]'))
+
+    def test_values_many(self):
+        """
+        Tests the :mod:`buildingspy.io.outputfile.Reader.values_many` function.
+        """
+        import os
+
+        r = of.Reader(os.path.join("buildingspy", "examples", "dymola", "PlotDemo.mat"), "dymola")
+        varNames = r.varNames()
+        nVar = 0
+        for (time, names, values) in r.values_many(varNames):
+            self.assertEqual(values.shape, (len(names), len(time)))
+            for i, var in enumerate(names):
+                (t, y) = r.values(var)
+                numpy.testing.assert_array_equal(time, t)
+                numpy.testing.assert_array_equal(values[i], y)
+            nVar += len(names)
+        self.assertEqual(nVar, len(varNames))
+        # Variables in reverse order, with duplicates and with aliases of negative sign
+        varNames = ['heaFloSen.port_a.Q_flow', 'PID.u_m', 'heaFloSen.Q_flow', 'PID.u_m', 'PID.I.y']
+        for (time, names, values) in r.values_many(varNames):
+            for i, var in enumerate(names):
+                numpy.testing.assert_array_equal(values[i], r.values(var)[1])
+        # A variable that does not exist raises a KeyError, as for values()
+        self.assertRaises(KeyError, r.values_many, ['PID.u_m', 'notAVariable'])
+
+    def test_values_time_window(self):
+        """
+        Tests the :mod:`buildingspy.io.outputfile.Reader.values` function with a time window.
+        """
+        import os
+
+        r = of.Reader(os.path.join("buildingspy", "examples", "dymola", "TwoRoomsWithStorage.mat"),
+                      "dymola")
+        (t, y) = r.values('roo1.air.vol.T')
+        for (t_start, t_end) in [(None, None), (86400, 2 * 86400), (None, 3600), (7200, None),
+                                 (t[10], t[20]), (-1, 1E10), (1E10, 2E10)]:
+            (tWin, yWin) = r.values('roo1.air.vol.T', t_start=t_start, t_end=t_end)
+            ind = numpy.ones(len(t), dtype=bool)
+            if t_start is not None:
+                ind = ind & (t >= numpy.float32(t_start))
+            if t_end is not None:
+                ind = ind & (t <= numpy.float32(t_end))
+            numpy.testing.assert_array_equal(tWin, t[ind])
+            numpy.testing.assert_array_equal(yWin, y[ind])
+        # Parameters are constant over the time window
+        (tPar, yPar) = r.values('roo1.air.vol.V', t_start=3600, t_end=7200)
+        numpy.testing.assert_array_equal(tPar, [3600, 7200])
+        numpy.testing.assert_array_equal(yPar, r.values('roo1.air.vol.V')[1])
+        self.assertRaises(ValueError, r.values, 'roo1.air.vol.T', 7200, 3600)
+
+    def test_resample(self):
+        """
+        Tests the :mod:`buildingspy.io.outputfile.Reader.resample` function.
+        """
+        import os
+
+        r = of.Reader(os.path.join("buildingspy", "examples", "dymola", "TwoRoomsWithStorage.mat"),
+                      "dymola")
+        varNames = r.varNames()
+        (t, _) = r.values(varNames[0])
+        # Time stamps that occur more than once
+        tEve = t[1:][numpy.diff(t) == 0]
+        self.assertTrue(len(tEve) > 0)
+        grid = numpy.concatenate((numpy.linspace(-100, t[-1] + 100, 501), tEve))
+        y = r.resample(varNames, grid)
+        self.assertEqual(y.shape, (len(varNames), len(grid)))
+        for i, var in enumerate(varNames):
+            (tVar, yVar) = r.values(var)
+            if len(tVar) == 2:
+                numpy.testing.assert_array_equal(y[i], yVar[0])
+                continue
+            # At events, the value after the event is used
+            yEve = [yVar[numpy.flatnonzero(tVar == tE)[-1]] for tE in tEve]
+            numpy.testing.assert_allclose(y[i][501:], yEve)
+            # Between events, the values are linearly interpolated
+            noEve = ~numpy.isin(grid[:501], tVar)
+            numpy.testing.assert_allclose(y[i][:501][noEve],
+                                          numpy.interp(grid[:501][noEve], tVar, yVar),
+                                          rtol=1E-10, atol=1E-10 * max(abs(yVar)))
+
+    def test_varNames(self):
+        """
+        Tests the :mod:`buildingspy.io.outputfile.Reader.varNames` and
+        :mod:`buildingspy.io.outputfile.Reader.select` functions.
+        """
+        import os
+        import re
+        import fnmatch
+
+        r = of.Reader(os.path.join("buildingspy", "examples", "dymola", "TwoRoomsWithStorage.mat"),
+                      "dymola")
+        allNames = list(r._data_.names())
+        self.assertEqual(r.varNames(), sorted(allNames))
+        for pattern in ['u$', 'T', '^roo', '^roo.*T$', '^ro?', r'^roo\.', '^a|b',
+                        '(?i)^ROO', '^[ab]', r'^tan.*\.T$', '^x*y', '^notAVariable']:
+            expected = [n for n in allNames if re.search(pattern, n)]
+            # Call twice to also test the cached results
+            self.assertEqual(r.varNames(pattern), expected,
+                             "Wrong result for pattern {}.".format(pattern))
+            self.assertEqual(r.varNames(pattern), expected,
+                             "Wrong cached result for pattern {}.".format(pattern))
+        for pattern in ['roo*', '*.T', 'roo?.T', '[ab]*', '*', 'time', 'notAVariable']:
+            self.assertEqual(r.select(pattern),
+                             sorted([n for n in allNames if fnmatch.fnmatchcase(n, pattern)]),
+                             "Wrong result for pattern {}.".format(pattern))
+
+    def test_statistics(self):
+        """
+        Tests the :mod:`buildingspy.io.outputfile.Reader.statistics` function.
+        """
+        import os
+
+        r = of.Reader(os.path.join("buildingspy", "examples", "dymola", "TwoRoomsWithStorage.mat"),
+                      "dymola")
+        varNames = r.varNames()
+        sta = r.statistics(varNames)
+        self.assertEqual(sorted(sta.keys()), varNames)
+        for var in varNames:
+            (t, y) = r.values(var)
+            t = t.astype(numpy.float64)
+            y = y.astype(numpy.float64)
+            integral = 0.0
+            for i in range(len(t) - 1):
+                integral += (t[i + 1] - t[i]) * (y[i + 1] + y[i]) / 2.0
+            self.assertEqual(sta[var]['min'], min(y))
+            self.assertEqual(sta[var]['max'], max(y))
+            numpy.testing.assert_allclose(sta[var]['integral'], integral,
+                                          rtol=1E-10, atol=1E-10 * max(abs(y)))
+            numpy.testing.assert_allclose(sta[var]['mean'], integral / (t[-1] - t[0]),
+                                          rtol=1E-10, atol=1E-10 * max(abs(y)))
+        # Test selected statistics and an invalid statistics
+        self.assertEqual(list(r.statistics(['roo1.air.vol.T'], ['max'])['roo1.air.vol.T'].keys()),
+                         ['max'])
+        self.assertRaises(ValueError, r.statistics, ['roo1.air.vol.T'], ['median'])
+
+    def test_aliases(self):
+        """
+        Tests the alias variables of :mod:`buildingspy.io.outputfile.Reader`.
+        """
+        import os
+
+        r = of.Reader(os.path.join("buildingspy", "examples", "dymola", "PlotDemo.mat"), "dymola")
+        dm = r._data_
+        # PlotDemo.mat has alias variables with negative sign, such as
+        # heaFloSen.Q_flow, and variables that are not aliases.
+        nNeg = 0
+        for var in r.varNames():
+            (col, group) = dm.aliasGroup(var)
+            sig = dict(group)[var]
+            numpy.testing.assert_array_equal(r.values(var)[1], sig * col)
+            self.assertFalse(r.values(var)[1].flags.writeable)
+            # All variables of the group are aliases of var, and share the same array
+            shared = dm.sharedData(var)
+            self.assertEqual(sorted(shared + [(var, 1.0)]),
+                             sorted([(n, s * sig) for (n, s) in group]))
+            for (n, s) in shared:
+                numpy.testing.assert_array_equal(r.values(n)[1], s * r.values(var)[1])
+                if s > 0:
+                    self.assertTrue(numpy.may_share_memory(r.values(n)[1], r.values(var)[1]))
+            if sig < 0:
+                nNeg += 1
+                # The negated values are only computed once
+                self.assertTrue(r.values(var)[1] is r.values(var)[1])
+        self.assertTrue(nNeg > 0)
+
 
 if __name__ == '__main__':
     unittest.main()
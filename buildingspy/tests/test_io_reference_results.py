@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# import from future to make Python2 behave like Python3
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from io import open
+# end of from future import
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import buildingspy.io.reference_results as reference_results
+
+
+class Test_io_reference_results(unittest.TestCase):
+    """
+       This class contains the unit tests for
+       :mod:`buildingspy.io.reference_results`.
+    """
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+    def _read(self, fileName):
+        with open(fileName, mode="r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_format_values(self):
+        """
+        Tests that the values are formatted as by Tester.format_float.
+        """
+        import buildingspy.development.regressiontest as r
+
+        rt = r.Tester(check_html=False)
+        rng = np.random.RandomState(0)
+        values = np.concatenate([rng.normal(size=100) * 10.0**rng.randint(-20, 20, size=100),
+                                 [0, -0.0, 1, -1, 0.5, 100, 1E-300, np.inf, np.nan]])
+        self.assertEqual(
+            '[' + ', '.join([rt.format_float(v) for v in values]) + ']',
+            reference_results.format_values(values))
+
+    def test_convert(self):
+        """
+        Tests that converting the text format to the binary format and back is lossless.
+        """
+        rng = np.random.RandomState(1)
+        results = {'time': [0, 3600],
+                   'a.b[1].y': rng.normal(size=101) * 1E5,
+                   'p': [1.5, 1.5]}
+        statistics = {'initialization': {'nonlinear': '1, 2', 'linear': '0'},
+                      'simulation': {'nonlinear': ' ', 'numerical Jacobians': '0'}}
+        txt = os.path.join(self._dir, "A.txt")
+        npz = os.path.join(self._dir, "A.npz")
+        txt2 = os.path.join(self._dir, "B.txt")
+        reference_results.write(txt, results, statistics=statistics,
+                                header=['last-generated=2020-06-01'])
+        reference_results.convert(txt, npz)
+        reference_results.convert(npz, txt2)
+        self.assertEqual(self._read(txt), self._read(txt2))
+
+        refTxt = reference_results.read(txt)
+        refNpz = reference_results.read(npz)
+        for ref in [refTxt, refNpz]:
+            self.assertEqual(['last-generated=2020-06-01'], ref['header'])
+            self.assertEqual(statistics, ref['statistics'])
+            self.assertEqual(list(results.keys()), list(ref['results'].keys()))
+        for (k, v) in results.items():
+            # The text format has 16 significant digits
+            np.testing.assert_allclose(v, refTxt['results'][k], rtol=1E-15)
+            np.testing.assert_array_equal(refTxt['results'][k], refNpz['results'][k])
+
+    def test_read_errors(self):
+        """
+        Tests that invalid files raise a ValueError.
+        """
+        fil = os.path.join(self._dir, "A.txt")
+        with open(fil, mode="w", encoding="utf-8") as f:
+            f.write("last-generated=2020-06-01\ntime=[0, 1]\nx=[1., a]\n")
+        self.assertRaises(ValueError, reference_results.read, fil)
+        self.assertRaises(ValueError, reference_results.write,
+                          os.path.join(self._dir, "A.csv"), {'x': [1]})
+
+
+if __name__ == '__main__':
+    unittest.main()
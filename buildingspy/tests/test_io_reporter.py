@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# import from future to make Python2 behave like Python3
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from io import open
+# end of from future import
+
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+from buildingspy.io.reporter import MessageRecorder, Reporter
+
+
+def _write_messages(queue, model):
+    """ Write messages in a worker process.
+    """
+    rec = MessageRecorder(queue=queue, model=model)
+    rec.writeWarning("First warning.")
+    rec.writeWarning("Second warning.", category="numerical Jacobians")
+    rec.writeError("Error.")
+
+
+class Test_io_reporter(unittest.TestCase):
+    """
+       This class contains the unit tests for
+       :mod:`buildingspy.io.reporter`.
+    """
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._log = os.path.join(self._dir, "unitTests.log")
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+    def _read(self):
+        with open(self._log, mode="r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_buffer(self):
+        """
+        Tests that the messages are buffered and written by flush().
+        """
+        rep = Reporter(self._log)
+        rep.writeOutput("Output.")
+        rep.writeWarning("Warning.")
+        self.assertFalse(os.path.exists(self._log))
+        rep.flush()
+        self.assertEqual("Output.\n*** Warning: Warning.\n", self._read())
+        # The buffer is written if it is full
+        for i in range(Reporter._MAX_BUFFER):
+            rep.writeOutput(str(i))
+        self.assertEqual(Reporter._MAX_BUFFER + 2, len(self._read().splitlines()))
+        # Buffered messages are discarded if the log file is deleted
+        rep.writeOutput("Discarded.")
+        rep.deleteLogFile()
+        rep.flush()
+        self.assertFalse(os.path.exists(self._log))
+        self.assertEqual(1, rep.getNumberOfWarnings())
+
+    def test_write_without_flush(self):
+        """
+        Tests that errors are written immediately, and that the buffer is written
+        if the reporter is deleted.
+        """
+        import gc
+
+        def write(log):
+            rep = Reporter(log)
+            rep.writeOutput("Output.")
+            rep.writeError("Error.")
+            self.assertEqual("Output.\n*** Error: Error.\n", self._read())
+            rep.writeWarning("Warning.")
+
+        write(self._log)
+        gc.collect()
+        self.assertEqual("Output.\n*** Error: Error.\n*** Warning: Warning.\n", self._read())
+
+    def test_logStructured(self):
+        """
+        Tests that the log file can be written in the JSON Lines format.
+        """
+        rep = Reporter(self._log)
+        rep.logStructured()
+        rep.writeError("Error.", model="MyLib.MyModel", category="simulation")
+        rep.writeOutput("Output.")
+        rep.flush()
+        records = [json.loads(lin) for lin in self._read().splitlines()]
+        self.assertEqual([{'severity': 'error', 'message': 'Error.',
+                           'model': 'MyLib.MyModel', 'category': 'simulation'},
+                          {'severity': 'output', 'message': 'Output.',
+                           'model': None, 'category': None}], records)
+
+    def test_readQueue(self):
+        """
+        Tests that the messages of worker processes are written and counted.
+        """
+        rep = Reporter(self._log)
+        rep.logStructured()
+        queue = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=_write_messages, args=(queue, model))
+                   for model in ['A', 'B']]
+        for wor in workers:
+            wor.start()
+        for wor in workers:
+            wor.join()
+        nMes = 0
+        while nMes < 6:
+            nMes += rep.readQueue(queue)
+        self.assertEqual(4, rep.getNumberOfWarnings())
+        self.assertEqual(2, rep.getNumberOfErrors())
+        rep.flush()
+        records = [json.loads(lin) for lin in self._read().splitlines()]
+        self.assertEqual(['A', 'A', 'A', 'B', 'B', 'B'], sorted([r['model'] for r in records]))
+        self.assertEqual(2, len([r for r in records if r['category'] == 'numerical Jacobians']))
+
+
+if __name__ == '__main__':
+    unittest.main()
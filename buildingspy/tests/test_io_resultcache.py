@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# import from future to make Python2 behave like Python3
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from io import open
+# end of from future import
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy.testing
+from buildingspy.io.outputfile import Reader
+from buildingspy.io.resultcache import ResultCache
+
+
+class Test_io_ResultCache(unittest.TestCase):
+    """
+       This class contains the unit tests for
+       :mod:`buildingspy.io.resultcache.ResultCache`.
+    """
+
+    def setUp(self):
+        self._cacheDir = tempfile.mkdtemp()
+        self._resultDir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._cacheDir)
+        shutil.rmtree(self._resultDir)
+
+    def _copy_result(self, name):
+        fil = os.path.join(self._resultDir, name + ".mat")
+        shutil.copyfile(os.path.join("buildingspy", "examples", "dymola", name + ".mat"), fil)
+        return fil
+
+    def test_values(self):
+        """
+        Tests that the cached file has the same values as the result file.
+        """
+        fil = self._copy_result("TwoRoomsWithStorage")
+        cache = ResultCache(self._cacheDir)
+        r = Reader(fil, "dymola")
+        for i in range(2):
+            # The first iteration converts the file, the second reads the cache.
+            r_cache = Reader(fil, "dymola", cache=cache)
+            self.assertEqual(r.varNames(), r_cache.varNames())
+            for var in r.varNames():
+                (t, y) = r.values(var)
+                (t_cache, y_cache) = r_cache.values(var)
+                numpy.testing.assert_array_equal(t, t_cache)
+                numpy.testing.assert_array_equal(y, y_cache)
+            self.assertEqual(len(os.listdir(self._cacheDir)), 1)
+
+    def test_modified_file(self):
+        """
+        Tests that a modified result file is converted again.
+        """
+        fil = self._copy_result("PlotDemo")
+        cache = ResultCache(self._cacheDir)
+        Reader(fil, "dymola", cache=cache)
+        # Overwrite the result file with different results
+        newFil = os.path.join("buildingspy", "examples", "dymola", "TwoRoomsWithStorage.mat")
+        shutil.copyfile(newFil, fil)
+        sta = os.stat(fil)
+        os.utime(fil, (sta.st_atime, sta.st_mtime + 10))
+        r = Reader(fil, "dymola", cache=cache)
+        self.assertTrue('roo1.air.vol.T' in r.varNames())
+        self.assertEqual(len(os.listdir(self._cacheDir)), 2)
+
+    def test_eviction(self):
+        """
+        Tests that the least recently used files are deleted if the cache is full.
+        """
+        fil1 = self._copy_result("PlotDemo")
+        fil2 = self._copy_result("TwoRoomsWithStorage")
+        # Cache that can only hold one file
+        cache = ResultCache(self._cacheDir, maxSize=1)
+        Reader(fil1, "dymola", cache=cache)
+        Reader(fil2, "dymola", cache=cache)
+        self.assertEqual(len(os.listdir(self._cacheDir)), 1)
+        self.assertTrue(os.path.isdir(os.path.join(self._cacheDir, cache._get_key(fil2))))
+        # Clear the cache
+        cache.clear()
+        self.assertEqual(len(os.listdir(self._cacheDir)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
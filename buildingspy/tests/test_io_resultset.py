@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# import from future to make Python2 behave like Python3
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from io import open
+# end of from future import
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import numpy.testing
+from buildingspy.io.outputfile import Reader
+from buildingspy.io.resultset import ResultSet
+
+
+class Test_io_ResultSet(unittest.TestCase):
+    """
+       This class contains the unit tests for
+       :mod:`buildingspy.io.resultset.ResultSet`.
+    """
+
+    def setUp(self):
+        exaDir = os.path.join("buildingspy", "examples", "dymola")
+        self._fileNames = [os.path.join(exaDir, cas, "PIDHysteresis.mat")
+                           for cas in ["case1", "case2"]]
+        self._varNames = ['Q_flow.Q_flow', 'con.eOn', 'cap.T']
+        self._grid = np.linspace(0, 86400, 97)
+
+    def test_load(self):
+        """
+        Tests loading the results serially, in parallel and to a file.
+        """
+        rs = ResultSet(self._fileNames)
+        expected = [Reader(f, "dymola").resample(self._varNames, self._grid)
+                    for f in self._fileNames]
+        for nPro in [1, 2]:
+            y = rs.load(self._varNames, self._grid, nPro=nPro)
+            numpy.testing.assert_array_equal(y, expected)
+        dirNam = tempfile.mkdtemp()
+        try:
+            y = rs.load(self._varNames, self._grid, nPro=2,
+                        dataFile=os.path.join(dirNam, "values.npy"))
+            numpy.testing.assert_array_equal(y, expected)
+            del y
+            numpy.testing.assert_array_equal(np.load(os.path.join(dirNam, "values.npy")), expected)
+        finally:
+            shutil.rmtree(dirNam)
+        self.assertEqual(rs.varNames(), self._varNames)
+        self.assertRaises(ValueError, ResultSet, os.path.join("notAFolder", "*.mat"))
+
+    def test_statistics(self):
+        """
+        Tests the ensemble statistics.
+        """
+        rs = ResultSet(os.path.join("buildingspy", "examples", "dymola", "case*", "*.mat"))
+        self.assertRaises(ValueError, rs.statistics)
+        y = rs.load(self._varNames, self._grid, nPro=1)
+        for chunkSize in [None, 1, 10]:
+            sta = rs.statistics(stats=['mean', 'std', 'min', 'max'], percentiles=[10, 50],
+                                chunkSize=chunkSize)
+            numpy.testing.assert_allclose(sta['mean'], np.mean(y, axis=0))
+            numpy.testing.assert_allclose(sta['std'], np.std(y, axis=0))
+            numpy.testing.assert_array_equal(sta['min'], np.min(y, axis=0))
+            numpy.testing.assert_array_equal(sta['max'], np.max(y, axis=0))
+            numpy.testing.assert_allclose(sta[10], np.percentile(y, 10, axis=0))
+            numpy.testing.assert_allclose(sta[50], np.median(y, axis=0))
+        self.assertRaises(ValueError, rs.statistics, ['median'])
+        self.assertRaises(ValueError, rs.statistics, ['mean'], [101])
+
+
+if __name__ == '__main__':
+    unittest.main()
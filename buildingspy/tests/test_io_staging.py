@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# import from future to make Python2 behave like Python3
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from future import standard_library
+standard_library.install_aliases()
+from builtins import *
+from io import open
+# end of from future import
+
+import os
+import shutil
+import tempfile
+import unittest
+from buildingspy.io.staging import stage_directory
+
+
+class Test_io_staging(unittest.TestCase):
+    """
+       This class contains the unit tests for
+       :mod:`buildingspy.io.staging`.
+    """
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self._src = os.path.join(self._dir, "Lib")
+        for nam in ["package.mo", "Resources/Scripts/a.mos", "dsin.txt", ".git/HEAD"]:
+            fil = os.path.join(self._src, nam)
+            if not os.path.isdir(os.path.dirname(fil)):
+                os.makedirs(os.path.dirname(fil))
+            with open(fil, mode="w", encoding="utf-8") as f:
+                f.write(nam)
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+    def _read(self, fileName):
+        with open(fileName, mode="r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_methods(self):
+        """
+        Tests the staging of a directory with different methods.
+        """
+        for method in ['auto', 'copy', 'symlink']:
+            dst = os.path.join(self._dir, method)
+            sta = stage_directory(self._src, dst, ignore=['.git'], method=method)
+            self.assertEqual(3, sta['linked'] + sta['copied'])
+            self.assertFalse(os.path.exists(os.path.join(dst, ".git")))
+            for nam in ["package.mo", "Resources/Scripts/a.mos", "dsin.txt"]:
+                self.assertEqual(nam, self._read(os.path.join(dst, nam)))
+            # Writable files are copied, the others are linked
+            srcSta = os.stat(os.path.join(self._src, "dsin.txt"))
+            self.assertNotEqual(srcSta.st_ino, os.stat(os.path.join(dst, "dsin.txt")).st_ino)
+            linked = os.path.samefile(os.path.join(self._src, "package.mo"),
+                                      os.path.join(dst, "package.mo"))
+            self.assertEqual(method != 'copy', linked)
+            if method == 'symlink':
+                self.assertTrue(os.path.islink(os.path.join(dst, "package.mo")))
+        self.assertRaises(ValueError, stage_directory, self._src,
+                          os.path.join(self._dir, "x"), method='overlay')
+
+    def test_writable_patterns(self):
+        """
+        Tests that the files that the simulator writes are copied rather than linked.
+        """
+        import fnmatch
+        from buildingspy.io.staging import WRITABLE_PATTERNS
+        from buildingspy.simulate.Simulator import Simulator
+
+        s = Simulator("MyModelicaLibrary.MyModel", "dymola",
+                      packagePath=os.path.join("buildingspy", "tests", "MyModelicaLibrary"))
+        files = []
+        s._deleteFiles = files.extend
+        s.deleteOutputFiles()
+        s.deleteLogFiles()
+        self.assertEqual([], [fil for fil in files
+                              if not any([fnmatch.fnmatch(fil, p) for p in WRITABLE_PATTERNS])])
+
+    def test_removePlotCommands(self):
+        """
+        Tests that removing the plot commands in a staged script does not modify the library.
+        """
+        import buildingspy.development.regressiontest as r
+
+        mosFil = os.path.join(self._src, "Resources", "Scripts", "a.mos")
+        with open(mosFil, mode="w", encoding="utf-8") as f:
+            f.write('simulateModel("A");\ncreatePlot(id=1,\n y={"x"});\n')
+        dst = os.path.join(self._dir, "hardlink")
+        stage_directory(self._src, dst, ignore=['.git'], method='hardlink')
+        rt = r.Tester(check_html=False)
+        rt._removePlotCommands(os.path.join(dst, "Resources", "Scripts", "a.mos"))
+        self.assertEqual('simulateModel("A");\n',
+                         self._read(os.path.join(dst, "Resources", "Scripts", "a.mos")))
+        self.assertEqual('simulateModel("A");\ncreatePlot(id=1,\n y={"x"});\n',
+                         self._read(mosFil))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -196,6 +196,47 @@ class Test_simulate_Simulator(unittest.TestCase):
         s.deleteOutputFiles()
         s.deleteLogFiles()
 
+    def test_simulate_twice_in_package_directory(self):
+        """
+        Tests that running ``simulate`` and ``translate`` twice with the
+        default package path does not modify the files of the package.
+        """
+        import shutil
+        import tempfile
+
+        def run_simulation(mosFile, timeout, directory):
+            # Write the log file instead of running the simulator
+            with open(os.path.join(directory, "simulator.log"), mode="w", encoding="utf-8") as f:
+                f.write("")
+
+        tmpDir = tempfile.mkdtemp()
+        pacDir = os.path.join(tmpDir, "MyModelicaLibrary")
+        shutil.copytree(self._packagePath, pacDir)
+        curDir = os.getcwd()
+        worDirs = []
+        try:
+            os.chdir(pacDir)
+            for fil in ["run.mos", "run_translate.mos"]:
+                with open(fil, mode="w", encoding="utf-8") as f:
+                    f.write("// Script of the user")
+            s = Simulator("MyModelicaLibrary.MyModel", "dymola")
+            s._runSimulation = run_simulation
+            for i in range(2):
+                s.translate()
+                worDirs.append(os.path.dirname(s._translateDir_))
+                # The translation does not copy the script to the package.
+                with open("run_translate.mos", mode="r", encoding="utf-8") as f:
+                    self.assertEqual("// Script of the user", f.read())
+                s.simulate()
+                self.assertEqual(0, s._reporter.getNumberOfErrors())
+                # The simulation copies the script to the output directory.
+                with open("run.mos", mode="r", encoding="utf-8") as f:
+                    self.assertIn("simulateModel", f.read())
+        finally:
+            os.chdir(curDir)
+            for d in worDirs + [tmpDir]:
+                shutil.rmtree(d, ignore_errors=True)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -31,11 +31,12 @@ def export(dm, varList, fileName=None, formatOptions={}):
     oFile = open(fileName, 'w')
     csvWriter = csv.writer(oFile)
     
+    chunkSize = int(formatOptions.get('chunkSize', 10000))
+
     vDict = dm.sortByBlocks(varList)
     for vList in vDict.values():
-        vData = dm.getVarArray(vList)
-        vList.insert(0, dm._absc[0])
-        csvWriter.writerow(vList)
-        csvWriter.writerows(numpy.transpose(vData))
+        csvWriter.writerow([dm._absc[0]] + vList)
+        for vData in dm.iterVarArray(vList, chunkSize):
+            csvWriter.writerows(numpy.transpose(vData))
     
     oFile.close()
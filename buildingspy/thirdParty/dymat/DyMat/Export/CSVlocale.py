@@ -34,12 +34,13 @@ def export(dm, varList, fileName=None, formatOptions={}):
     delimiter = formatOptions.get('delimiter', ';')
     newline   = formatOptions.get('newline', os.linesep)
     
+    chunkSize = int(formatOptions.get('chunkSize', 10000))
+
     vDict = dm.sortByBlocks(varList)
     for vList in vDict.values():
-        vData = dm.getVarArray(vList)
-        vList.insert(0, dm._absc[0])
-        oFile.write(delimiter.join(['"%s"'%n for n in vList])+newline)
-        for i in range(vData.shape[1]):
-            oFile.write(delimiter.join([locale.format('%g', n) for n in vData[:,i]])+newline)
+        oFile.write(delimiter.join(['"%s"'%n for n in [dm._absc[0]] + vList])+newline)
+        for vData in dm.iterVarArray(vList, chunkSize):
+            for i in range(vData.shape[1]):
+                oFile.write(delimiter.join([locale.format('%g', n) for n in vData[:,i]])+newline)
     
     oFile.close()
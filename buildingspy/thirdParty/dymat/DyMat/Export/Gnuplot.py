@@ -28,6 +28,8 @@ def export(dm, varList, fileName=None, formatOptions={}):
     if not fileName:
         fileName = dm.fileName+'.gpd'
 
+    chunkSize = int(formatOptions.get('chunkSize', 10000))
+
     vDict = dm.sortByBlocks(varList)
     for blk in vDict.keys():
         vList = vDict[blk]
@@ -41,9 +43,8 @@ def export(dm, varList, fileName=None, formatOptions={}):
             n, d = nd[i]
             oFile.write('# %3i %s - %s\n' % (i+1, n, d))
 
-        vData = dm.getVarArray(vList)
-
-        for i in range(vData.shape[1]):
-            oFile.write('\t'.join(['%g'%v for v in vData[:,i]]) + '\n')
+        for vData in dm.iterVarArray(vList, chunkSize):
+            for i in range(vData.shape[1]):
+                oFile.write('\t'.join(['%g'%v for v in vData[:,i]]) + '\n')
 
         oFile.close()
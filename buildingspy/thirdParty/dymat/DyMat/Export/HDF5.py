@@ -64,6 +64,12 @@ def export(dm, varList, fileName=None, formatOptions={}):
     h5File.attrs['comment'] = 'file generated with DyMat from %s' % dm.fileName
 
     convertNames = formatOptions.get('convertNames', False)
+    # number of variables that are read at once
+    chunkSize = int(formatOptions.get('chunkSize', 100))
+    # compression filter of h5py, such as 'gzip' or 'lzf', or 'none'
+    compression = formatOptions.get('compression', 'gzip')
+    if compression == 'none':
+        compression = None
 
     if convertNames:
         nameConv = NameConverter()
@@ -75,16 +81,19 @@ def export(dm, varList, fileName=None, formatOptions={}):
         av = h5File.create_dataset(dim, data=a)
         av.attrs['description'] = str(adesc)
         av.attrs['block'] = block
-        for vn in vList[block]:
-            if convertNames:
-                name = nameConv(vn)
-            else:
-                name = vn
-            v = h5File.create_dataset(name, data=dm.data(vn))
-            d = dm.description(vn)
-            if d:
-                v.attrs['description'] = str(d)
-            if convertNames:
-                v.attrs['original_name'] = str(vn)
-            v.attrs['block'] = block
+        names = vList[block]
+        for i in range(0, len(names), chunkSize):
+            vNames, vData = dm.getBlockArrays(names[i:i+chunkSize])[block]
+            for vn, vd in zip(vNames, vData):
+                if convertNames:
+                    name = nameConv(vn)
+                else:
+                    name = vn
+                v = h5File.create_dataset(name, data=vd, chunks=True, compression=compression)
+                d = dm.description(vn)
+                if d:
+                    v.attrs['description'] = str(d)
+                if convertNames:
+                    v.attrs['original_name'] = str(vn)
+                v.attrs['block'] = block
     h5File.close()
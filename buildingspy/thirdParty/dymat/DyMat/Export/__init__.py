@@ -39,8 +39,11 @@ loadedFormats = {}
 def export(fmt, dm, varList, fileName=None, formatOptions={}):
     """Export the data of the DyMatFile object `dm` to a data file. `fmt` is the 
     format string, `varList` the list of variables to export. If no `fileName` is 
-    given, it will be derived from the mat file name. `formatOptions` will be used 
-    in later versions.
+    given, it will be derived from the mat file name. `formatOptions` is a dictionary 
+    of options for the format. All formats except MATLAB write the data in chunks, 
+    whose size can be set with the option 'chunkSize': the number of time steps for 
+    the text formats (default 10000), and the number of variables for HDF5 and netCDF 
+    (default 100).
 
     :Arguments:
         - string: fmt
@@ -56,7 +59,7 @@ def export(fmt, dm, varList, fileName=None, formatOptions={}):
         raise Exception('Unknown export format specified!')
     
     if not fmt in loadedFormats:
-        loadedFormats[fmt] = importlib.import_module('.%s' % fmt, package='DyMat.Export')
+        loadedFormats[fmt] = importlib.import_module('.%s' % fmt, package=__name__)
 
     return loadedFormats[fmt].export(dm, varList, fileName,formatOptions)
 
@@ -64,6 +64,10 @@ def export(dm, varList, fileName=None, formatOptions={}):
     ncFile.comment = 'file generated with DyMat from %s' % dm.fileName
 
     convertNames = formatOptions.get('convertNames', False)
+    # number of variables that are read at once
+    chunkSize = int(formatOptions.get('chunkSize', 100))
+    # the variables are compressed with zlib unless compression is 'none'
+    zlib = formatOptions.get('compression', 'zlib') != 'none'
 
     if convertNames:
         nameConv = NameConverter()
@@ -77,18 +81,21 @@ def export(dm, varList, fileName=None, formatOptions={}):
         av.description = adesc
         av.block = block
         av[:] = a
-        for vn in vList[block]:
-            if convertNames:
-                name = nameConv(vn)
-            else:
-                name = vn
-            v = ncFile.createVariable(name, 'd', (dim,))
-            d = dm.description(vn)
-            if d:
-                v.description = d
-            if convertNames:
-                v.original_name = vn
-            v.block = block
-            v[:] = dm.data(vn)
+        names = vList[block]
+        for i in range(0, len(names), chunkSize):
+            vNames, vData = dm.getBlockArrays(names[i:i+chunkSize])[block]
+            for vn, vd in zip(vNames, vData):
+                if convertNames:
+                    name = nameConv(vn)
+                else:
+                    name = vn
+                v = ncFile.createVariable(name, 'd', (dim,), zlib=zlib)
+                d = dm.description(vn)
+                if d:
+                    v.description = d
+                if convertNames:
+                    v.original_name = vn
+                v.block = block
+                v[:] = vd
     ncFile.sync()
     ncFile.close()
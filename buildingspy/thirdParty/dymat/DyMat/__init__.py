@@ -25,25 +25,222 @@ __version__='0.6'
 __author__='Joerg Raedler (joerg@j-raedler.de)'
 __license__='BSD License (http://www.opensource.org/licenses/bsd-license.php)'
 
-import sys, math, numpy, scipy.io
+import sys, math, os, re, bisect, fnmatch, struct, numpy, scipy.io
 
 # extract strings from the matrix
-strMatNormal = lambda a: [''.join(s).rstrip() for s in a]
-strMatTrans  = lambda a: [''.join(s).rstrip() for s in zip(*a)]
+def strMatNormal(a):
+    """Return the rows of the character matrix a as a list of strings, with trailing 
+    whitespace removed. All rows are decoded at once by viewing the matrix as an 
+    array of fixed-width strings."""
+    a = numpy.asarray(a)
+    if a.ndim != 2 or a.shape[1] == 0:
+        return [''.join(s).rstrip() for s in a]
+    s = numpy.ascontiguousarray(a, dtype='U1').view('U%d' % (a.shape[1]))
+    return numpy.char.rstrip(s[:, 0]).tolist()
+
+strMatTrans  = lambda a: strMatNormal(numpy.asarray(a).transpose())
     
 # sign = lambda x: cmp(x, 0)
 sign = lambda x: math.copysign(1.0, x)
 
+# element types of MATLAB v4 files, indexed by the P digit of the MOPT header field
+v4Types = {0: 'f8', 1: 'f4', 2: 'i4', 3: 'i2', 4: 'u2', 5: 'u1'}
+
+
+def lazyLoadMat(fileName):
+    """Read a MATLAB v4 file as written by Dymola and OpenModelica without loading
+    the data blocks. All matrices whose name starts with 'data' are returned as
+    read-only memory maps, the (small) header matrices are read into memory. The
+    return value is a dictionary in the same format as returned by
+    scipy.io.loadmat(fileName, chars_as_strings=False). Files that are not plain
+    MATLAB v4 files are loaded with scipy.io.loadmat.
+
+    :Arguments:
+        - string: fileName
+    :Returns:
+        - dictionary with numpy.ndarray values
+    """
+    fileSize = os.path.getsize(fileName)
+    mat = {}
+    with open(fileName, 'rb') as f:
+        offset = 0
+        while offset + 20 <= fileSize:
+            f.seek(offset)
+            header = f.read(20)
+            # the byte order is not stored explicitly, but a valid MOPT is small
+            order = '<'
+            mopt = struct.unpack('<i', header[:4])[0]
+            if not 0 <= mopt < 5000:
+                order = '>'
+                mopt = struct.unpack('>i', header[:4])[0]
+            M, O, P, T = mopt // 1000, (mopt // 100) % 10, (mopt // 10) % 10, mopt % 10
+            mrows, ncols, imagf, namlen = struct.unpack(order + '4i', header[4:])
+            if not 0 <= M <= 4 or O != 0 or not P in v4Types or T > 1 or imagf \
+               or mrows < 0 or ncols < 0 or namlen <= 0:
+                # version 5 file, sparse or complex matrix, let scipy handle it
+                return scipy.io.loadmat(fileName, chars_as_strings=False)
+            name = f.read(namlen).rstrip(b'\x00').decode('latin-1')
+            dtype = numpy.dtype(order + v4Types[P])
+            dataOffset = offset + 20 + namlen
+            offset = dataOffset + mrows * ncols * dtype.itemsize
+            if offset > fileSize:
+                raise ValueError('File %s is truncated in matrix %s.' % (fileName, name))
+            # matrices are stored column by column, hence read them transposed
+            if name.startswith('data') and T == 0 and mrows * ncols > 0:
+                m = numpy.memmap(fileName, dtype=dtype, mode='r', offset=dataOffset,
+                                 shape=(ncols, mrows)).T
+            else:
+                m = numpy.fromfile(f, dtype=dtype, count=mrows * ncols)
+                m = m.reshape((ncols, mrows)).T
+            if T == 1:
+                m = numpy.ascontiguousarray(m, dtype=numpy.uint32).view('U1')
+            elif m.dtype.byteorder == '>':
+                m = m.astype(m.dtype.newbyteorder('='))
+            mat[name] = m
+    return mat
+
+
+class NameIndex:
+    """Index of variable names that is built once and answers name queries without 
+    scanning all names. It contains the names in file order, the sorted names for 
+    prefix queries, a tree of the Modelica component paths, and a cache of compiled 
+    patterns and their results."""
+
+    # characters that end the literal prefix of a regular expression
+    _reSpecial = frozenset('.^$*+?{}[]\\|()')
+    # characters that make the preceding character optional or repeated
+    _reRepeat = frozenset('*?{')
+
+    def __init__(self, names):
+        """Build the index of the sequence of strings names."""
+        self.names = list(names)
+        self.sortedNames = sorted(self.names)
+        self.position = dict((n, i) for (i, n) in enumerate(self.names))
+        self._tree = None
+        self._searchCache = {}
+        self._globCache = {}
+
+    def prefixRange(self, prefix):
+        """Return all names that start with prefix, sorted.
+
+        :Arguments:
+            - string: prefix
+        :Returns:
+            - list of strings
+        """
+        i = bisect.bisect_left(self.sortedNames, prefix)
+        if not prefix:
+            return self.sortedNames[i:]
+        # names with the same prefix are contiguous in the sorted list
+        j = bisect.bisect_left(self.sortedNames, prefix[:-1] + chr(ord(prefix[-1]) + 1), i)
+        return self.sortedNames[i:j]
+
+    def _regexPrefix(self, pattern):
+        """Return the literal prefix that all matches of the regular expression pattern 
+        start with, or None if the pattern is not anchored at the start."""
+        if not pattern.startswith('^') or '|' in pattern:
+            return None
+        prefix = []
+        i = 1
+        while i < len(pattern):
+            c = pattern[i]
+            if c == '\\' and i + 1 < len(pattern) and not pattern[i+1].isalnum():
+                prefix.append(pattern[i+1])
+                i += 2
+            elif c in self._reSpecial:
+                break
+            else:
+                prefix.append(c)
+                i += 1
+        if prefix and i < len(pattern) and pattern[i] in self._reRepeat:
+            prefix.pop()
+        return ''.join(prefix)
+
+    def search(self, pattern):
+        """Return all names for which re.search(pattern, name) matches, in file order. 
+        If the pattern is anchored at the start, only the names with its literal 
+        prefix are tested.
+
+        :Arguments:
+            - string or compiled regular expression: pattern
+        :Returns:
+            - list of strings
+        """
+        try:
+            return list(self._searchCache[pattern])
+        except KeyError:
+            pass
+        regex = re.compile(pattern)
+        prefix = None
+        if isinstance(pattern, str):
+            prefix = self._regexPrefix(pattern)
+        if prefix:
+            res = [n for n in self.prefixRange(prefix) if regex.search(n)]
+            res.sort(key=self.position.__getitem__)
+        else:
+            res = [n for n in self.names if regex.search(n)]
+        self._searchCache[pattern] = res
+        return list(res)
+
+    def glob(self, pattern):
+        """Return all names that match the shell-style wildcard pattern, sorted. The 
+        wildcards are the ones of the fnmatch module: '*', '?', '[seq]' and '[!seq]'.
+
+        :Arguments:
+            - string: pattern
+        :Returns:
+            - list of strings
+        """
+        try:
+            return list(self._globCache[pattern])
+        except KeyError:
+            pass
+        prefix = re.split(r'[*?\[]', pattern, 1)[0]
+        if prefix == pattern:
+            res = [pattern] if pattern in self.position else []
+        else:
+            regex = re.compile(fnmatch.translate(pattern))
+            res = [n for n in self.prefixRange(prefix) if regex.match(n)]
+        self._globCache[pattern] = res
+        return list(res)
+
+    def tree(self):
+        """Return the tree of the names with respect to the dot-separated path 
+        elements, see DyMatFile.nameTree. The tree is built on the first call."""
+        if self._tree is None:
+            root = {}
+            for v in self.names:
+                branch = root
+                elem = v.split('.')
+                for e in elem[:-1]:
+                    if not e in branch:
+                        branch[e] = {}
+                    branch = branch[e]
+                branch[elem[-1]] = v
+            self._tree = root
+        return self._tree
+
 
 class DyMatFile:
     """A result file written by Dymola or OpenModelica"""
 
-    def __init__(self, fileName):
-        """Open the file fileName and parse contents"""
+    def __init__(self, fileName, lazy=False, mat=None):
+        """Open the file fileName and parse contents. If lazy is true, only the
+        header matrices are read, and the data blocks are memory-mapped such that
+        only the values of the variables that are accessed are read from disk. If mat 
+        is given, it is used as the dictionary of matrices instead of reading fileName, 
+        see normalizedMat."""
         self.fileName = fileName
-        self.mat = scipy.io.loadmat(fileName, chars_as_strings=False)
+        if mat is not None:
+            self.mat = mat
+        elif lazy:
+            self.mat = lazyLoadMat(fileName)
+        else:
+            self.mat = scipy.io.loadmat(fileName, chars_as_strings=False)
         self._vars = {}
         self._blocks = []
+        self._nameIndex = None
+        self._descrMat = None
         try:
             fileInfo = strMatNormal(self.mat['Aclass'])
         except KeyError:
@@ -54,38 +251,37 @@ class DyMatFile:
                 # all methods rely on this structure since this was the only
                 # one understand by earlier versions
                 names = strMatTrans(self.mat['name']) # names
-                descr = strMatTrans(self.mat['description']) # descriptions
-                for i in range(len(names)):
-                    d = self.mat['dataInfo'][0][i] # data block
-                    x = self.mat['dataInfo'][1][i]
-                    c = abs(x)-1  # column
-                    s = sign(x)   # sign
-                    if c:
-                        self._vars[names[i]] = (descr[i], d, c, s)
-                        if not d in self._blocks:
-                            self._blocks.append(d)
-                    else:
-                        self._absc = (names[i], descr[i])
+                # descriptions are decoded when requested, see description()
+                self._descrMat = numpy.asarray(self.mat['description']).transpose()
+                dataInfo = numpy.asarray(self.mat['dataInfo'])
             elif fileInfo[3] == 'binNormal':
                 # usually files from dymola, save as...,
                 # variables are mapped to the structure above ('binTrans')
                 names = strMatNormal(self.mat['name']) # names
-                descr = strMatNormal(self.mat['description']) # descriptions
-                for i in range(len(names)):
-                    d = self.mat['dataInfo'][i][0] # data block
-                    x = self.mat['dataInfo'][i][1]
-                    c = abs(x)-1  # column
-                    s = sign(x)   # sign
-                    if c:
-                        self._vars[names[i]] = (descr[i], d, c, s)
-                        if not d in self._blocks:
-                            self._blocks.append(d)
-                            b = 'data_%d' % (d)
-                            self.mat[b] = self.mat[b].transpose()
-                    else:
-                        self._absc = (names[i], descr[i])
+                self._descrMat = numpy.asarray(self.mat['description'])
+                dataInfo = numpy.asarray(self.mat['dataInfo']).transpose()
             else:
                 raise Exception('File structure not supported!')
+            d = dataInfo[0] # data block
+            x = dataInfo[1]
+            c = numpy.abs(x)-1  # column
+            s = numpy.copysign(1.0, x)   # sign
+            isVar = c != 0
+            iAbsc = numpy.flatnonzero(~isVar)
+            if len(iAbsc):
+                i = iAbsc[-1]
+                self._absc = (names[i], self._description(i))
+            iVar = numpy.flatnonzero(isVar)
+            self._vars = dict(zip([names[i] for i in iVar],
+                                  zip(iVar.tolist(), d[iVar].tolist(), c[iVar].tolist(),
+                                      s[iVar].tolist())))
+            # blocks in the order of their first occurence
+            blocks, first = numpy.unique(d[iVar], return_index=True)
+            self._blocks = blocks[numpy.argsort(first)].tolist()
+            if fileInfo[3] == 'binNormal':
+                for b in self._blocks:
+                    b = 'data_%d' % (b)
+                    self.mat[b] = self.mat[b].transpose()
         elif fileInfo[1] == '1.0':
             # files generated with dymola, save as..., only plotted ...
             # fake the structure of a 1.1 transposed file
@@ -95,9 +291,15 @@ class DyMatFile:
             del self.mat['data']
             self._absc = (names[0], '')
             for i in range(1, len(names)):
-                self._vars[names[i]] = ('', 0, i, 1)
+                self._vars[names[i]] = (i, 0, i, 1.0)
         else:
             raise Exception('File structure not supported!')
+        # group the variables that are stored in the same column
+        self._aliases = {}
+        for (n, v) in self._vars.items():
+            self._aliases.setdefault((v[1], v[2]), []).append((n, v[3]))
+        # negated columns, computed on first access
+        self._negated = {}
     
             
     def blocks(self):
@@ -125,19 +327,48 @@ class DyMatFile:
             return [k for (k,v) in self._vars.items() if v[1] == block]
 
     def data(self, varName):
-        """Return the values of the variable.
+        """Return the values of the variable. The returned array is read-only and is 
+        shared with all alias variables of the same sign. The values of variables with 
+        a negative sign are computed once per column.
 
         :Arguments:
             - varName: string
         :Returns:
             - numpy.ndarray with the values"""
         tmp, d, c, s = self._vars[varName]
-        di = 'data_%d' % (d)
-        dd = self.mat[di][c]
         if s < 0:
-            dd = dd * -1
+            return self._negatedColumn(d, c)
+        dd = self.mat['data_%d' % (d)][c]
+        dd.flags.writeable = False
         return dd
 
+    def _negatedColumn(self, d, c):
+        """Return the negated values of column c of block d as a read-only array."""
+        try:
+            return self._negated[(d, c)]
+        except KeyError:
+            dd = self.mat['data_%d' % (d)][c] * -1
+            dd.flags.writeable = False
+            self._negated[(d, c)] = dd
+            return dd
+
+    def aliasGroup(self, varName):
+        """Return the values of the column in which the variable is stored, together 
+        with all variables that are stored in this column. The values of each 
+        variable are the returned values multiplied by its sign. The returned array 
+        is a read-only view of the data block.
+
+        :Arguments:
+            - varName: string
+        :Returns:
+            - tuple of numpy.ndarray (values) and sequence of tuples, each containing 
+              a string (name) and a number (sign)
+        """
+        tmp, d, c, s = self._vars[varName]
+        dd = self.mat['data_%d' % (d)][c]
+        dd.flags.writeable = False
+        return dd, list(self._aliases[(d, c)])
+
     # add a dictionary-like interface
     __getitem__ = data
 
@@ -159,7 +390,13 @@ class DyMatFile:
         :Returns:
             - string
         """
-        return self._vars[varName][0]
+        return self._description(self._vars[varName][0])
+
+    def _description(self, i):
+        """Return the description string of the i-th entry of the name table."""
+        if self._descrMat is None:
+            return ''
+        return ''.join(self._descrMat[i]).rstrip()
 
     def sharedData(self, varName):
         """Return variables which share data with this variable, possibly with a different 
@@ -171,7 +408,7 @@ class DyMatFile:
             - sequence of tuples, each containing a string (name) and a number (sign)
         ."""
         tmp, d, c, s = self._vars[varName]
-        return [(n,v[3]*s) for (n,v) in self._vars.items() if n!=varName and v[1]==d and v[2]==c]
+        return [(n, sn*s) for (n, sn) in self._aliases[(d, c)] if n != varName]
 
     def size(self, blockOrName):
         """Return the number of rows (time steps) of a variable or a block.
@@ -231,23 +468,27 @@ class DyMatFile:
         """Return a tree of all variable names with respect to the path names. Path 
         elements are separated by dots. The tree will represent the structure of the 
         Modelica models. The tree is returned as a dictionary of dictionaries. The keys 
-        are the path elements, values are sub-dictionaries or variable names.
+        are the path elements, values are sub-dictionaries or variable names. The tree 
+        is built once and shared between calls, it must not be modified.
 
         :Arguments:
             - None
         :Returns:
             - dictionary
         """
-        root = {}
-        for v in self._vars.keys():
-            branch = root
-            elem = v.split('.')
-            for e in elem[:-1]:
-                if not e in branch:
-                    branch[e] = {}
-                branch = branch[e]
-            branch[elem[-1]] = v
-        return root
+        return self.nameIndex().tree()
+
+    def nameIndex(self):
+        """Return the index of all variable names, which is built on the first call.
+
+        :Arguments:
+            - None
+        :Returns:
+            - NameIndex
+        """
+        if self._nameIndex is None:
+            self._nameIndex = NameIndex(self._vars.keys())
+        return self._nameIndex
 
     def getVarArray(self, varNames, withAbscissa=True):
         """Return the values of all variables in varNames combined as a 2d-array. If 
@@ -266,6 +507,95 @@ class DyMatFile:
             v.insert(0, numpy.array(self.abscissa(varNames[0], True), ndmin=2))
         return numpy.concatenate(v, 0)
 
+    def getBlockArrays(self, varNames, timeSlice=None):
+        """Return the values of all variables in varNames, grouped by the data block. 
+        The values of all variables of a block are extracted with a single indexing 
+        operation, and the signs of negated alias variables are applied in place. 
+        The keys of the returned dictionary are the block numbers, the values are 
+        tuples of the list of names and a 2d-array with one row per variable. If 
+        timeSlice is given, only the values of these time steps are returned.
+
+        :Arguments:
+            - sequence of strings: varNames
+            - optional slice: timeSlice
+        :Returns:
+            - dictionary with integer keys and tuples (list of strings, numpy.ndarray) 
+              as values
+        """
+        vDict = {}
+        for b, names in self.sortByBlocks(varNames).items():
+            cols = numpy.array([self._vars[n][2] for n in names], dtype=numpy.intp)
+            signs = numpy.array([self._vars[n][3] for n in names])
+            # read each column only once, even if several aliases are requested,
+            # fancy indexing copies the rows, also for memory-mapped blocks
+            uniqueCols, inverse = numpy.unique(cols, return_inverse=True)
+            v = self.mat['data_%d' % (b)]
+            if timeSlice is not None:
+                v = v[:, timeSlice]
+            v = numpy.asarray(v[uniqueCols])
+            if len(uniqueCols) < len(cols) or (uniqueCols != cols).any():
+                v = v[inverse.ravel()]
+            if (signs < 0).any():
+                v *= signs.astype(v.dtype)[:, numpy.newaxis]
+            vDict[b] = (names, v)
+        return vDict
+
+    def normalizedMat(self):
+        """Return a dictionary of matrices in the structure of a file of version 1.1 
+        'binTrans' that contains the same variables as this file. The data blocks are 
+        the (possibly memory-mapped) arrays of this file, with one row per variable. 
+        The dictionary can be saved and passed as the argument mat to DyMatFile.
+
+        :Arguments:
+            - None
+        :Returns:
+            - dictionary with numpy.ndarray values
+        """
+        names = [self._absc[0]] + list(self._vars.keys())
+        if self._descrMat is None:
+            descr = [''] * len(names)
+        else:
+            allDescr = strMatNormal(self._descrMat)
+            descr = [self._absc[1]] + [allDescr[v[0]] for v in self._vars.values()]
+        dataInfo = numpy.zeros((4, len(names)), dtype=numpy.int32)
+        dataInfo[0][1:] = [v[1] for v in self._vars.values()]
+        dataInfo[1][0] = 1
+        dataInfo[1][1:] = [v[3]*(v[2]+1) for v in self._vars.values()]
+        dataInfo[3][:] = -1
+        def strMat(strings):
+            n = max([len(x) for x in strings] + [1])
+            return numpy.array([list(x.ljust(n)) for x in strings], dtype='U1').transpose()
+        mat = {'Aclass': numpy.array([list('Atrajectory'), list('1.1        '),
+                                      list('           '), list('binTrans   ')], dtype='U1'),
+               'name': strMat(names),
+               'description': strMat(descr),
+               'dataInfo': dataInfo}
+        for b in self._blocks:
+            mat['data_%d' % (b)] = self.mat['data_%d' % (b)]
+        return mat
+
+    def iterVarArray(self, varNames, chunkSize=10000, withAbscissa=True):
+        """Return an iterator over the values of all variables in varNames, like 
+        getVarArray, but in chunks of at most chunkSize time steps. Only one chunk 
+        is held in memory at a time, hence this can be used to write large files. 
+        **All variables must share the same block!**
+
+        :Arguments:
+            - sequence of strings: varNames
+            - optional integer: chunkSize
+            - optional bool: withAbscissa
+        :Returns:
+            - iterator over numpy.ndarray
+        """
+        b = self._vars[varNames[0]][1]
+        a = self.abscissa(b, True)
+        for i in range(0, self.size(b), chunkSize):
+            s = slice(i, i+chunkSize)
+            names, v = self.getBlockArrays(varNames, s)[b]
+            if withAbscissa:
+                v = numpy.concatenate((numpy.array(a[s], ndmin=2), v), 0)
+            yield v
+
     def writeVar(self, varName):
         """Write the values of the abscissa and the variabale to stdout. The text format 
         is compatible with gnuplot. For more options use DyMat.Export instead.